@@ -3,14 +3,27 @@ import numpy as np
 from typing import List, Dict, Callable, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
-from sesto.performance import performance
-from sesto.metatrader.constants import MT5Timeframe
+from sesto.performance import performance, grouped_performance_metrics
+from sesto.ledger import TradeLedger, dataclass_columns
+from sesto.events import EventLog, INFO, WARNING
+from sesto.stream import ChunkSource, stream_windows
+from sesto.metatrader.constants import MT5Timeframe, TIMEFRAME_DURATIONS
 from sesto.utils import calculate_position_size, get_price_at_pnl, calculate_price_with_spread, calculate_liquidation_price
 from sesto.metatrader.utils import calculate_commission
+import os
+import glob
+from array import array
+import pickle
 import time
 from datetime import timedelta
 from IPython.display import display
 
+# Strategy hooks and engine phases timed when profiling is on
+PROFILED_METHODS = (
+    'entry_condition', 'exit_condition', 'trailing_stop',
+    'check_entry', 'update_open_trades', 'update_trade_metrics', 'open_trade', 'close_trade', 'schedule_exit', 'record_equity',
+)
+
 @dataclass
 class Trade:
     symbol: str
@@ -56,6 +69,257 @@ class Trade:
             self.potential_profit_usd = ((self.entry_price - self.tp_price) / self.entry_price * self.position_size_usd) - self.order_commission
             self.potential_loss_usd = ((self.sl_price - self.entry_price) / self.entry_price * self.position_size_usd) + self.order_commission
 
+class RowView:
+    """
+    Read-only view of one bar of a symbol's frame, backed by column arrays extracted once per run.
+
+    Supports the lookups strategy hooks use on a pandas row (``row['close']``, ``row.get('rsi-14')``,
+    ``row.close``, ``'base_csm' in row``) without building a ``pd.Series`` per bar.
+    """
+    __slots__ = ('_columns', '_index')
+
+    def __init__(self, columns: Dict[str, np.ndarray], index: int):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key: str):
+        return self._columns[key][self._index]
+
+    def __getattr__(self, key: str):
+        try:
+            return self._columns[key][self._index]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._columns
+
+    def get(self, key: str, default=None):
+        column = self._columns.get(key)
+        return default if column is None else column[self._index]
+
+    def keys(self):
+        return self._columns.keys()
+
+    @property
+    def name(self) -> int:
+        return self._index
+
+    def to_series(self) -> pd.Series:
+        return pd.Series({key: column[self._index] for key, column in self._columns.items()}, name=self._index)
+
+def frame_to_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Extract every column of a frame once as a NumPy array. The 'time' column is kept as an object
+    array of pd.Timestamp so hooks receive the same values as with iterrows().
+    """
+    columns = {column: df[column].to_numpy() for column in df.columns}
+    if 'time' in columns:
+        columns['time'] = np.array(df['time'].tolist(), dtype=object)
+    return columns
+
+def chronological_order(frames: List[pd.DataFrame]) -> tuple:
+    """
+    Precompute one global ordering of the bars of several frames on their 'time' column.
+
+    :param frames: The per-symbol frames, each sorted by time.
+    :return: A tuple (event_frames, event_bars, boundaries): for every event in time order the index of
+             its frame and its bar position, plus the offsets at which a new timestamp starts
+             (the last offset is the number of events).
+    """
+    times = [df['time'].to_numpy(dtype='datetime64[ns]').view(np.int64) for df in frames]
+    all_times = np.concatenate(times) if times else np.empty(0, dtype=np.int64)
+    frame_ids = np.repeat(np.arange(len(frames)), [len(t) for t in times])
+    bar_ids = np.concatenate([np.arange(len(t)) for t in times]) if times else np.empty(0, dtype=np.int64)
+
+    order = np.argsort(all_times, kind='stable')
+    sorted_times = all_times[order]
+    boundaries = np.flatnonzero(np.diff(sorted_times)) + 1
+    boundaries = np.concatenate(([0], boundaries, [len(sorted_times)]))
+
+    return frame_ids[order], bar_ids[order], boundaries
+
+def step_trailing_stop(trade: Trade, steps: List[tuple]) -> bool:
+    """
+    Step-based trailing stop: once the unrealized PnL of a trade reaches a step's trigger, move the stop
+    loss to the price that locks in that step's PnL, if that tightens the stop.
+
+    :param trade: The open trade, with its unrealized PnL updated for the current bar.
+    :param steps: (trigger_pnl, new_sl_pnl) pairs in USD, checked in order; the first step that moves
+                  the stop loss wins.
+    :return: Whether the stop loss moved.
+    """
+    for trigger_pnl, new_sl_pnl in steps:
+        if trade.unrealized_pnl >= trigger_pnl:
+            sl, sl_excluding_commission = get_price_at_pnl(desired_pnl=new_sl_pnl, commission=trade.order_commission, position_size_usd=trade.position_size_usd, leverage=trade.leverage, entry_price=trade.entry_price, type=trade.type)
+            if (trade.type == 'long' and sl > trade.sl_price) or (trade.type == 'short' and sl < trade.sl_price):
+                trade.sl_price = sl
+                trade.triggered_trailing_stop = True
+                trade.trailing_stop_desired_pnl = new_sl_pnl
+                return True
+    return False
+
+def bar_close_times(times: pd.Series, timeframe: MT5Timeframe) -> np.ndarray:
+    """
+    Close time of every bar given its open time, as datetime64[ns].
+    """
+    if timeframe == MT5Timeframe.MN1:
+        return (pd.to_datetime(times) + pd.offsets.MonthBegin(1)).to_numpy(dtype='datetime64[ns]')
+    return (times + TIMEFRAME_DURATIONS[timeframe]).to_numpy(dtype='datetime64[ns]')
+
+def asof_index(main_times: pd.Series, main_timeframe: MT5Timeframe, times: pd.Series, timeframe: MT5Timeframe) -> np.ndarray:
+    """
+    For every main-timeframe bar, the position of the last bar of another timeframe that had closed
+    by the time the main bar closed, or -1 if none had. Bars still forming are never returned, so there
+    is no lookahead.
+
+    :param main_times: Open times of the main-timeframe bars.
+    :param main_timeframe: The main timeframe.
+    :param times: Open times of the other timeframe's bars, sorted.
+    :param timeframe: The other timeframe.
+    :return: An int64 array with one position per main-timeframe bar.
+    """
+    closes = bar_close_times(times, timeframe)
+    main_closes = bar_close_times(main_times, main_timeframe)
+    return np.searchsorted(closes, main_closes, side='right') - 1
+
+def child_ranges(main_times: pd.Series, main_timeframe: MT5Timeframe, times: pd.Series) -> tuple:
+    """
+    For every main-timeframe bar, the range of lower-timeframe bars that open inside it.
+
+    :param main_times: Open times of the main-timeframe bars.
+    :param main_timeframe: The main timeframe.
+    :param times: Open times of the lower-timeframe bars, sorted.
+    :return: A tuple (starts, ends) of int64 arrays; bar i spans positions starts[i]:ends[i].
+    """
+    times = times.to_numpy(dtype='datetime64[ns]')
+    starts = np.searchsorted(times, main_times.to_numpy(dtype='datetime64[ns]'), side='left')
+    ends = np.searchsorted(times, bar_close_times(main_times, main_timeframe), side='left')
+    return starts, ends
+
+def resolve_intrabar(trade: Trade, child_max: np.ndarray, child_min: np.ndarray, start: int, end: int) -> Optional[tuple]:
+    """
+    Decide whether a trade hit TP or its stop first inside a main bar whose range touches both, by
+    walking the lower-timeframe bars start:end in order. A child bar that itself touches both is
+    resolved conservatively as a stop.
+
+    :return: A tuple (close price, reason), or None if no child bar reaches either level.
+    """
+    highs, lows = child_max[start:end], child_min[start:end]
+    if trade.type == 'long':
+        tp_hit = highs >= trade.tp_price
+        liq_hit = lows <= trade.liq_p
+        sl_hit = lows <= trade.sl_price
+    else:  # short position
+        tp_hit = lows <= trade.tp_price
+        liq_hit = highs >= trade.liq_p
+        sl_hit = highs >= trade.sl_price
+
+    hit = tp_hit | liq_hit | sl_hit
+    if not hit.any():
+        return None
+    k = int(hit.argmax())
+    if liq_hit[k]:
+        return trade.sl_price, 'LIQ'
+    if sl_hit[k]:
+        return trade.sl_price, 'SL'
+    return trade.tp_price, 'TP'
+
+def find_first_exit(trade: Trade, bar_max: np.ndarray, bar_min: np.ndarray, close: np.ndarray, start: int, chunk_size: int = 256) -> Optional[tuple]:
+    """
+    Find the first bar at or after `start` where a trade without custom exits hits TP, liquidation or SL,
+    applying the same conditions and priority as Backtester.update_open_trades.
+
+    The remaining bars are scanned in growing chunks so that short-lived trades only touch a few bars.
+
+    :param trade: The open trade.
+    :param bar_max: Per-bar maximum of open, high, low and close.
+    :param bar_min: Per-bar minimum of open, high, low and close.
+    :param close: Per-bar close prices.
+    :param start: The first bar to check.
+    :param chunk_size: The number of bars scanned in the first chunk.
+    :return: A tuple (bar index, close price, reason), or None if the trade stays open until the last bar.
+    """
+    liquidation_pnl = trade.capital * -0.99
+    n = len(close)
+    while start < n:
+        end = min(n, start + chunk_size)
+        highs, lows, closes = bar_max[start:end], bar_min[start:end], close[start:end]
+
+        if trade.type == 'long':
+            unrealized_pnl = ((closes - trade.entry_price) / trade.entry_price * trade.position_size_usd) - trade.order_commission
+            tp_hit = highs >= trade.tp_price
+            liq_hit = (lows <= trade.liq_p) | (unrealized_pnl < liquidation_pnl)
+            sl_hit = lows <= trade.sl_price
+        else:  # short position
+            unrealized_pnl = ((trade.entry_price - closes) / trade.entry_price * trade.position_size_usd) - trade.order_commission
+            tp_hit = lows <= trade.tp_price
+            liq_hit = (highs >= trade.liq_p) | (unrealized_pnl < liquidation_pnl)
+            sl_hit = highs >= trade.sl_price
+
+        hit = tp_hit | liq_hit | sl_hit
+        if hit.any():
+            k = int(hit.argmax())
+            if tp_hit[k]:
+                return start + k, trade.tp_price, 'TP'
+            if liq_hit[k]:
+                return start + k, trade.sl_price, 'LIQ'
+            return start + k, trade.sl_price, 'SL'
+
+        start = end
+        chunk_size *= 4
+
+    return None
+
+class TradeBook:
+    """
+    Open trades indexed by symbol.
+
+    Iterating yields every open trade in the order it was opened, so hooks that scan ``open_trades``
+    keep working, while inserts, removals and per-symbol lookups are O(1).
+    """
+    def __init__(self):
+        self._trades: Dict[int, Trade] = {}
+        self._by_symbol: Dict[str, Dict[int, Trade]] = {}
+
+    def add(self, trade: Trade):
+        self._trades[id(trade)] = trade
+        self._by_symbol.setdefault(trade.symbol, {})[id(trade)] = trade
+
+    def remove(self, trade: Trade):
+        del self._trades[id(trade)]
+        symbol_trades = self._by_symbol[trade.symbol]
+        del symbol_trades[id(trade)]
+        if not symbol_trades:
+            del self._by_symbol[trade.symbol]
+
+    def has_symbol(self, symbol: str) -> bool:
+        """Whether any trade is open for the symbol."""
+        return symbol in self._by_symbol
+
+    def for_symbol(self, symbol: str) -> List[Trade]:
+        """The open trades of the symbol, as a list that stays valid while trades are closed."""
+        symbol_trades = self._by_symbol.get(symbol)
+        return list(symbol_trades.values()) if symbol_trades else []
+
+    def symbols(self) -> List[str]:
+        return list(self._by_symbol.keys())
+
+    def __iter__(self):
+        return iter(self._trades.values())
+
+    def __len__(self) -> int:
+        return len(self._trades)
+
+    def __contains__(self, trade: Trade) -> bool:
+        return id(trade) in self._trades
+
+    def __getitem__(self, index):
+        return list(self._trades.values())[index]
+
+    def __repr__(self) -> str:
+        return f"TradeBook({list(self._trades.values())!r})"
+
 class Backtester:
     def __init__(
         self, 
@@ -63,34 +327,432 @@ class Backtester:
         initial_capital: float, 
         main_timeframe: MT5Timeframe,
         spread_multiplier: float = 0.0001,
-        leverage: float = 500.0
+        leverage: float = 500.0,
+        params: Optional[Dict] = None,
+        event_log: Optional[EventLog] = None,
+        intrabar_timeframe: Optional[MT5Timeframe] = None,
+        profile: bool = False,
     ):
         self.data = data
+        self._stream_window: Optional[Dict[str, pd.DataFrame]] = None
         self.initial_capital = initial_capital
         self.available_capital = initial_capital
         self.main_timeframe = main_timeframe
-        self.open_trades: List[Trade] = []
-        self.closed_trades: List[Trade] = []
-        self.trade_log = []
+        self.open_trades = TradeBook()
+        self.closed_trades = TradeLedger(dataclass_columns(Trade))
         self.spread_multiplier = spread_multiplier
         self.leverage = leverage
+        self.params = params or {}
+        self.events = event_log if event_log is not None else EventLog()
+        self.intrabar_timeframe = intrabar_timeframe
+        self.profile = profile
+        self.profile_table: Optional[pd.DataFrame] = None
         self.backtest_duration = None
+        self.fast_forward = False
+        self._symbol_columns: Dict[str, Dict[str, np.ndarray]] = {}
+        self._bar_extremes: Dict[str, tuple] = {}
+        self._scheduled_exits: Dict[str, Dict[int, List[tuple]]] = {}
+        self._fast_forwarded = set()
+        self._timeframe_index: Dict[tuple, tuple] = {}
+        self._child_ranges: Dict[str, tuple] = {}
+        self._checkpoint_progress = (0, 0, 0, 0)
+        self.reset_equity()
+
+    def run(self, mode: str = 'iterrows', fast_forward: bool = True, checkpoint_path: Optional[str] = None, checkpoint_every: int = 10_000, resume: bool = False):
+        """
+        Run the backtest over every symbol of the main timeframe.
 
-    def run(self):
+        :param mode: 'iterrows' passes a pd.Series per bar to the hooks, 'arrays' extracts the columns
+                     once as NumPy arrays and passes a RowView per bar, 'chronological' does the same but
+                     merges all symbols on time so that open trades of every symbol are updated for a
+                     timestamp before any entry is checked, sharing available capital in time order.
+                     In every mode row.name is the position of the bar in its frame, not its index label.
+        :param fast_forward: In the array modes, resolve the exit of every trade up front with
+                             find_first_exit when the strategy overrides neither exit_condition nor
+                             trailing_stop, instead of checking it bar by bar. The unrealized PnL of
+                             such trades is not refreshed while they are open.
+        :param checkpoint_path: In chronological mode, a directory to snapshot the run to every
+                                `checkpoint_every` timestamps (see save_checkpoint).
+        :param resume: Continue from the last snapshot in `checkpoint_path` instead of starting over.
+                       The backtester must be built with the same data and strategy parameters.
+        """
         start_time = time.time()
+        if self.profile:
+            self.start_profiling()
+        try:
+            if self.main_timeframe not in self.data:
+                raise ValueError(f"Main timeframe {self.main_timeframe} not found in data")
 
-        if self.main_timeframe not in self.data:
-            raise ValueError(f"Main timeframe {self.main_timeframe} not found in data")
+            self.fast_forward = fast_forward and mode != 'iterrows' and not self.has_custom_exits()
+            self._symbol_columns = {}
+            self._bar_extremes = {}
+            self._child_ranges = {}
+            self._scheduled_exits = {}
+            self._fast_forwarded = set()
+            self._timeframe_index = {}
+            self.reset_equity()
 
-        for symbol, df in self.data[self.main_timeframe].items():
-            for _, row in df.iterrows():
-                self.update_open_trades(symbol, row['time'], row, self.main_timeframe)
-                self.check_entry(symbol, row['time'], row, self.main_timeframe)
-        
-        self.close_all_trades(list(self.data[self.main_timeframe].values())[-1]['time'].iloc[-1])
-        
-        end_time = time.time()
-        self.backtest_duration = timedelta(seconds=end_time - start_time)
+            if checkpoint_path is not None and mode != 'chronological':
+                raise ValueError("Checkpoints are only supported in chronological mode")
+
+            if mode == 'chronological':
+                self.run_chronological(checkpoint_path, checkpoint_every, resume)
+            elif mode in ('iterrows', 'arrays'):
+                for symbol, df in self.data[self.main_timeframe].items():
+                    if mode == 'iterrows':
+                        # Rows are named by position, like the RowViews of the other modes, since the
+                        # engine and SignalStrategy index per-bar arrays with row.name
+                        for _, row in df.reset_index(drop=True).iterrows():
+                            self.update_open_trades(symbol, row['time'], row, self.main_timeframe)
+                            self.check_entry(symbol, row['time'], row, self.main_timeframe)
+                    else:
+                        columns = frame_to_columns(df)
+                        self._symbol_columns[symbol] = columns
+                        times = columns['time']
+                        for i in range(len(df)):
+                            row = RowView(columns, i)
+                            self.update_open_trades(symbol, times[i], row, self.main_timeframe)
+                            self.check_entry(symbol, times[i], row, self.main_timeframe)
+
+                self.close_all_trades(list(self.data[self.main_timeframe].values())[-1]['time'].iloc[-1])
+            else:
+                raise ValueError(f"Unknown run mode: {mode}")
+
+            self.events.flush()
+            end_time = time.time()
+            self.backtest_duration = timedelta(seconds=end_time - start_time)
+        finally:
+            if self.profile:
+                self.stop_profiling()
+
+    def run_chronological(self, checkpoint_path: Optional[str] = None, checkpoint_every: int = 10_000, resume: bool = False):
+        symbols = list(self.data[self.main_timeframe].keys())
+        frames = list(self.data[self.main_timeframe].values())
+        columns = [frame_to_columns(df) for df in frames]
+        self._symbol_columns.update(zip(symbols, columns))
+        event_frames, event_bars, boundaries = chronological_order(frames)
+        event_frames, event_bars = event_frames.tolist(), event_bars.tolist()
+        starts, ends = boundaries[:-1].tolist(), boundaries[1:].tolist()
+        self.reset_equity(max(len(starts), 1))
+
+        cursor = 0
+        if checkpoint_path is not None:
+            if resume:
+                cursor = self.load_checkpoint(checkpoint_path)
+            else:
+                self.clear_checkpoint(checkpoint_path)
+
+        bar_time = None
+        for group in range(cursor, len(starts)):
+            bar_time = self.process_timestamp(symbols, columns, event_frames[starts[group]:ends[group]], event_bars[starts[group]:ends[group]])
+
+            if checkpoint_path is not None and (group + 1) % checkpoint_every == 0:
+                self.save_checkpoint(checkpoint_path, group + 1)
+
+        if bar_time is None and cursor > 0 and cursor == len(starts):
+            bar_time = columns[event_frames[-1]]['time'][event_bars[-1]]
+        if bar_time is not None:
+            self.close_all_trades(bar_time)
+            self.settle_equity()
+
+    def process_timestamp(self, symbols: List[str], columns: List[Dict[str, np.ndarray]], event_frames: List[int], event_bars: List[int]) -> datetime:
+        """
+        Process the bars of one timestamp: update the open trades of every symbol, then check entries.
+
+        :return: The timestamp.
+        """
+        rows = [(symbols[frame], RowView(columns[frame], bar)) for frame, bar in zip(event_frames, event_bars)]
+        bar_time = rows[0][1]['time']
+
+        for symbol, row in rows:
+            self.update_open_trades(symbol, bar_time, row, self.main_timeframe)
+        for symbol, row in rows:
+            self.check_entry(symbol, bar_time, row, self.main_timeframe)
+            self._last_close[symbol] = row['close']
+
+        self.record_equity(bar_time)
+        return bar_time
+
+    def reset_equity(self, capacity: int = 1024, max_points: Optional[int] = None):
+        """
+        :param max_points: Keep at most this many equity points. When the curve is full, every other
+                           point is dropped and from then on only every second timestamp is kept (then
+                           every fourth, ...), so memory stays bounded on unbounded streams.
+        """
+        capacity = capacity if max_points is None else min(capacity, max_points)
+        self._equity_values = np.empty(capacity, dtype=np.float64)
+        self._equity_times = np.empty(capacity, dtype='datetime64[ns]')
+        self._equity_size = 0
+        self._equity_max_points = max_points
+        # Every `stride`-th timestamp is kept; the latest one is held in the last slot until then
+        self._equity_stride = 1
+        self._equity_count = 0
+        self._equity_tentative = False
+        self._realized_pnl = 0.0
+        self._last_close: Dict[str, float] = {}
+
+    def record_equity(self, bar_time: datetime):
+        """
+        Append the mark-to-market equity at a timestamp: initial capital plus realized PnL plus the
+        unrealized PnL of every open trade at the latest close of its symbol. Costs O(open trades).
+        """
+        unrealized_pnl = 0.0
+        for trade in self.open_trades:
+            close = self._last_close[trade.symbol]
+            if trade.type == 'long':
+                unrealized_pnl += ((close - trade.entry_price) / trade.entry_price * trade.position_size_usd) - trade.order_commission
+            else:  # short position
+                unrealized_pnl += ((trade.entry_price - close) / trade.entry_price * trade.position_size_usd) - trade.order_commission
+
+        if self._equity_tentative:
+            i = self._equity_size - 1
+        else:
+            if self._equity_size == len(self._equity_values):
+                self._grow_equity()
+            i = self._equity_size
+            self._equity_size = i + 1
+        self._equity_values[i] = self.initial_capital + self._realized_pnl + unrealized_pnl
+        self._equity_times[i] = np.datetime64(bar_time, 'ns')
+        self._equity_count += 1
+        self._equity_tentative = self._equity_count % self._equity_stride != 0
+
+    def _grow_equity(self):
+        n = self._equity_size
+        if self._equity_max_points is None or n < self._equity_max_points:
+            grown = n if self._equity_max_points is None else min(n, self._equity_max_points - n)
+            self._equity_values = np.concatenate((self._equity_values, np.empty(max(grown, 1), dtype=np.float64)))
+            self._equity_times = np.concatenate((self._equity_times, np.empty(max(grown, 1), dtype='datetime64[ns]')))
+            return
+        # Full: keep the points of every second kept timestamp and halve the sampling rate
+        kept = n // 2
+        self._equity_values[:kept] = self._equity_values[1:n:2]
+        self._equity_times[:kept] = self._equity_times[1:n:2]
+        self._equity_size = kept
+        self._equity_stride *= 2
+
+    def settle_equity(self):
+        """Set the last equity point to the realized result once the remaining trades are closed."""
+        if self._equity_size:
+            self._equity_values[self._equity_size - 1] = self.initial_capital + self._realized_pnl
+
+    @property
+    def equity_curve(self) -> Optional[pd.Series]:
+        """
+        Mark-to-market portfolio equity after every timestamp, recorded in chronological and
+        streamed runs (None for the per-symbol modes, which do not visit bars in time order).
+        """
+        if self._equity_size == 0:
+            return None
+        n = self._equity_size
+        return pd.Series(self._equity_values[:n], index=pd.DatetimeIndex(self._equity_times[:n]), name='equity')
+
+    def main_frames(self) -> Dict[str, pd.DataFrame]:
+        """The main-timeframe frames being run: the current window in run_stream, data[main_timeframe] otherwise."""
+        return self._stream_window if self._stream_window is not None else self.data[self.main_timeframe]
+
+    def run_stream(self, source: ChunkSource, prepare: Optional[Callable] = None, warmup: int = 0, fast_forward: bool = True, max_equity_points: Optional[int] = 1_000_000, indicators: Optional[Callable] = None):
+        """
+        Run the backtest chronologically over main-timeframe bars read from disk in chunks, so memory
+        is bounded by the chunk size instead of the history length.
+
+        Each window of stream_windows() is run in place of data[main_timeframe], which is left
+        untouched; open trades, capital and the ledger carry over. Fast-forwarded trades whose exit lies beyond a window
+        are scheduled again on the next one. Only the main timeframe is streamed, so timeframe_row()
+        is not available to the hooks.
+
+        :param source: The chunked source, e.g. ParquetSource or CSVSource.
+        :param prepare: Called as prepare(symbol, df) on every chunk to add indicator columns, see stream_windows.
+        :param warmup: The number of bars of history prepare() needs from the previous chunk.
+        :param indicators: Builds the streaming indicators of a symbol, whose state carries across
+                           chunks, see stream_windows. Use it for EMA, MACD and Wilder's RSI, which
+                           prepare() can only approximate at chunk boundaries.
+        :param fast_forward: See run().
+        :param max_equity_points: The size the equity curve is bounded to; beyond it the curve is
+                                  sampled at a coarser interval (see reset_equity). None to keep every point.
+        """
+        start_time = time.time()
+        if self.profile:
+            self.start_profiling()
+        try:
+            self.fast_forward = fast_forward and not self.has_custom_exits()
+            self._fast_forwarded = set()
+            self._timeframe_index = {}
+            self.reset_equity(max_points=max_equity_points)
+
+            bar_time = None
+            for window in stream_windows(source, prepare, warmup, indicators):
+                symbols = list(window.keys())
+                columns = [frame_to_columns(df) for df in window.values()]
+                self._stream_window = window
+                self._symbol_columns = dict(zip(symbols, columns))
+                self._bar_extremes = {}
+                self._child_ranges = {}
+                self._scheduled_exits = {}
+                for trade in list(self.open_trades):
+                    if id(trade) in self._fast_forwarded and trade.symbol in window:
+                        self.schedule_exit(trade, 0)
+
+                event_frames, event_bars, boundaries = chronological_order(list(window.values()))
+                event_frames, event_bars, boundaries = event_frames.tolist(), event_bars.tolist(), boundaries.tolist()
+                for start, end in zip(boundaries[:-1], boundaries[1:]):
+                    bar_time = self.process_timestamp(symbols, columns, event_frames[start:end], event_bars[start:end])
+
+            if bar_time is not None:
+                self.close_all_trades(bar_time, self._last_close)
+                self.settle_equity()
+
+            self.events.flush()
+            self.backtest_duration = timedelta(seconds=time.time() - start_time)
+        finally:
+            self._stream_window = None
+            if self.profile:
+                self.stop_profiling()
+
+    def start_profiling(self):
+        """
+        Time every call of the strategy hooks and engine phases in PROFILED_METHODS. The methods are
+        wrapped on the instance, so nothing is timed, and nothing costs extra, unless profiling is on.
+        """
+        self._profile_timings = {name: array('d') for name in PROFILED_METHODS}
+        self._profile_start = time.perf_counter()
+        for name in PROFILED_METHODS:
+            # Drop a wrapper left behind by an earlier run so that methods are never wrapped twice
+            self.__dict__.pop(name, None)
+            setattr(self, name, self._timed(getattr(self, name), self._profile_timings[name]))
+
+    @staticmethod
+    def _timed(method: Callable, timings: array) -> Callable:
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                timings.append(time.perf_counter() - start)
+        return timed
+
+    def stop_profiling(self):
+        """Remove the timing wrappers and build profile_table."""
+        elapsed = time.perf_counter() - self._profile_start
+        for name in PROFILED_METHODS:
+            self.__dict__.pop(name, None)
+        self.profile_table = self.profile_report(elapsed)
+
+    def profile_report(self, elapsed: float) -> pd.DataFrame:
+        """
+        One row per profiled method with its call count, total and mean wall time, the percentiles
+        of a single call and its share of the run. Times include nested calls, e.g. the time of
+        update_open_trades includes exit_condition and close_trade.
+        """
+        rows = []
+        for name, timings in self._profile_timings.items():
+            values = np.frombuffer(timings, dtype=np.float64) if len(timings) else np.zeros(1)
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            rows.append({
+                'Method': name,
+                'Calls': len(timings),
+                'Total (s)': values.sum(),
+                'Mean (us)': values.mean() * 1e6,
+                'p50 (us)': p50 * 1e6,
+                'p95 (us)': p95 * 1e6,
+                'p99 (us)': p99 * 1e6,
+                'Max (us)': values.max() * 1e6,
+                'Run (%)': values.sum() / elapsed * 100 if elapsed > 0 else 0,
+            })
+        return pd.DataFrame(rows).sort_values('Total (s)', ascending=False, ignore_index=True)
+
+    def checkpoint_state(self) -> Dict:
+        """
+        State of the strategy itself to include in checkpoints, e.g. counters kept in attributes.
+        Override together with restore_state if the strategy has any.
+        """
+        return {}
+
+    def restore_state(self, state: Dict):
+        pass
+
+    def save_checkpoint(self, path: str, cursor: int):
+        """
+        Snapshot the run so it can be resumed from timestamp number `cursor`.
+
+        Closed trades and the equity curve are written incrementally: each snapshot adds one
+        ledger-NNNNN.npz segment with the trades closed since the previous one and one equity-NNNNN.npz
+        segment with the equity points recorded since then. The rest of the state (open trades,
+        scheduled exits, available capital, cursor and checkpoint_state()) is small and pickled to
+        state.pkl, which is replaced atomically so an interrupted write keeps the previous snapshot.
+        """
+        os.makedirs(path, exist_ok=True)
+        state_file = os.path.join(path, 'state.pkl')
+        saved_trades, segments, saved_equity, equity_segments = self._checkpoint_progress
+        if len(self.closed_trades) > saved_trades:
+            np.savez(os.path.join(path, f'ledger-{segments:05d}.npz'), **self.closed_trades.segment(saved_trades))
+            segments += 1
+        if self._equity_size > saved_equity:
+            np.savez(
+                os.path.join(path, f'equity-{equity_segments:05d}.npz'),
+                values=self._equity_values[saved_equity:self._equity_size], times=self._equity_times[saved_equity:self._equity_size],
+            )
+            equity_segments += 1
+
+        open_trades = list(self.open_trades)
+        state = {
+            'cursor': cursor,
+            'available_capital': self.available_capital,
+            'open_trades': open_trades,
+            'fast_forwarded': [id(trade) in self._fast_forwarded for trade in open_trades],
+            'scheduled_exits': self._scheduled_exits,
+            'categories': self.closed_trades.categories(),
+            'saved_trades': len(self.closed_trades),
+            'segments': segments,
+            'saved_equity': self._equity_size,
+            'equity_segments': equity_segments,
+            'realized_pnl': self._realized_pnl,
+            'last_close': self._last_close,
+            'strategy': self.checkpoint_state(),
+        }
+        with open(state_file + '.tmp', 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(state_file + '.tmp', state_file)
+        self._checkpoint_progress = (len(self.closed_trades), segments, self._equity_size, equity_segments)
+
+    def load_checkpoint(self, path: str) -> int:
+        """
+        Restore the state saved by save_checkpoint.
+
+        :return: The cursor, i.e. the number of timestamps already processed.
+        """
+        with open(os.path.join(path, 'state.pkl'), 'rb') as f:
+            state = pickle.load(f)
+
+        self.closed_trades = TradeLedger(dataclass_columns(Trade))
+        for segment in range(state['segments']):
+            with np.load(os.path.join(path, f'ledger-{segment:05d}.npz')) as blocks:
+                self.closed_trades.append_segment(dict(blocks), state['categories'])
+
+        self.available_capital = state['available_capital']
+        self.open_trades = TradeBook()
+        self._fast_forwarded = set()
+        for trade, fast_forwarded in zip(state['open_trades'], state['fast_forwarded']):
+            self.open_trades.add(trade)
+            if fast_forwarded:
+                self._fast_forwarded.add(id(trade))
+        self._scheduled_exits = state['scheduled_exits']
+        self._checkpoint_progress = (state['saved_trades'], state['segments'], state['saved_equity'], state['equity_segments'])
+        self.reset_equity(max(state['saved_equity'], 1024))
+        for segment in range(state['equity_segments']):
+            with np.load(os.path.join(path, f'equity-{segment:05d}.npz')) as equity:
+                n = len(equity['values'])
+                self._equity_values[self._equity_size:self._equity_size + n] = equity['values']
+                self._equity_times[self._equity_size:self._equity_size + n] = equity['times']
+                self._equity_size += n
+        self._realized_pnl = state['realized_pnl']
+        self._last_close = state['last_close']
+        self.restore_state(state['strategy'])
+        return state['cursor']
+
+    def clear_checkpoint(self, path: str):
+        for file in glob.glob(os.path.join(path, 'ledger-*.npz')) + glob.glob(os.path.join(path, 'equity-*.npz')) + glob.glob(os.path.join(path, 'state.pkl')):
+            os.remove(file)
+        self._checkpoint_progress = (0, 0, 0, 0)
 
     def open_trade(self, symbol: str, time: datetime, required_capital: float, position_size_usd: float, trade_info: Dict):
         entry_price = trade_info['entry_price']
@@ -113,9 +775,16 @@ class Backtester:
             spread_multiplier=self.spread_multiplier,
         )
 
-        self.open_trades.append(trade)
+        self.open_trades.add(trade)
         self.available_capital -= required_capital + trade.order_commission
-        print(f"{symbol} - OPENED TRADE    - {trade.type.upper()} - ENTRY: ${trade.entry_price:.3f} - TP: ${trade.tp_price:.3f} ({(trade.entry_price / trade.tp_price - 1) * 100:.3f}% DIFF ENTRY)( PNL AT TP: ${trade.potential_profit_usd:.2f}) - SL: ${trade.sl_price:.3f} ({(trade.entry_price / trade.sl_price - 1) * 100:.3f}%) - LIQ: ${trade.liq_p:.3f} - BE: ${trade.be_p:.3f} - AVAILABLE CAPITAL: ${self.available_capital:.3f}")
+        if self.events.enabled(INFO):
+            self.events.log(
+                INFO, 'trade_opened', time, symbol, type=trade.type, entry_price=trade.entry_price,
+                tp_price=trade.tp_price, tp_diff=(trade.entry_price / trade.tp_price - 1) * 100, potential_profit_usd=trade.potential_profit_usd,
+                sl_price=trade.sl_price, sl_diff=(trade.entry_price / trade.sl_price - 1) * 100, liq_p=trade.liq_p, be_p=trade.be_p,
+                available_capital=self.available_capital,
+            )
+        return trade
 
     def check_entry(self, symbol: str, time: datetime, row: pd.Series, timeframe: MT5Timeframe):
         trade_info = self.entry_condition(symbol, time, row, self.open_trades, self.closed_trades, timeframe)
@@ -124,32 +793,128 @@ class Backtester:
             position_size_usd = calculate_position_size(capital, self.leverage)
             
             if capital <= self.available_capital:
-                self.open_trade(symbol, time, capital, position_size_usd, trade_info)
+                trade = self.open_trade(symbol, time, capital, position_size_usd, trade_info)
+                if self.fast_forward:
+                    self.schedule_exit(trade, row.name + 1)
             else:
-                print(f"{symbol} - NOT ENOUGH CAPITAL - Trade Capital: ${capital} - Available Capital: ${self.available_capital}")
+                self.events.log(WARNING, 'entry_rejected', time, symbol, capital=capital, available_capital=self.available_capital)
+
+    def log_event(self, kind: str, time: Optional[datetime] = None, symbol: Optional[str] = None, level: int = INFO, **fields):
+        """
+        Record a strategy event, e.g. an entry signal, in the event log instead of printing it.
+        """
+        self.events.log(level, kind, time, symbol, **fields)
+
+    def timeframe_row(self, timeframe: MT5Timeframe, symbol: str, row: pd.Series) -> Optional[RowView]:
+        """
+        The latest closed bar of another timeframe for a symbol, as seen at the close of a main-timeframe row.
+
+        The as-of index mapping main-timeframe bars to bars of `timeframe` is computed once per symbol
+        and run with asof_index, so each lookup from a hook is O(1). It is looked up by the position
+        of the row in its frame, which every run mode passes as row.name, whatever the frame's index.
+
+        :param timeframe: The timeframe to read, e.g. MT5Timeframe.H4.
+        :param symbol: The symbol.
+        :param row: The main-timeframe row passed to the hook.
+        :return: A RowView of the higher-timeframe bar, or None if none had closed yet.
+        """
+        key = (timeframe, symbol)
+        if key not in self._timeframe_index:
+            main_df = self.main_frames()[symbol]
+            df = self.data[timeframe][symbol]
+            self._timeframe_index[key] = (asof_index(main_df['time'], self.main_timeframe, df['time'], timeframe), frame_to_columns(df))
+
+        index, columns = self._timeframe_index[key]
+        position = index[row.name]  # row.name is the bar's position, see run()
+        return RowView(columns, position) if position >= 0 else None
+
+    def has_custom_exits(self) -> bool:
+        return type(self).exit_condition is not Backtester.exit_condition or type(self).trailing_stop is not Backtester.trailing_stop
+
+    def schedule_exit(self, trade: Trade, start: int):
+        """
+        Resolve when a trade without custom exits closes and schedule the close for that bar.
+        """
+        if trade.symbol not in self._bar_extremes:
+            columns = self._symbol_columns[trade.symbol]
+            ohlc = [columns['open'], columns['high'], columns['low'], columns['close']]
+            self._bar_extremes[trade.symbol] = (np.maximum.reduce(ohlc), np.minimum.reduce(ohlc), columns['close'])
+
+        self._fast_forwarded.add(id(trade))
+        bar_max, bar_min, close = self._bar_extremes[trade.symbol]
+        exit = find_first_exit(trade, bar_max, bar_min, close, start)
+        if exit is not None:
+            bar, close_price, reason = exit
+            if reason == 'TP' and self.intrabar_timeframe is not None:
+                close_price, reason = self.resolve_tp_bar(trade, bar, bar_max[bar], bar_min[bar])
+            self._scheduled_exits.setdefault(trade.symbol, {}).setdefault(bar, []).append((trade, close_price, reason))
 
     def update_open_trades(self, symbol: str, time: datetime, row: pd.Series, timeframe: MT5Timeframe):
-        for trade in self.open_trades[:]:
-            if trade.symbol == symbol:
-                self.update_trade_metrics(trade, row)
-
-                long_trade_should_close_at_tp = trade.type == 'long' and (row['close'] >= trade.tp_price or row['high'] >= trade.tp_price or row['low'] >= trade.tp_price or row['open'] >= trade.tp_price)
-                short_trade_should_close_at_tp = trade.type == 'short' and (row['close'] <= trade.tp_price or row['high'] <= trade.tp_price or row['low'] <= trade.tp_price or row['open'] <= trade.tp_price)
-                long_trade_should_close_at_sl = trade.type == 'long' and (row['close'] <= trade.sl_price or row['high'] <= trade.sl_price or row['low'] <= trade.sl_price or row['open'] <= trade.sl_price)
-                short_trade_should_close_at_sl = trade.type == 'short' and (row['close'] >= trade.sl_price or row['high'] >= trade.sl_price or row['low'] >= trade.sl_price or row['open'] >= trade.sl_price)
-                long_trade_should_liquidate = trade.type == 'long' and (row['close'] <= trade.liq_p or row['high'] <= trade.liq_p or row['low'] <= trade.liq_p or row['open'] <= trade.liq_p or trade.unrealized_pnl < (trade.capital * -0.99) )
-                short_trade_should_liquidate = trade.type == 'short' and (row['close'] >= trade.liq_p or row['high'] >= trade.liq_p or row['low'] >= trade.liq_p or row['open'] >= trade.liq_p or trade.unrealized_pnl < (trade.capital * -0.99) )
-                
-                if self.exit_condition(trade, time, row, self.open_trades, self.closed_trades, timeframe):
-                    self.close_trade(trade, time, row['close'], 'exit_condition')
-                elif long_trade_should_close_at_tp or short_trade_should_close_at_tp:
-                    self.close_trade(trade, time, trade.tp_price, 'TP')
-                elif long_trade_should_liquidate or short_trade_should_liquidate:
-                    self.close_trade(trade, time, trade.sl_price, 'LIQ')
-                elif long_trade_should_close_at_sl or short_trade_should_close_at_sl:
-                    self.close_trade(trade, time, trade.sl_price, 'SL')
+        # Every run mode names rows by their position in the symbol's frame
+        bar = row.name
+        scheduled_exits = self._scheduled_exits.get(symbol)
+        if scheduled_exits:
+            for trade, close_price, reason in scheduled_exits.pop(bar, ()):
+                self.close_trade(trade, time, close_price, reason)
+
+        for trade in self.open_trades.for_symbol(symbol):
+            if id(trade) in self._fast_forwarded:
+                continue
+
+            self.update_trade_metrics(trade, row)
+
+            row_open, row_high, row_low, row_close = row['open'], row['high'], row['low'], row['close']
+            bar_max = max(row_open, row_high, row_low, row_close)
+            bar_min = min(row_open, row_high, row_low, row_close)
+
+            long_trade_should_close_at_tp = trade.type == 'long' and bar_max >= trade.tp_price
+            short_trade_should_close_at_tp = trade.type == 'short' and bar_min <= trade.tp_price
+            long_trade_should_close_at_sl = trade.type == 'long' and bar_min <= trade.sl_price
+            short_trade_should_close_at_sl = trade.type == 'short' and bar_max >= trade.sl_price
+            long_trade_should_liquidate = trade.type == 'long' and (bar_min <= trade.liq_p or trade.unrealized_pnl < (trade.capital * -0.99))
+            short_trade_should_liquidate = trade.type == 'short' and (bar_max >= trade.liq_p or trade.unrealized_pnl < (trade.capital * -0.99))
+            
+            if self.exit_condition(trade, time, row, self.open_trades, self.closed_trades, timeframe):
+                self.close_trade(trade, time, row_close, 'exit_condition')
+            elif long_trade_should_close_at_tp or short_trade_should_close_at_tp:
+                if self.intrabar_timeframe is not None:
+                    close_price, reason = self.resolve_tp_bar(trade, bar, bar_max, bar_min)
+                    self.close_trade(trade, time, close_price, reason)
                 else:
-                    self.trailing_stop(trade, time, row, self.open_trades, self.closed_trades, timeframe)
+                    self.close_trade(trade, time, trade.tp_price, 'TP')
+            elif long_trade_should_liquidate or short_trade_should_liquidate:
+                self.close_trade(trade, time, trade.sl_price, 'LIQ')
+            elif long_trade_should_close_at_sl or short_trade_should_close_at_sl:
+                self.close_trade(trade, time, trade.sl_price, 'SL')
+            else:
+                self.trailing_stop(trade, time, row, self.open_trades, self.closed_trades, timeframe)
+
+    def resolve_tp_bar(self, trade: Trade, bar: int, bar_max: float, bar_min: float) -> tuple:
+        """
+        For a main bar where the trade reaches TP, check whether the bar also reaches its stop or
+        liquidation price, and if so walk the bars of intrabar_timeframe inside it with
+        resolve_intrabar to find which came first. The child-bar ranges of a symbol are computed
+        once with child_ranges, so bars that only touch one level cost nothing extra.
+
+        :param bar: The position of the main bar in the symbol's frame.
+        :return: A tuple (close price, reason); TP when the bar is not ambiguous or has no child bars.
+        """
+        if trade.type == 'long':
+            ambiguous = bar_min <= trade.sl_price or bar_min <= trade.liq_p
+        else:  # short position
+            ambiguous = bar_max >= trade.sl_price or bar_max >= trade.liq_p
+        if not ambiguous:
+            return trade.tp_price, 'TP'
+
+        if trade.symbol not in self._child_ranges:
+            df = self.data[self.intrabar_timeframe][trade.symbol]
+            columns = [df[column].to_numpy() for column in ('open', 'high', 'low', 'close')]
+            starts, ends = child_ranges(self.main_frames()[trade.symbol]['time'], self.main_timeframe, df['time'])
+            self._child_ranges[trade.symbol] = (starts, ends, np.maximum.reduce(columns), np.minimum.reduce(columns))
+
+        starts, ends, child_max, child_min = self._child_ranges[trade.symbol]
+        resolved = resolve_intrabar(trade, child_max, child_min, starts[bar], ends[bar])
+        return resolved if resolved is not None else (trade.tp_price, 'TP')
 
     def update_trade_metrics(self, trade: Trade, row: pd.Series):
         if trade.type == 'long':
@@ -179,46 +944,156 @@ class Backtester:
         trade.unrealized_pnl = 0
         trade.unrealized_pnl_excluding_commission = 0
         self.open_trades.remove(trade)
+        self._fast_forwarded.discard(id(trade))
         self.closed_trades.append(trade)
+        self._realized_pnl += trade.pnl
         self.available_capital += trade.capital + trade.pnl + trade.order_commission
-        self.trade_log.append(trade)
 
-        print(f"{trade.symbol} - CLOSED TRADE    - {trade.type.upper()} - ENTRY: ${trade.entry_price:.3f} - CLOSE: ${close_price:.3f} - PNL: ${trade.pnl:.2f} - SL: ${trade.sl_price:.3f} - TP: ${trade.tp_price:.3f} - REASON: {reason} - AVAILABLE CAPITAL: ${self.available_capital:.3f}")
+        if self.events.enabled(INFO):
+            self.events.log(
+                INFO, 'trade_closed', close_time, trade.symbol, type=trade.type, entry_price=trade.entry_price,
+                close_price=close_price, pnl=trade.pnl, sl_price=trade.sl_price, tp_price=trade.tp_price, reason=reason,
+                available_capital=self.available_capital,
+            )
+
+    def close_all_trades(self, last_timestamp: datetime, last_closes: Optional[Dict[str, float]] = None):
+        self._scheduled_exits = {}
+        for trade in list(self.open_trades):
+            if last_closes is not None:
+                close_price = last_closes[trade.symbol]
+            else:
+                close_price = self.main_frames()[trade.symbol]['close'].iloc[-1]
+            self.close_trade(trade, last_timestamp, close_price, 'end_of_backtest')
 
-    def close_all_trades(self, last_timestamp: datetime):
-        for trade in self.open_trades[:]:  # Create a copy of the list to iterate over
-            self.close_trade(trade, last_timestamp, self.data[self.main_timeframe][trade.symbol]['close'].iloc[-1], 'end_of_backtest')
+    @property
+    def trade_log(self) -> pd.DataFrame:
+        return self.closed_trades.to_frame()
 
     def generate_report(self):
-        trades_df = pd.DataFrame([trade.__dict__ for trade in self.closed_trades])
-
-        return performance(trades_df, self.initial_capital, self.main_timeframe, self.backtest_duration)    
-
-    def generate_report_per_symbol(self):
-        symbol_reports = {}
-        for symbol in self.data.keys():
-            symbol_trades = [trade for trade in self.closed_trades if trade.symbol == symbol]
-            if symbol_trades:
-                trades_df = pd.DataFrame([trade.__dict__ for trade in symbol_trades])
-                report = performance(trades_df, self.initial_capital)
-                
-                # Insert a row at the top with the symbol
-                symbol_row = pd.DataFrame({'Metric': ['Symbol'], 'Value': [symbol]})
-                report = pd.concat([symbol_row, report]).reset_index(drop=True)
-                
-                symbol_reports[symbol] = report
-            else:
-                print(f"No closed trades for symbol: {symbol}")
-        return symbol_reports
-    
-    def entry_condition(self, symbol: str, time: datetime, row: pd.Series, open_trades: List[Trade], closed_trades: List[Trade]) -> Optional[Dict]:
+        trades_df = self.closed_trades.to_frame()
+
+        return performance(trades_df, self.initial_capital, self.main_timeframe, self.backtest_duration, self.equity_curve)    
+
+    def generate_grouped_report(self, by) -> pd.DataFrame:
+        """
+        The performance metrics per group of closed trades, e.g. by=['symbol', 'side'] or 'month'.
+        Keys found in self.params are added as constant columns, so reports of several runs can be
+        concatenated and compared by parameter. See grouped_performance_metrics for the other keys.
+        """
+        trades_df = self.closed_trades.to_frame()
+        by = [by] if isinstance(by, str) else list(by)
+        for key in by:
+            if key in self.params and key not in trades_df.columns:
+                trades_df[key] = self.params[key]
+
+        return grouped_performance_metrics(trades_df, self.initial_capital, self.main_timeframe, self.backtest_duration, by)
+
+    def generate_report_per_symbol(self) -> pd.DataFrame:
+        return self.generate_grouped_report('symbol')
+
+    def entry_condition(self, symbol: str, time: datetime, row: pd.Series, open_trades: TradeBook, closed_trades: TradeLedger, timeframe: MT5Timeframe) -> Optional[Dict]:
         # This method should be overridden in the subclass
         return None
 
-    def exit_condition(self, trade: Trade, time: datetime, row: pd.Series, open_trades: List[Trade], closed_trades: List[Trade]) -> bool:
+    def exit_condition(self, trade: Trade, time: datetime, row: pd.Series, open_trades: TradeBook, closed_trades: TradeLedger, timeframe: MT5Timeframe) -> bool:
         # This method should be overridden in the subclass
         return False
 
-    def trailing_stop(self, trade: Trade, time: datetime, row: pd.Series, open_trades: List[Trade], closed_trades: List[Trade]):
+    def trailing_stop(self, trade: Trade, time: datetime, row: pd.Series, open_trades: TradeBook, closed_trades: TradeLedger, timeframe: MT5Timeframe):
+        # This method should be overridden in the subclass
+        pass
+
+class SignalStrategy(Backtester):
+    """
+    Declarative strategy: instead of deciding bar by bar in entry_condition, override compute_signals
+    to return arrays computed once over a symbol's whole main-timeframe frame with pandas/NumPy:
+
+    - 'long' / 'short': boolean entry flags (long wins if both are set)
+    - 'tp_price' / 'sl_price': the TP and SL prices of an entry on that bar
+    - 'capital': the capital to commit, an array or a scalar
+
+    Entries are taken at the close of the signal bar, with at most one open trade per symbol. Set
+    trailing_stop_steps to (trigger_pnl, new_sl_pnl) pairs to trail the stop with step_trailing_stop.
+    run() defaults to mode='kernel', which hands the arrays to sesto.kernel.simulate and makes no hook
+    calls or events at all; the other modes replay the signals through the regular engine.
+    """
+    trailing_stop_steps: List[tuple] = []
+
+    def compute_signals(self, symbol: str, df: pd.DataFrame) -> Dict[str, np.ndarray]:
         # This method should be overridden in the subclass
-        pass
\ No newline at end of file
+        raise NotImplementedError
+
+    def prepare_signals(self):
+        self.signals: Dict[str, Dict[str, np.ndarray]] = {}
+        for symbol, df in self.data[self.main_timeframe].items():
+            signals = self.compute_signals(symbol, df)
+            n = len(df)
+            self.signals[symbol] = {
+                'long': np.broadcast_to(np.asarray(signals.get('long', False), dtype=np.bool_), n),
+                'short': np.broadcast_to(np.asarray(signals.get('short', False), dtype=np.bool_), n),
+                'tp_price': np.broadcast_to(np.asarray(signals['tp_price'], dtype=np.float64), n),
+                'sl_price': np.broadcast_to(np.asarray(signals['sl_price'], dtype=np.float64), n),
+                'capital': np.broadcast_to(np.asarray(signals['capital'], dtype=np.float64), n),
+            }
+
+    def run(self, mode: str = 'kernel', fast_forward: bool = True, checkpoint_path: Optional[str] = None, checkpoint_every: int = 10_000, resume: bool = False):
+        """
+        Compute the signals and run the backtest.
+
+        :param mode: 'kernel' for the compiled simulation, or any Backtester.run mode.
+        :param fast_forward: See Backtester.run; not used by the kernel.
+        :param checkpoint_path: See Backtester.run; checkpoints need mode='chronological'.
+        """
+        self.prepare_signals()
+        if mode != 'kernel':
+            return super().run(mode, fast_forward, checkpoint_path, checkpoint_every, resume)
+        if checkpoint_path is not None:
+            raise ValueError("Checkpoints are only supported in chronological mode")
+
+        if type(self).exit_condition is not Backtester.exit_condition or type(self).trailing_stop is not SignalStrategy.trailing_stop:
+            raise ValueError("mode='kernel' does not call exit_condition or trailing_stop overrides; use mode='chronological'")
+        if self.intrabar_timeframe is not None:
+            raise ValueError("mode='kernel' does not resolve bars intrabar; use mode='chronological'")
+
+        from sesto.kernel import simulate
+
+        start_time = time.time()
+        self.open_trades = TradeBook()
+        self.closed_trades, self.available_capital = simulate(
+            self.data, self.main_timeframe, self.signals, self.initial_capital,
+            self.spread_multiplier, self.leverage, self.trailing_stop_steps,
+        )
+        self.backtest_duration = timedelta(seconds=time.time() - start_time)
+        if self.profile:
+            # No hooks are called in the compiled loop, so it is reported as a single phase
+            elapsed = self.backtest_duration.total_seconds()
+            self._profile_timings = {'simulate': array('d', [elapsed])}
+            self.profile_table = self.profile_report(elapsed)
+
+    def entry_condition(self, symbol: str, time: datetime, row: pd.Series, open_trades: TradeBook, closed_trades: TradeLedger, timeframe: MT5Timeframe) -> Optional[Dict]:
+        if open_trades.has_symbol(symbol):
+            return None
+
+        signals = self.signals[symbol]
+        i = row.name  # The bar's position in the frame, in every run mode
+        if signals['long'][i]:
+            trade_type = 'long'
+        elif signals['short'][i]:
+            trade_type = 'short'
+        else:
+            return None
+
+        return {
+            'entry_price': row['close'],
+            'type': trade_type,
+            'capital': signals['capital'][i],
+            'tp_price': signals['tp_price'][i],
+            'sl_price': signals['sl_price'][i],
+        }
+
+    def trailing_stop(self, trade: Trade, time: datetime, row: pd.Series, open_trades: TradeBook, closed_trades: TradeLedger, timeframe: MT5Timeframe):
+        if self.trailing_stop_steps:
+            step_trailing_stop(trade, self.trailing_stop_steps)
+
+    def has_custom_exits(self) -> bool:
+        return bool(self.trailing_stop_steps) or type(self).exit_condition is not Backtester.exit_condition or type(self).trailing_stop is not SignalStrategy.trailing_stop
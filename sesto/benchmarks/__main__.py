@@ -0,0 +1,40 @@
+import argparse
+import sys
+import pandas as pd
+from sesto.benchmarks.runner import compare_to_baseline, load_baseline, run_benchmarks, save_baseline
+from sesto.metatrader.constants import MT5Timeframe
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the backtest engine on synthetic data.")
+    parser.add_argument('--symbols', type=int, default=5)
+    parser.add_argument('--bars', type=int, default=20_000)
+    parser.add_argument('--timeframe', default='H1', choices=[timeframe.name for timeframe in MT5Timeframe if timeframe != MT5Timeframe.MN1])
+    parser.add_argument('--generator', default='gbm', choices=['gbm', 'random_walk'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help="Skip the peak memory measurement")
+    parser.add_argument('--baseline', help="JSON baseline to compare against (or to write with --save)")
+    parser.add_argument('--save', action='store_true', help="Write the results to --baseline instead of comparing")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    config = {key: getattr(args, key) for key in ('symbols', 'bars', 'timeframe', 'generator', 'seed', 'repeat')}
+    results = run_benchmarks(
+        args.symbols, args.bars, MT5Timeframe[args.timeframe], args.generator, args.seed, args.repeat, not args.no_memory,
+    )
+
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(results.to_string(index=False))
+
+        if args.baseline and args.save:
+            save_baseline(results, args.baseline, config)
+            print(f"Baseline saved to {args.baseline}")
+        elif args.baseline:
+            comparison = compare_to_baseline(results, load_baseline(args.baseline), args.tolerance)
+            print(comparison.to_string(index=False))
+            if comparison['regression'].any():
+                print(f"Regressions: {', '.join(comparison.loc[comparison['regression'], 'benchmark'])}")
+                sys.exit(1)
+
+if __name__ == '__main__':
+    main()
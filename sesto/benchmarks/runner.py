@@ -0,0 +1,167 @@
+import json
+import platform
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional
+from sesto.benchmarks.strategies import RSIReversal, RSIReversalSignals, TrailingRSIReversal, add_indicators
+from sesto.benchmarks.synthetic import synthetic_data
+from sesto.indicators import ATR, BB, EMA, MACD, ROC, RSI, SMA, with_indicators
+from sesto.metatrader.constants import MT5Timeframe
+
+# (benchmark name, strategy class, run mode)
+BACKTEST_CASES = [
+    ('run/arrays', RSIReversal, 'arrays'),
+    ('run/chronological', RSIReversal, 'chronological'),
+    ('run/chronological+trailing', TrailingRSIReversal, 'chronological'),
+    ('run/kernel', RSIReversalSignals, 'kernel'),
+]
+
+INDICATOR_CASES = [
+    ('indicator/SMA', lambda df: SMA(df, 14)),
+    ('indicator/EMA', lambda df: EMA(df, 14)),
+    ('indicator/RSI', lambda df: RSI(df, 14)),
+    ('indicator/ROC', lambda df: ROC(df, 14)),
+    ('indicator/BB', lambda df: BB(df, 14, 2)),
+    ('indicator/MACD', lambda df: MACD(df)),
+    ('indicator/ATR', lambda df: ATR(df, 14)),
+    ('indicator/RSI-wilder', lambda df: RSI(df, 14, wilder=True)),
+    ('indicator/batch-7-14-21', lambda df: with_indicators(df, [7, 14, 21])),
+]
+
+def measure(setup: Callable, repeat: int = 3, memory: bool = True) -> Dict:
+    """
+    Time a benchmark and measure its peak memory.
+
+    :param setup: Called before every repetition; returns the function to measure, so each run starts
+                  from fresh state. The function may return a trade count.
+    :param repeat: The number of timed repetitions; the fastest one is reported.
+    :param memory: Measure peak traced memory in one extra repetition (tracemalloc slows the run
+                   down, so it is kept out of the timings).
+    :return: A dict with seconds, trades and peak_mb.
+    """
+    seconds, trades = [], None
+    for _ in range(repeat):
+        function = setup()
+        start = time.perf_counter()
+        trades = function()
+        seconds.append(time.perf_counter() - start)
+
+    peak_mb = np.nan
+    if memory:
+        function = setup()
+        tracemalloc.start()
+        function()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+    return {'seconds': min(seconds), 'trades': trades, 'peak_mb': peak_mb}
+
+def run_benchmarks(
+    symbols: int = 5,
+    bars: int = 20_000,
+    timeframe: MT5Timeframe = MT5Timeframe.H1,
+    generator: str = 'gbm',
+    seed: int = 0,
+    repeat: int = 3,
+    memory: bool = True,
+    initial_capital: float = 1_000_000,
+    leverage: float = 250,
+) -> pd.DataFrame:
+    """
+    Benchmark Backtester.run in several modes, generate_report and the indicator functions on
+    synthetic data.
+
+    :param symbols: The number of symbols, taken from CURRENCY_PAIRS.
+    :param bars: Bars per symbol.
+    :param timeframe: The main timeframe of the synthetic data.
+    :param generator: 'gbm' or 'random_walk'.
+    :param seed: Seed of the synthetic data.
+    :param repeat: Timed repetitions per benchmark.
+    :param memory: Also measure peak memory.
+    :return: One row per benchmark with seconds, bars/sec, trades/sec and peak memory (MB).
+    """
+    from sesto.metatrader.constants import CURRENCY_PAIRS
+
+    data = synthetic_data(CURRENCY_PAIRS[:symbols], bars, [timeframe], generator, seed=seed)
+    add_indicators(data, timeframe)
+    total_bars = sum(len(df) for df in data[timeframe].values())
+
+    rows = []
+    backtest = None
+    for name, strategy_cls, mode in BACKTEST_CASES:
+        def setup(strategy_cls=strategy_cls, mode=mode):
+            nonlocal backtest
+            backtest = strategy_cls(data, initial_capital, timeframe, leverage=leverage)
+
+            def function():
+                backtest.run(mode=mode)
+                return len(backtest.closed_trades)
+            return function
+        rows.append({'benchmark': name, 'bars': total_bars, **measure(setup, repeat, memory)})
+
+        if mode == 'chronological' and strategy_cls is RSIReversal:
+            def setup(finished=backtest):
+                def function():
+                    finished.generate_report()
+                return function
+            rows.append({'benchmark': 'generate_report', 'bars': total_bars, **measure(setup, repeat, memory)})
+
+    frames = [df[['time', 'open', 'high', 'low', 'close', 'tick_volume']] for df in data[timeframe].values()]
+    for name, indicator in INDICATOR_CASES:
+        def setup(indicator=indicator):
+            copies = [df.copy() for df in frames]
+
+            def function():
+                for df in copies:
+                    indicator(df)
+            return function
+        rows.append({'benchmark': name, 'bars': total_bars, **measure(setup, repeat, memory)})
+
+    results = pd.DataFrame(rows)
+    results['bars_per_sec'] = results['bars'] / results['seconds']
+    results['trades_per_sec'] = results['trades'].astype(float) / results['seconds']
+    return results[['benchmark', 'bars', 'trades', 'seconds', 'bars_per_sec', 'trades_per_sec', 'peak_mb']]
+
+def save_baseline(results: pd.DataFrame, path: str, config: Optional[Dict] = None):
+    """Store benchmark results as a JSON baseline, together with the configuration and versions."""
+    baseline = {
+        'config': config or {},
+        'environment': {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__, 'machine': platform.machine()},
+        'results': {row['benchmark']: {key: (None if pd.isna(value) else float(value)) for key, value in row.items() if key != 'benchmark'} for row in results.to_dict('records')},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+
+def load_baseline(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare_to_baseline(results: pd.DataFrame, baseline: Dict, tolerance: float = 0.2) -> pd.DataFrame:
+    """
+    Compare benchmark results to a baseline.
+
+    :param tolerance: Allowed relative slowdown in bars/sec and growth in peak memory before a
+                      benchmark is flagged.
+    :return: One row per benchmark present in both, with the speed and memory ratios (current / baseline)
+             and a 'regression' flag.
+    """
+    rows: List[Dict] = []
+    for row in results.to_dict('records'):
+        base = baseline['results'].get(row['benchmark'])
+        if base is None:
+            continue
+        speed_ratio = row['bars_per_sec'] / base['bars_per_sec']
+        memory_ratio = row['peak_mb'] / base['peak_mb'] if base.get('peak_mb') and not pd.isna(row['peak_mb']) else np.nan
+        rows.append({
+            'benchmark': row['benchmark'],
+            'bars_per_sec': row['bars_per_sec'],
+            'baseline_bars_per_sec': base['bars_per_sec'],
+            'speed_ratio': speed_ratio,
+            'peak_mb': row['peak_mb'],
+            'baseline_peak_mb': base.get('peak_mb'),
+            'memory_ratio': memory_ratio,
+            'regression': bool(speed_ratio < 1 - tolerance or memory_ratio > 1 + tolerance),
+        })
+    return pd.DataFrame(rows)
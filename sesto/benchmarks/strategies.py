@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Optional
+from sesto.backtester import Backtester, SignalStrategy, TradeBook, step_trailing_stop
+from sesto.indicators import RSI
+from sesto.ledger import TradeLedger
+from sesto.metatrader.constants import MT5Timeframe
+from sesto.metatrader.utils import calculate_commission
+from sesto.utils import calculate_position_size, get_price_at_pnl
+
+# Parameters of the reference strategies, overridable through Backtester params
+DEFAULT_PARAMS = {
+    'RSI_PERIOD': 14,
+    'RSI_LOWER': 30,
+    'RSI_UPPER': 70,
+    'CAPITAL_PER_TRADE': 200,
+    'TP_PNL_MULTIPLIER': 0.5,
+    'SL_PNL_MULTIPLIER': -0.25,
+}
+
+def add_indicators(data: Dict[MT5Timeframe, Dict[str, pd.DataFrame]], main_timeframe: MT5Timeframe, period: int = DEFAULT_PARAMS['RSI_PERIOD']):
+    """Add the RSI column the reference strategies read to every main-timeframe frame."""
+    for df in data[main_timeframe].values():
+        RSI(df, period)
+
+class RSIReversal(Backtester):
+    """
+    Hook-based reference strategy: one trade per symbol, long below RSI_LOWER and short above
+    RSI_UPPER, with TP and SL at fixed PnL multiples of the trade capital.
+    """
+    def param(self, name: str):
+        return self.params.get(name, DEFAULT_PARAMS[name])
+
+    def entry_condition(self, symbol: str, time: datetime, row: pd.Series, open_trades: TradeBook, closed_trades: TradeLedger, timeframe: MT5Timeframe) -> Optional[Dict]:
+        if open_trades.has_symbol(symbol):
+            return None
+
+        rsi = row[f"rsi-{self.param('RSI_PERIOD')}"]
+        if rsi < self.param('RSI_LOWER'):
+            trade_type = 'long'
+        elif rsi > self.param('RSI_UPPER'):
+            trade_type = 'short'
+        else:
+            return None
+
+        capital = self.param('CAPITAL_PER_TRADE')
+        size = calculate_position_size(capital, self.leverage)
+        fee = calculate_commission(size, symbol)
+        tp, tp_excluding_commission = get_price_at_pnl(desired_pnl=capital * self.param('TP_PNL_MULTIPLIER'), commission=fee, position_size_usd=size, leverage=self.leverage, entry_price=row['close'], type=trade_type)
+        sl, sl_excluding_commission = get_price_at_pnl(desired_pnl=capital * self.param('SL_PNL_MULTIPLIER'), commission=fee, position_size_usd=size, leverage=self.leverage, entry_price=row['close'], type=trade_type)
+        return {'entry_price': row['close'], 'type': trade_type, 'capital': capital, 'tp_price': tp, 'sl_price': sl}
+
+class TrailingRSIReversal(RSIReversal):
+    """RSIReversal with a step trailing stop, so every open trade is checked bar by bar."""
+    def trailing_stop(self, trade, time: datetime, row: pd.Series, open_trades: TradeBook, closed_trades: TradeLedger, timeframe: MT5Timeframe):
+        capital = self.param('CAPITAL_PER_TRADE')
+        step_trailing_stop(trade, [(capital * 0.25, capital * 0.05), (capital * 0.1, 0.0)])
+
+class RSIReversalSignals(SignalStrategy):
+    """RSIReversal expressed as vectorized signals."""
+    def param(self, name: str):
+        return self.params.get(name, DEFAULT_PARAMS[name])
+
+    def compute_signals(self, symbol: str, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        rsi = df[f"rsi-{self.param('RSI_PERIOD')}"]
+        long = (rsi < self.param('RSI_LOWER')).to_numpy()
+        short = (rsi > self.param('RSI_UPPER')).to_numpy()
+
+        capital = self.param('CAPITAL_PER_TRADE')
+        size = calculate_position_size(capital, self.leverage)
+        fee = calculate_commission(size, symbol)
+        close = df['close'].to_numpy()
+        direction = np.where(long, 1.0, -1.0)
+        return {
+            'long': long,
+            'short': short,
+            'tp_price': close * (1 + direction * (capital * self.param('TP_PNL_MULTIPLIER') + fee) / size),
+            'sl_price': close * (1 + direction * (capital * self.param('SL_PNL_MULTIPLIER') + fee) / size),
+            'capital': capital,
+        }
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Optional
+from sesto.metatrader.constants import CURRENCY_PAIRS, MT5Timeframe, TIMEFRAME_DURATIONS
+
+GENERATORS = ('random_walk', 'gbm')
+
+def synthetic_ohlc(
+    bars: int,
+    timeframe: MT5Timeframe = MT5Timeframe.M1,
+    generator: str = 'gbm',
+    start: datetime = datetime(2024, 1, 1),
+    start_price: float = 1.0,
+    volatility: float = 0.0005,
+    drift: float = 0.0,
+    seed: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Generate reproducible OHLC bars in the layout of sesto.metatrader.data.
+
+    :param bars: The number of bars.
+    :param timeframe: The bar length (any fixed-length timeframe).
+    :param generator: 'gbm' for geometric Brownian motion (log returns with mean `drift` and
+                      standard deviation `volatility` per bar) or 'random_walk' for an arithmetic
+                      random walk with steps of `volatility * start_price`.
+    :param seed: Seed of the random generator.
+    :return: A DataFrame with time, open, high, low, close and tick_volume columns.
+    """
+    if generator not in GENERATORS:
+        raise ValueError(f"Unknown generator: {generator}")
+
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal(bars)
+    if generator == 'gbm':
+        close = start_price * np.exp(np.cumsum(drift - volatility ** 2 / 2 + volatility * shocks))
+    else:
+        close = np.maximum(start_price + np.cumsum(drift * start_price + volatility * start_price * shocks), start_price * 0.01)
+
+    open_ = np.concatenate(([start_price], close[:-1]))
+    # Wicks beyond the body, scaled like one bar's move
+    high = np.maximum(open_, close) * (1 + np.abs(rng.standard_normal(bars)) * volatility / 2)
+    low = np.minimum(open_, close) * (1 - np.abs(rng.standard_normal(bars)) * volatility / 2)
+
+    return pd.DataFrame({
+        'time': pd.date_range(start, periods=bars, freq=TIMEFRAME_DURATIONS[timeframe]),
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'tick_volume': rng.integers(1, 1000, bars),
+    })
+
+def resample_ohlc(df: pd.DataFrame, timeframe: MT5Timeframe) -> pd.DataFrame:
+    """Aggregate bars into a longer timeframe, keeping only bars that have data."""
+    if timeframe == MT5Timeframe.MN1:
+        keys = df['time'].dt.to_period('M').dt.start_time
+    else:
+        keys = df['time'].dt.floor(TIMEFRAME_DURATIONS[timeframe])
+    grouped = df.groupby(keys)
+    return pd.DataFrame({
+        'time': grouped['time'].first().index,
+        'open': grouped['open'].first().to_numpy(),
+        'high': grouped['high'].max().to_numpy(),
+        'low': grouped['low'].min().to_numpy(),
+        'close': grouped['close'].last().to_numpy(),
+        'tick_volume': grouped['tick_volume'].sum().to_numpy(),
+    })
+
+def synthetic_data(
+    symbols: Optional[List[str]] = None,
+    bars: int = 10_000,
+    timeframes: Optional[List[MT5Timeframe]] = None,
+    generator: str = 'gbm',
+    volatility: float = 0.0005,
+    seed: int = 0,
+) -> Dict[MT5Timeframe, Dict[str, pd.DataFrame]]:
+    """
+    Build a data dict like sesto.metatrader.data.data from synthetic prices.
+
+    Every symbol gets `bars` bars of the shortest timeframe in `timeframes`; the longer timeframes
+    are aggregated from them, so all timeframes of a symbol describe the same price path.
+
+    :param symbols: Symbols to generate, the first five of CURRENCY_PAIRS by default (they need to be
+                    known to calculate_commission).
+    :param bars: The number of bars of the shortest timeframe per symbol.
+    :param timeframes: The timeframes to fill, [MT5Timeframe.H1] by default.
+    :param generator: 'gbm' or 'random_walk', see synthetic_ohlc.
+    :param volatility: Per-bar volatility of the shortest timeframe.
+    :param seed: Seed; symbol i uses seed + i.
+    :return: A {timeframe: {symbol: DataFrame}} dict with an entry for every MT5Timeframe.
+    """
+    symbols = symbols if symbols is not None else CURRENCY_PAIRS[:5]
+    timeframes = timeframes if timeframes is not None else [MT5Timeframe.H1]
+    base = min((timeframe for timeframe in timeframes if timeframe in TIMEFRAME_DURATIONS), key=lambda timeframe: TIMEFRAME_DURATIONS[timeframe])
+
+    data = {timeframe: {} for timeframe in MT5Timeframe}
+    for i, symbol in enumerate(symbols):
+        df = synthetic_ohlc(bars, base, generator, start_price=1.0 + 0.1 * i, volatility=volatility, seed=seed + i)
+        for timeframe in timeframes:
+            data[timeframe][symbol] = df if timeframe == base else resample_ohlc(df, timeframe)
+    return data
@@ -0,0 +1,194 @@
+import os
+import sys
+import glob
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from types import CodeType
+from typing import Callable, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+# Columns fingerprinted by default: the raw bars every indicator is computed from
+INPUT_COLUMNS = ('time', 'open', 'high', 'low', 'close')
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _hash_code(digest, code: CodeType):
+    """Feed a code object into digest: its bytecode, constants and names, nested functions included."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for constant in code.co_consts:
+        if isinstance(constant, CodeType):
+            _hash_code(digest, constant)
+        else:
+            digest.update(repr(constant).encode())
+
+@lru_cache(maxsize=None)
+def _source_digest(path: str, mtime_ns: int) -> bytes:
+    with open(path, 'rb') as file:
+        return hashlib.blake2b(file.read(), digest_size=20).digest()
+
+def _module_source(module_name: str) -> bytes:
+    """
+    Hash of the source of the module a function is defined in, read again only when the file
+    changes; empty if it has no file (e.g. a notebook cell).
+    """
+    path = getattr(sys.modules.get(module_name), '__file__', None)
+    if path is None or not path.endswith('.py') or not os.path.exists(path):
+        return b''
+    return _source_digest(path, os.stat(path).st_mtime_ns)
+
+def fingerprint(df: pd.DataFrame, columns: Sequence[str], function: Callable, args: tuple = (), kwargs: Optional[dict] = None) -> str:
+    """
+    Content hash of an indicator call: the values of the input columns, the function and its
+    arguments.
+
+    The function is hashed by its code (bytecode, constants and names, nested functions included)
+    and by the source of the module it is defined in, so editing it or a helper in the same module
+    (e.g. _rsi for indicator_frame) invalidates its entries. Not covered are edits to functions in
+    other modules and upgrades of numpy or pandas; call clear() after those.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    code = getattr(function, '__code__', None)
+    digest.update(f'{function.__module__}.{function.__qualname__}'.encode())
+    if code is not None:
+        _hash_code(digest, code)
+    digest.update(_module_source(function.__module__))
+    digest.update(repr((args, sorted((kwargs or {}).items()))).encode())
+    for column in columns:
+        values = np.ascontiguousarray(df[column].to_numpy())
+        digest.update(f'{column}:{values.dtype.str}:{len(values)}'.encode())
+        digest.update(values.view(np.uint8) if values.dtype.kind != 'O' else repr(values.tolist()).encode())
+    return digest.hexdigest()
+
+class IndicatorCache:
+    """
+    Cache of indicator columns keyed by fingerprint(), in an in-memory LRU and optionally on disk.
+
+    A call is looked up in memory, then on disk, and only computed when both miss, so re-running a
+    notebook on unchanged data loads the columns instead of recomputing them. Disk entries are
+    Feather files (or pickles without pyarrow); when the directory grows over max_disk_bytes the
+    least recently used files are removed.
+    """
+    def __init__(self, directory: Optional[str] = None, max_items: int = 256, max_disk_bytes: int = 1 << 30):
+        """
+        :param directory: Where to persist entries; memory only if None.
+        :param max_items: The number of entries kept in memory.
+        :param max_disk_bytes: The size the directory is trimmed to after each write.
+        """
+        self.directory = directory
+        self.max_items = max_items
+        self.max_disk_bytes = max_disk_bytes
+        self.extension = '.feather' if _has_pyarrow() else '.pkl'
+        self._memory: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def apply(self, function: Callable, df: pd.DataFrame, *args, inputs: Optional[Sequence[str]] = None, **kwargs) -> pd.DataFrame:
+        """
+        Attach the columns of function(df, *args, **kwargs) to df, computing them only on a miss.
+
+        The function may add columns to the frame it gets (like SMA or RSI) or return a frame of
+        new columns (like indicator_frame). It is run on a copy of the input columns only.
+
+        :param inputs: The columns the result depends on. By default the INPUT_COLUMNS present in df
+                       and any column named by a string argument, e.g. column='psm' of MACD.
+        :return: The indicator columns.
+        """
+        if inputs is None:
+            named = [value for value in (*args, *kwargs.values()) if isinstance(value, str) and value in df.columns]
+            columns = list(dict.fromkeys([column for column in INPUT_COLUMNS if column in df.columns] + named))
+        else:
+            missing = [column for column in inputs if column not in df.columns]
+            if missing:
+                raise KeyError(f"Input columns {missing} of {function.__qualname__} not found in the frame")
+            columns = list(inputs)
+        key = fingerprint(df, columns, function, args, kwargs)
+
+        result = self._load(key)
+        if result is None:
+            self.misses += 1
+            work = df[columns].copy()
+            try:
+                returned = function(work, *args, **kwargs)
+            except KeyError as error:
+                raise KeyError(f"{function.__qualname__} reads column {error} that is not among its cached inputs {columns}; pass it in inputs") from error
+            source = returned if isinstance(returned, pd.DataFrame) else work
+            result = source[[column for column in source.columns if column not in columns]]
+            self._store(key, result)
+
+        result = result.set_axis(df.index)
+        df[list(result.columns)] = result
+        return result
+
+    def wrap(self, function: Callable, inputs: Optional[Sequence[str]] = None) -> Callable:
+        """A cached drop-in for an indicator function, e.g. SMA = cache.wrap(SMA)."""
+        def cached(df: pd.DataFrame, *args, **kwargs):
+            return self.apply(function, df, *args, inputs=inputs, **kwargs)
+        cached.__name__ = function.__name__
+        cached.__doc__ = function.__doc__
+        return cached
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.extension)
+
+    def _load(self, key: str) -> Optional[pd.DataFrame]:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+        if self.directory is None or not os.path.exists(self._path(key)):
+            return None
+
+        path = self._path(key)
+        result = pd.read_feather(path) if self.extension == '.feather' else pd.read_pickle(path)
+        os.utime(path)  # Mark as recently used for eviction
+        self.disk_hits += 1
+        self._remember(key, result)
+        return result
+
+    def _store(self, key: str, result: pd.DataFrame):
+        self._remember(key, result)
+        if self.directory is None:
+            return
+
+        path = self._path(key)
+        tmp_path = path + '.tmp'
+        stored = result.reset_index(drop=True)
+        if self.extension == '.feather':
+            stored.to_feather(tmp_path)
+        else:
+            stored.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _remember(self, key: str, result: pd.DataFrame):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        files = [(os.path.getmtime(path), os.path.getsize(path), path) for path in glob.glob(os.path.join(self.directory, '*' + self.extension))]
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def clear(self):
+        """Drop every entry from memory and disk."""
+        self._memory.clear()
+        if self.directory is not None:
+            for path in glob.glob(os.path.join(self.directory, '*' + self.extension)):
+                os.remove(path)
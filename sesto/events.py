@@ -0,0 +1,147 @@
+import json
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+import pandas as pd
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING'}
+
+# Console messages of the engine's own event kinds
+MESSAGE_FORMATS = {
+    'trade_opened': "{symbol} - OPENED TRADE    - {type} - ENTRY: ${entry_price:.3f} - TP: ${tp_price:.3f} ({tp_diff:.3f}% DIFF ENTRY)( PNL AT TP: ${potential_profit_usd:.2f}) - SL: ${sl_price:.3f} ({sl_diff:.3f}%) - LIQ: ${liq_p:.3f} - BE: ${be_p:.3f} - AVAILABLE CAPITAL: ${available_capital:.3f}",
+    'trade_closed': "{symbol} - CLOSED TRADE    - {type} - ENTRY: ${entry_price:.3f} - CLOSE: ${close_price:.3f} - PNL: ${pnl:.2f} - SL: ${sl_price:.3f} - TP: ${tp_price:.3f} - REASON: {reason} - AVAILABLE CAPITAL: ${available_capital:.3f}",
+    'entry_rejected': "{symbol} - NOT ENOUGH CAPITAL - Trade Capital: ${capital} - Available Capital: ${available_capital}",
+}
+
+class Event(NamedTuple):
+    level: int
+    kind: str
+    time: Optional[datetime]
+    symbol: Optional[str]
+    fields: Dict
+
+def format_event(event: Event) -> str:
+    """
+    Render an event as a console line, using MESSAGE_FORMATS for the engine's event kinds.
+    """
+    template = MESSAGE_FORMATS.get(event.kind)
+    if template is not None:
+        fields = event.fields
+        if 'type' in fields:
+            # The type is stored as on the trade ('long'/'short') but printed upper-case as before
+            fields = {**fields, 'type': str(fields['type']).upper()}
+        return template.format(symbol=event.symbol, time=event.time, **fields)
+    if 'message' in event.fields:
+        return str(event.fields['message'])
+    fields = ' - '.join(f"{key.upper()}: {value}" for key, value in event.fields.items())
+    return f"{event.time} - {event.symbol} - {event.kind.upper()} - {fields}"
+
+def event_to_dict(event: Event) -> Dict:
+    return {
+        'level': LEVEL_NAMES.get(event.level, event.level),
+        'kind': event.kind,
+        'time': None if event.time is None else str(event.time),
+        'symbol': event.symbol,
+        **event.fields,
+    }
+
+class ConsoleSink:
+    def write(self, events: List[Event]):
+        print('\n'.join(format_event(event) for event in events))
+
+    def close(self):
+        pass
+
+class JSONLSink:
+    """Append events to a JSON Lines file, one object per event."""
+    def __init__(self, path: str):
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def write(self, events: List[Event]):
+        self.file.writelines(json.dumps(event_to_dict(event), default=str) + '\n' for event in events)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class ParquetSink:
+    """
+    Write events to a Parquet file, one row group per batch. Requires pyarrow. Event fields differ by
+    kind, so they are stored as a JSON string column next to level, kind, time and symbol.
+    """
+    def __init__(self, path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema([
+            ('level', pa.string()), ('kind', pa.string()), ('time', pa.string()),
+            ('symbol', pa.string()), ('fields', pa.string()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, events: List[Event]):
+        table = self.pa.table({
+            'level': [LEVEL_NAMES.get(event.level, str(event.level)) for event in events],
+            'kind': [event.kind for event in events],
+            'time': [None if event.time is None else str(event.time) for event in events],
+            'symbol': [event.symbol for event in events],
+            'fields': [json.dumps(event.fields, default=str) for event in events],
+        }, schema=self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        self.writer.close()
+
+class EventLog:
+    """
+    Leveled, buffered event log for the backtest engine.
+
+    Events at or above `level` are appended as typed tuples to an in-memory ring buffer of `capacity`
+    events; nothing is formatted or printed unless sinks are attached. The default level only keeps
+    warnings, so trade events cost a level check; use level=INFO to record every trade. Sinks
+    (ConsoleSink, JSONLSink, ParquetSink) receive the pending events in batches of `batch_size` and
+    on flush().
+    """
+    def __init__(self, level: int = WARNING, capacity: int = 10_000, sinks: Optional[List] = None, batch_size: int = 1000):
+        self.level = level
+        self.buffer = deque(maxlen=capacity)
+        self.sinks = list(sinks or [])
+        self.batch_size = batch_size
+        self.pending: List[Event] = []
+
+    def enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    def log(self, level: int, kind: str, time: Optional[datetime] = None, symbol: Optional[str] = None, **fields):
+        if level < self.level:
+            return
+        event = Event(level, kind, time, symbol, fields)
+        self.buffer.append(event)
+        if self.sinks:
+            self.pending.append(event)
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        if self.pending:
+            for sink in self.sinks:
+                sink.write(self.pending)
+            self.pending = []
+
+    def close(self):
+        self.flush()
+        for sink in self.sinks:
+            sink.close()
+
+    def clear(self):
+        self.buffer.clear()
+        self.pending = []
+
+    def to_frame(self) -> pd.DataFrame:
+        """The buffered events, one row per event with their fields as columns."""
+        return pd.DataFrame([event_to_dict(event) for event in self.buffer])
@@ -0,0 +1,321 @@
+import math
+from collections import deque
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from sesto.online import RunningStats
+
+class RollingWindow:
+    """
+    The last `period` values with their running mean and standard deviation. Pushing a value or
+    replacing the last one is O(1).
+    """
+    def __init__(self, period: int):
+        self.period = period
+        self.values: deque = deque()
+        self.stats = RunningStats()
+        self._nonzero = 0
+
+    def push(self, value: float):
+        self.values.append(value)
+        self.stats.add(value)
+        self._nonzero += value != 0
+        if len(self.values) > self.period:
+            expired = self.values.popleft()
+            self.stats.remove(expired)
+            self._nonzero -= expired != 0
+
+    def replace_last(self, value: float):
+        previous = self.values[-1]
+        self.values[-1] = value
+        self.stats.remove(previous)
+        self.stats.add(value)
+        self._nonzero += int(value != 0) - int(previous != 0)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.period
+
+    @property
+    def mean(self) -> float:
+        if not self.full:
+            return math.nan
+        # A window of zeros averages to exactly 0, as in the batch functions
+        return self.stats.mean if self._nonzero else 0.0
+
+    @property
+    def std(self) -> float:
+        return self.stats.std if self.full else math.nan
+
+class StreamingIndicator:
+    """
+    An indicator updated one bar at a time, matching the batch function of sesto.indicators.
+
+    update(bar) appends a closed or new bar; update(bar, new_bar=False) replaces the last bar, e.g.
+    with the latest tick of the still-forming bar. Both are O(1) regardless of the history length.
+    """
+    # Bar fields the indicator reads
+    fields: Tuple[str, ...] = ('close',)
+
+    def __init__(self):
+        self._bars = 0
+
+    def seed(self, df: pd.DataFrame) -> 'StreamingIndicator':
+        """Feed the bars of a historical frame in order, e.g. the window fetched at startup."""
+        arrays = [df[field].to_numpy(dtype=np.float64) for field in self.fields]
+        for values in zip(*(array.tolist() for array in arrays)):
+            self._update(*values, new_bar=True)
+        return self
+
+    def update(self, bar: Mapping, new_bar: bool = True):
+        """
+        :param bar: The bar, anything indexable by field name (a dict, a row Series, ...).
+        :param new_bar: False to replace the last bar instead of appending one.
+        :return: The current value, see value.
+        """
+        self._update(*(float(bar[field]) for field in self.fields), new_bar=new_bar or self._bars == 0)
+        return self.value
+
+    def _update(self, *values: float, new_bar: bool):
+        # This method should be overridden in the subclass
+        raise NotImplementedError
+
+    @property
+    def value(self):
+        # This method should be overridden in the subclass
+        raise NotImplementedError
+
+    def to_dict(self) -> Dict[str, float]:
+        """The current value(s) under the batch function's column names."""
+        # This method should be overridden in the subclass
+        raise NotImplementedError
+
+class StreamingSMA(StreamingIndicator):
+    def __init__(self, period: int):
+        super().__init__()
+        self.period = period
+        self._window = RollingWindow(period)
+
+    def _update(self, close: float, new_bar: bool):
+        if new_bar:
+            self._bars += 1
+            self._window.push(close)
+        else:
+            self._window.replace_last(close)
+
+    @property
+    def value(self) -> float:
+        return self._window.mean
+
+    def to_dict(self) -> Dict[str, float]:
+        return {f'sma-{self.period}': self.value}
+
+class StreamingSTD(StreamingSMA):
+    @property
+    def value(self) -> float:
+        return self._window.std
+
+    def to_dict(self) -> Dict[str, float]:
+        return {f'std-{self.period}': self.value}
+
+class StreamingBB(StreamingSMA):
+    def __init__(self, period: int, std: float):
+        super().__init__(period)
+        self.std = std
+
+    @property
+    def value(self) -> Tuple[float, float, float]:
+        """(middle, upper, lower)"""
+        mean = self._window.mean
+        band = self._window.std * self.std
+        return mean, mean + band, mean - band
+
+    def to_dict(self) -> Dict[str, float]:
+        middle, upper, lower = self.value
+        return {f'bbm-{self.period}-{self.std}': middle, f'bbu-{self.period}-{self.std}': upper, f'bbl-{self.period}-{self.std}': lower}
+
+class StreamingEMA(StreamingIndicator):
+    """EMA with span `period`, like ewm(span=period, adjust=False), starting at the first close."""
+    def __init__(self, period: int, name: Optional[str] = None):
+        super().__init__()
+        self.period = period
+        self.name = name or f'ema-{period}'
+        self._alpha = 2 / (period + 1)
+        self._value = math.nan
+        self._previous = math.nan
+
+    def _update(self, close: float, new_bar: bool):
+        if new_bar:
+            self._bars += 1
+            self._previous = self._value
+        if math.isnan(self._previous):
+            self._value = close
+        else:
+            self._value = (1 - self._alpha) * self._previous + self._alpha * close
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def to_dict(self) -> Dict[str, float]:
+        return {self.name: self.value}
+
+class StreamingROC(StreamingIndicator):
+    def __init__(self, period: int):
+        super().__init__()
+        self.period = period
+        self._closes: deque = deque(maxlen=period + 1)
+
+    def _update(self, close: float, new_bar: bool):
+        if new_bar:
+            self._bars += 1
+            self._closes.append(close)
+        else:
+            self._closes[-1] = close
+
+    @property
+    def value(self) -> float:
+        if len(self._closes) <= self.period:
+            return math.nan
+        return (self._closes[-1] - self._closes[0]) / self._closes[0] * 100
+
+    def to_dict(self) -> Dict[str, float]:
+        return {f'roc-{self.period}': self.value}
+
+class StreamingRSI(StreamingIndicator):
+    """RSI of the close, with a simple rolling average of gains and losses or Wilder's smoothing."""
+    def __init__(self, period: int, wilder: bool = False):
+        super().__init__()
+        self.period = period
+        self.wilder = wilder
+        self._previous_close = math.nan
+        self._close = math.nan
+        if wilder:
+            # (changes seen, gain sum, loss sum, average gain, average loss) after and before the last bar
+            self._state = (0, 0.0, 0.0, math.nan, math.nan)
+            self._previous_state = self._state
+        else:
+            self._gains = RollingWindow(period)
+            self._losses = RollingWindow(period)
+
+    def _update(self, close: float, new_bar: bool):
+        if new_bar:
+            self._bars += 1
+            self._previous_close = self._close
+        self._close = close
+
+        change = close - self._previous_close
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+
+        if not self.wilder:
+            if new_bar:
+                self._gains.push(gain)
+                self._losses.push(loss)
+            else:
+                self._gains.replace_last(gain)
+                self._losses.replace_last(loss)
+            return
+
+        if new_bar:
+            self._previous_state = self._state
+        changes, gain_sum, loss_sum, avg_gain, avg_loss = self._previous_state
+        if math.isnan(change):
+            self._state = self._previous_state
+        elif changes < self.period:
+            changes += 1
+            gain_sum += gain
+            loss_sum += loss
+            if changes == self.period:
+                avg_gain, avg_loss = gain_sum / self.period, loss_sum / self.period
+            self._state = (changes, gain_sum, loss_sum, avg_gain, avg_loss)
+        else:
+            alpha = 1 / self.period
+            self._state = (changes, gain_sum, loss_sum, (1 - alpha) * avg_gain + alpha * gain, (1 - alpha) * avg_loss + alpha * loss)
+
+    @property
+    def value(self) -> float:
+        if self.wilder:
+            avg_gain, avg_loss = self._state[3], self._state[4]
+        else:
+            avg_gain, avg_loss = self._gains.mean, self._losses.mean
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return float(100 - (100 / (1 + np.float64(avg_gain) / np.float64(avg_loss))))
+
+    def to_dict(self) -> Dict[str, float]:
+        return {f'rsi-{self.period}': self.value}
+
+class StreamingMACD(StreamingIndicator):
+    def __init__(self, short_period: int = 12, long_period: int = 26, signal_period: int = 9):
+        super().__init__()
+        self._short = StreamingEMA(short_period)
+        self._long = StreamingEMA(long_period)
+        self._signal = StreamingEMA(signal_period)
+
+    def _update(self, close: float, new_bar: bool):
+        if new_bar:
+            self._bars += 1
+        self._short._update(close, new_bar=new_bar)
+        self._long._update(close, new_bar=new_bar)
+        self._signal._update(self._short.value - self._long.value, new_bar=new_bar)
+
+    @property
+    def value(self) -> Tuple[float, float, float]:
+        """(macd, signal, histogram)"""
+        macd = self._short.value - self._long.value
+        return macd, self._signal.value, macd - self._signal.value
+
+    def to_dict(self) -> Dict[str, float]:
+        macd, signal, histogram = self.value
+        return {'macd': macd, 'macd-signal': signal, 'macd-histogram': histogram}
+
+class StreamingATR(StreamingIndicator):
+    fields = ('high', 'low', 'close')
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self._window = RollingWindow(period)
+        self._previous_close = math.nan
+        self._close = math.nan
+
+    def _update(self, high: float, low: float, close: float, new_bar: bool):
+        if new_bar:
+            self._bars += 1
+            self._previous_close = self._close
+        self._close = close
+
+        true_range = high - low
+        if not math.isnan(self._previous_close):
+            true_range = max(true_range, abs(high - self._previous_close), abs(low - self._previous_close))
+        if new_bar:
+            self._window.push(true_range)
+        else:
+            self._window.replace_last(true_range)
+
+    @property
+    def value(self) -> float:
+        return self._window.mean
+
+    def to_dict(self) -> Dict[str, float]:
+        return {'atr': self.value}
+
+def indicator_columns(indicators: Sequence[StreamingIndicator], df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Feed the bars of df to the indicators in order and collect their values after every bar.
+
+    The indicators keep their state, so calling this on consecutive chunks of a history gives the
+    same values as one pass over all of it, recursive indicators (EMA, MACD, Wilder's RSI) included.
+
+    :return: A frame with the same index as df and the columns of the indicators' to_dict().
+    """
+    columns: Dict[str, list] = {}
+    for indicator in indicators:
+        arrays = [df[field].to_numpy(dtype=np.float64).tolist() for field in indicator.fields]
+        rows = []
+        for values in zip(*arrays):
+            indicator._update(*values, new_bar=True)
+            rows.append(indicator.to_dict())
+        for name in indicator.to_dict():
+            columns[name] = [row[name] for row in rows]
+    return pd.DataFrame(columns, index=df.index, dtype=np.float64)
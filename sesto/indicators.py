@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+from typing import Dict, Sequence
 
 def STD(df, period):
     df[f'std-{period}'] = df['close'].rolling(period).std()
@@ -17,26 +19,13 @@ def BB(df, period, std):
     df[f'bbu-{period}-{std}'] = rolling_mean + (rolling_std * std)
     df[f'bbl-{period}-{std}'] = rolling_mean - (rolling_std * std)
 
-def RSI(df: pd.DataFrame, period: int):   
-    # Step 1: Calculate the price differences
-    df['price_diff'] = df['close'].diff()
-
-    # Step 2: Calculate gains and losses
-    df['gain'] = df['price_diff'].apply(lambda x: x if x > 0 else 0)
-    df['loss'] = df['price_diff'].apply(lambda x: -x if x < 0 else 0)
-    
-    # Step 3: Calculate the average gain and average loss using the smoothing period
-    df['avg_gain'] = df['gain'].rolling(window=period, min_periods=period).mean()
-    df['avg_loss'] = df['loss'].rolling(window=period, min_periods=period).mean()
-    
-    # Step 4: Calculate the Relative Strength (RS)
-    df['rs'] = df['avg_gain'] / df['avg_loss']
-    
-    # Step 5: Calculate the RSI
-    df[f'rsi-{period}'] = 100 - (100 / (1 + df['rs']))
-    
-    # Clean up intermediate columns
-    df.drop(columns=['price_diff', 'gain', 'loss', 'avg_gain', 'avg_loss', 'rs'], inplace=True)
+def RSI(df: pd.DataFrame, period: int, wilder: bool = False):
+    """
+    Relative Strength Index of the close. With wilder=True, average gains and losses use Wilder's
+    smoothing (seeded with the simple average of the first `period` changes) instead of a simple
+    rolling average.
+    """
+    df[f'rsi-{period}'] = _rsi(df['close'].to_numpy(dtype=np.float64), period, wilder)
 
 def ROC(df, period):
     df[f'roc-{period}'] = (df['close'] - df['close'].shift(period)) / df['close'].shift(period) * 100
@@ -54,4 +43,102 @@ def ATR(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     low_close = (df['low'] - df['close'].shift(1)).abs()
     ranges = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
     df['atr'] = ranges.rolling(window=period).mean()
-   
+
+# Indicators computed by indicator_frame()
+INDICATORS = ('sma', 'ema', 'roc', 'rsi', 'bb', 'atr')
+
+def _rolling_sum(values: np.ndarray, period: int) -> np.ndarray:
+    """Sum over each window of `period` values ending at every row, NaN until the window is full."""
+    return pd.Series(values).rolling(period).sum().to_numpy()
+
+def _rolling_std(values: np.ndarray, period: int) -> np.ndarray:
+    return pd.Series(values).rolling(period).std().to_numpy()
+
+def _wilder(values: np.ndarray, period: int, start: int) -> np.ndarray:
+    """
+    Wilder's smoothing of values[start:]: the simple average of the first `period` values, then
+    avg = avg + (value - avg) / period on every following row.
+    """
+    out = np.full(len(values), np.nan)
+    seed = start + period - 1
+    if seed >= len(values):
+        return out
+    seeded = values.copy()
+    seeded[:seed] = np.nan
+    seeded[seed] = values[start:seed + 1].mean()
+    out[seed:] = pd.Series(seeded[seed:]).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    return out
+
+def _rsi(close: np.ndarray, period: int, wilder: bool = False) -> np.ndarray:
+    change = np.diff(close, prepend=np.nan)
+    gain = np.where(change > 0, change, 0.0)
+    loss = np.where(change < 0, -change, 0.0)
+    if wilder:
+        avg_gain = _wilder(gain, period, 1)
+        avg_loss = _wilder(loss, period, 1)
+    else:
+        # The unknown first change counts as no gain and no loss
+        avg_gain = _rolling_sum(gain, period) / period
+        avg_loss = _rolling_sum(loss, period) / period
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+def indicator_frame(df: pd.DataFrame, periods: Sequence[int], indicators: Sequence[str] = INDICATORS, bb_std: float = 2, wilder: bool = False) -> pd.DataFrame:
+    """
+    Compute several indicators for several periods at once. The close, its changes and the true
+    range are extracted once and shared by all periods, every indicator is a NumPy kernel, and the
+    result is one frame built from a single 2D array.
+
+    The columns are named as by the single-period functions (sma-14, bbu-14-2, ...), except ATR,
+    which is atr-{period} so that several periods can coexist.
+
+    :param df: A frame with 'close', and 'high' and 'low' for ATR.
+    :param periods: The periods to compute every indicator for.
+    :param indicators: A subset of INDICATORS.
+    :param bb_std: The number of standard deviations of the Bollinger Bands.
+    :param wilder: Use Wilder's smoothing for RSI.
+    :return: A frame with the same index as df and one column per indicator and period.
+    """
+    close = df['close'].to_numpy(dtype=np.float64)
+    columns: Dict[str, np.ndarray] = {}
+
+    if 'atr' in indicators:
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        previous_close = np.concatenate(([np.nan], close[:-1]))
+        # NaN-aware max like pandas' max(axis=1), so the first bar's range is high - low
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+
+    for period in periods:
+        mean = _rolling_sum(close, period) / period if 'sma' in indicators or 'bb' in indicators else None
+        for name in indicators:
+            if name == 'sma':
+                columns[f'sma-{period}'] = mean
+            elif name == 'ema':
+                columns[f'ema-{period}'] = pd.Series(close).ewm(span=period, adjust=False).mean().to_numpy()
+            elif name == 'roc':
+                shifted = np.full(len(close), np.nan)
+                shifted[period:] = close[:-period]
+                columns[f'roc-{period}'] = (close - shifted) / shifted * 100
+            elif name == 'rsi':
+                columns[f'rsi-{period}'] = _rsi(close, period, wilder)
+            elif name == 'bb':
+                band = _rolling_std(close, period) * bb_std
+                columns[f'bbm-{period}-{bb_std}'] = mean
+                columns[f'bbu-{period}-{bb_std}'] = mean + band
+                columns[f'bbl-{period}-{bb_std}'] = mean - band
+            elif name == 'atr':
+                columns[f'atr-{period}'] = _rolling_sum(true_range, period) / period
+            else:
+                raise ValueError(f"Unknown indicator: {name}")
+
+    values = np.column_stack(list(columns.values())) if columns else np.empty((len(df), 0))
+    return pd.DataFrame(values, index=df.index, columns=list(columns.keys()))
+
+def with_indicators(df: pd.DataFrame, periods: Sequence[int], indicators: Sequence[str] = INDICATORS, bb_std: float = 2, wilder: bool = False) -> pd.DataFrame:
+    """
+    Return df with the indicator_frame() columns attached in one concat. Columns that already
+    exist are replaced.
+    """
+    frame = indicator_frame(df, periods, indicators, bb_std, wilder)
+    return pd.concat([df.drop(columns=frame.columns.intersection(df.columns)), frame], axis=1)
@@ -0,0 +1,309 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+from sesto.backtester import SignalStrategy, Trade, chronological_order
+from sesto.ledger import TradeLedger, dataclass_columns
+from sesto.metatrader.constants import MT5Timeframe
+from sesto.metatrader.utils import calculate_commission
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # Without numba the kernel runs as plain Python with the same results
+        if args and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+# Rows of the float output / state matrices of the kernel
+F_ENTRY_PRICE, F_SIZE, F_TP, F_SL, F_CAPITAL, F_PROFIT, F_LOSS, F_CLOSE_PRICE, F_PNL, F_PNL_EXCLUDING_COMMISSION, F_LIQ, F_BE, F_COMMISSION, F_DESIRED_PNL = range(14)
+# Rows of the integer output / state matrices of the kernel
+I_SYMBOL, I_ENTRY_EVENT, I_CLOSE_EVENT, I_TYPE, I_REASON, I_TRIGGERED, I_SEQUENCE = range(7)
+
+CLOSING_REASONS = ('TP', 'LIQ', 'SL', 'end_of_backtest')
+REASON_TP, REASON_LIQ, REASON_SL, REASON_END = range(4)
+
+@njit(cache=True)
+def _close(out_f, out_i, n, state_f, state_i, s, event, price, reason, spread_multiplier):
+    for k in range(out_f.shape[0]):
+        out_f[k, n] = state_f[k, s]
+    out_i[I_SYMBOL, n] = s
+    out_i[I_ENTRY_EVENT, n] = state_i[I_ENTRY_EVENT, s]
+    out_i[I_CLOSE_EVENT, n] = event
+    out_i[I_TYPE, n] = state_i[I_TYPE, s]
+    out_i[I_REASON, n] = reason
+    out_i[I_TRIGGERED, n] = state_i[I_TRIGGERED, s]
+
+    entry_price = state_f[F_ENTRY_PRICE, s]
+    size = state_f[F_SIZE, s]
+    commission = state_f[F_COMMISSION, s]
+    if state_i[I_TYPE, s] == 1:
+        close_price = price * (1 - spread_multiplier)
+        pnl_excluding_commission = ((close_price - entry_price) / entry_price * size)
+    else:
+        close_price = price * (1 + spread_multiplier)
+        pnl_excluding_commission = ((entry_price - close_price) / entry_price * size)
+    pnl = pnl_excluding_commission - commission
+    out_f[F_CLOSE_PRICE, n] = close_price
+    out_f[F_PNL, n] = pnl
+    out_f[F_PNL_EXCLUDING_COMMISSION, n] = pnl_excluding_commission
+    state_i[I_SEQUENCE, s] = -1
+    return state_f[F_CAPITAL, s] + pnl + commission
+
+@njit(cache=True)
+def simulate_kernel(boundaries, event_symbols, event_positions, last_positions, bar_max, bar_min, close,
+                    long_signal, short_signal, tp_price, sl_price, capital, commission_rates,
+                    initial_capital, leverage, spread_multiplier, steps, out_f, out_i):
+    """
+    Compiled event loop over the chronologically merged bars of all symbols, with at most one open
+    trade per symbol. Mirrors Backtester.run(mode='chronological') for a strategy that enters at the
+    close on precomputed signals and exits on TP, liquidation, SL or a step trailing stop.
+
+    :return: A tuple (number of closed trades written to the outputs, available capital).
+    """
+    n_symbols = commission_rates.shape[0]
+    state_f = np.full((out_f.shape[0], n_symbols), np.nan)
+    state_i = np.full((out_i.shape[0], n_symbols), -1, dtype=np.int64)
+    available_capital = initial_capital
+    n = 0
+    sequence = 0
+
+    for group in range(boundaries.shape[0] - 1):
+        start, end = boundaries[group], boundaries[group + 1]
+
+        # Update open trades of every symbol at this timestamp before checking any entry
+        for k in range(start, end):
+            s = event_symbols[k]
+            if state_i[I_SEQUENCE, s] < 0:
+                continue
+            g = event_positions[k]
+            entry_price = state_f[F_ENTRY_PRICE, s]
+            size = state_f[F_SIZE, s]
+            commission = state_f[F_COMMISSION, s]
+            is_long = state_i[I_TYPE, s] == 1
+            if is_long:
+                unrealized_pnl = ((close[g] - entry_price) / entry_price * size) - commission
+                tp_hit = bar_max[g] >= state_f[F_TP, s]
+                sl_hit = bar_min[g] <= state_f[F_SL, s]
+                liquidated = bar_min[g] <= state_f[F_LIQ, s] or unrealized_pnl < (state_f[F_CAPITAL, s] * -0.99)
+            else:
+                unrealized_pnl = ((entry_price - close[g]) / entry_price * size) - commission
+                tp_hit = bar_min[g] <= state_f[F_TP, s]
+                sl_hit = bar_max[g] >= state_f[F_SL, s]
+                liquidated = bar_max[g] >= state_f[F_LIQ, s] or unrealized_pnl < (state_f[F_CAPITAL, s] * -0.99)
+
+            if tp_hit:
+                available_capital += _close(out_f, out_i, n, state_f, state_i, s, k, state_f[F_TP, s], REASON_TP, spread_multiplier)
+                n += 1
+            elif liquidated:
+                available_capital += _close(out_f, out_i, n, state_f, state_i, s, k, state_f[F_SL, s], REASON_LIQ, spread_multiplier)
+                n += 1
+            elif sl_hit:
+                available_capital += _close(out_f, out_i, n, state_f, state_i, s, k, state_f[F_SL, s], REASON_SL, spread_multiplier)
+                n += 1
+            else:
+                for step in range(steps.shape[0]):
+                    if unrealized_pnl >= steps[step, 0]:
+                        if is_long:
+                            new_sl = entry_price * (1 + (steps[step, 1] + commission) / size)
+                            moved = new_sl > state_f[F_SL, s]
+                        else:
+                            new_sl = entry_price * (1 - (steps[step, 1] + commission) / size)
+                            moved = new_sl < state_f[F_SL, s]
+                        if moved:
+                            state_f[F_SL, s] = new_sl
+                            state_f[F_DESIRED_PNL, s] = steps[step, 1]
+                            state_i[I_TRIGGERED, s] = 1
+                            break
+
+        # Entries at the close, first come first served on the available capital
+        for k in range(start, end):
+            s = event_symbols[k]
+            g = event_positions[k]
+            if state_i[I_SEQUENCE, s] >= 0 or not (long_signal[g] or short_signal[g]):
+                continue
+            required_capital = capital[g]
+            if required_capital > available_capital:
+                continue
+
+            size = required_capital * leverage
+            commission = size * commission_rates[s]
+            tp = tp_price[g]
+            sl = sl_price[g]
+            if long_signal[g]:
+                entry_price = close[g] * (1 + spread_multiplier)
+                state_i[I_TYPE, s] = 1
+                state_f[F_PROFIT, s] = ((tp - entry_price) / entry_price * size) - commission
+                state_f[F_LOSS, s] = ((entry_price - sl) / entry_price * size) + commission
+                state_f[F_LIQ, s] = entry_price * (1 - (1 / leverage))
+                state_f[F_BE, s] = entry_price * (1 + (0 + commission) / size)
+            else:
+                entry_price = close[g] * (1 - spread_multiplier)
+                state_i[I_TYPE, s] = -1
+                state_f[F_PROFIT, s] = ((entry_price - tp) / entry_price * size) - commission
+                state_f[F_LOSS, s] = ((sl - entry_price) / entry_price * size) + commission
+                state_f[F_LIQ, s] = entry_price * (1 + (1 / leverage))
+                state_f[F_BE, s] = entry_price * (1 - (0 + commission) / size)
+
+            state_f[F_ENTRY_PRICE, s] = entry_price
+            state_f[F_SIZE, s] = size
+            state_f[F_TP, s] = tp
+            state_f[F_SL, s] = sl
+            state_f[F_CAPITAL, s] = required_capital
+            state_f[F_COMMISSION, s] = commission
+            state_f[F_DESIRED_PNL, s] = np.nan
+            state_i[I_ENTRY_EVENT, s] = k
+            state_i[I_TRIGGERED, s] = 0
+            state_i[I_SEQUENCE, s] = sequence
+            sequence += 1
+            available_capital -= required_capital + commission
+
+    # Close what is left at the last timestamp, in the order the trades were opened
+    if boundaries.shape[0] > 1:
+        last_event = boundaries[boundaries.shape[0] - 1] - 1
+        order = np.argsort(state_i[I_SEQUENCE])
+        for s in order:
+            if state_i[I_SEQUENCE, s] >= 0:
+                available_capital += _close(out_f, out_i, n, state_f, state_i, s, last_event, close[last_positions[s]], REASON_END, spread_multiplier)
+                n += 1
+
+    return n, available_capital
+
+def signal_arrays(frames: List[pd.DataFrame], signals: Dict[str, Dict[str, np.ndarray]], symbols: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Concatenate per-symbol signal arrays in symbol order. A scalar 'capital' is broadcast to every bar.
+    """
+    arrays = {'long': [], 'short': [], 'tp_price': [], 'sl_price': [], 'capital': []}
+    for symbol, df in zip(symbols, frames):
+        symbol_signals = signals[symbol]
+        for name, values in arrays.items():
+            values.append(np.broadcast_to(np.asarray(symbol_signals[name]), len(df)))
+    return {
+        'long': np.concatenate(arrays['long']).astype(np.bool_),
+        'short': np.concatenate(arrays['short']).astype(np.bool_),
+        'tp_price': np.concatenate(arrays['tp_price']).astype(np.float64),
+        'sl_price': np.concatenate(arrays['sl_price']).astype(np.float64),
+        'capital': np.concatenate(arrays['capital']).astype(np.float64),
+    }
+
+def simulate(
+    data: Dict[MT5Timeframe, Dict[str, pd.DataFrame]],
+    main_timeframe: MT5Timeframe,
+    signals: Dict[str, Dict[str, np.ndarray]],
+    initial_capital: float,
+    spread_multiplier: float = 0.0001,
+    leverage: float = 500.0,
+    trailing_stop_steps: Optional[List[tuple]] = None,
+) -> tuple:
+    """
+    Run a signal-driven backtest in the compiled kernel (numba if installed, plain Python otherwise).
+
+    :param data: The {timeframe: {symbol: DataFrame}} data dict, as given to Backtester.
+    :param main_timeframe: The timeframe to simulate.
+    :param signals: Per symbol, arrays aligned with its main-timeframe frame: 'long' and 'short' entry
+                    flags (long wins if both are set), the 'tp_price' and 'sl_price' of an entry on that
+                    bar, and the 'capital' to commit (an array or a scalar).
+    :param trailing_stop_steps: (trigger_pnl, new_sl_pnl) pairs in USD applied with step_trailing_stop semantics.
+    :return: A tuple (TradeLedger of closed trades, available capital at the end).
+    """
+    symbols = list(data[main_timeframe].keys())
+    frames = list(data[main_timeframe].values())
+    event_frames, event_bars, boundaries = chronological_order(frames)
+
+    lengths = np.array([len(df) for df in frames], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    ohlc = [np.concatenate([df[column].to_numpy(dtype=np.float64) for df in frames]) for column in ('open', 'high', 'low', 'close')]
+    bar_max, bar_min = np.maximum.reduce(ohlc), np.minimum.reduce(ohlc)
+    times = np.concatenate([df['time'].to_numpy(dtype='datetime64[ns]') for df in frames])
+    arrays = signal_arrays(frames, signals, symbols)
+    commission_rates = np.array([calculate_commission(1.0, symbol) for symbol in symbols], dtype=np.float64)
+    steps = np.asarray(trailing_stop_steps if trailing_stop_steps else np.empty((0, 2)), dtype=np.float64).reshape(-1, 2)
+
+    event_symbols = np.asarray(event_frames, dtype=np.int64)
+    event_positions = offsets[event_symbols] + np.asarray(event_bars, dtype=np.int64)
+    capacity = len(event_positions)
+    out_f = np.full((14, capacity), np.nan)
+    out_i = np.zeros((7, capacity), dtype=np.int64)
+
+    n, available_capital = simulate_kernel(
+        np.asarray(boundaries, dtype=np.int64), event_symbols, event_positions, offsets + lengths - 1,
+        bar_max, bar_min, ohlc[3], arrays['long'], arrays['short'], arrays['tp_price'], arrays['sl_price'],
+        arrays['capital'], commission_rates, float(initial_capital), float(leverage), float(spread_multiplier),
+        steps, out_f, out_i,
+    )
+
+    out_f, out_i = out_f[:, :n], out_i[:, :n]
+    event_times = times[event_positions]
+    ledger = TradeLedger.from_columns(dataclass_columns(Trade), {
+        'symbol': np.asarray(symbols, dtype=object)[out_i[I_SYMBOL]],
+        'entry_time': event_times[out_i[I_ENTRY_EVENT]],
+        'entry_price': out_f[F_ENTRY_PRICE],
+        'type': np.where(out_i[I_TYPE] == 1, 'long', 'short').astype(object),
+        'position_size_usd': out_f[F_SIZE],
+        'tp_price': out_f[F_TP],
+        'sl_price': out_f[F_SL],
+        'capital': out_f[F_CAPITAL],
+        'potential_profit_usd': out_f[F_PROFIT],
+        'potential_loss_usd': out_f[F_LOSS],
+        'close_time': event_times[out_i[I_CLOSE_EVENT]],
+        'close_price': out_f[F_CLOSE_PRICE],
+        'pnl': out_f[F_PNL],
+        'pnl_excluding_commission': out_f[F_PNL_EXCLUDING_COMMISSION],
+        'max_drawdown': np.zeros(n),
+        'max_profit': np.zeros(n),
+        'closing_reason': np.asarray(CLOSING_REASONS, dtype=object)[out_i[I_REASON]],
+        'unrealized_pnl': np.zeros(n),
+        'unrealized_pnl_excluding_commission': np.zeros(n),
+        'leverage': np.full(n, float(leverage)),
+        'liq_p': out_f[F_LIQ],
+        'be_p': out_f[F_BE],
+        'order_commission': out_f[F_COMMISSION],
+        'spread_multiplier': np.full(n, float(spread_multiplier)),
+        'triggered_trailing_stop': out_i[I_TRIGGERED].astype(np.bool_),
+        'trailing_stop_desired_pnl': out_f[F_DESIRED_PNL],
+    })
+    return ledger, available_capital
+
+def compare_ledgers(expected: TradeLedger, actual: TradeLedger, rtol: float = 1e-12) -> pd.DataFrame:
+    """
+    Compare two ledgers row by row.
+
+    :return: One row per (trade, column) that differs, empty if the ledgers match.
+    """
+    expected_df, actual_df = expected.to_frame(), actual.to_frame()
+    if len(expected_df) != len(actual_df):
+        return pd.DataFrame([{'trade': None, 'column': 'length', 'expected': len(expected_df), 'actual': len(actual_df)}])
+
+    mismatches = []
+    for column in expected_df.columns:
+        a, b = expected_df[column].to_numpy(), actual_df[column].to_numpy()
+        if a.dtype.kind == 'f':
+            same = np.isclose(a, b, rtol=rtol, atol=0, equal_nan=True)
+        else:
+            same = (a == b) | (pd.isna(a) & pd.isna(b))
+        for i in np.flatnonzero(~same):
+            mismatches.append({'trade': i, 'column': column, 'expected': a[i], 'actual': b[i]})
+    return pd.DataFrame(mismatches, columns=['trade', 'column', 'expected', 'actual'])
+
+def check_parity(strategy: SignalStrategy, rtol: float = 1e-12) -> pd.DataFrame:
+    """
+    Run a signal strategy through Backtester in chronological mode and through the kernel, and compare the ledgers
+    and the final available capital.
+
+    :param strategy: A freshly constructed SignalStrategy.
+    :return: The mismatches found by compare_ledgers, plus an available_capital row when the final capital
+             differs; empty when the engines agree.
+    """
+    strategy.run(mode='chronological')
+    ledger, available_capital = simulate(
+        strategy.data, strategy.main_timeframe, strategy.signals, strategy.initial_capital,
+        strategy.spread_multiplier, strategy.leverage, strategy.trailing_stop_steps,
+    )
+    mismatches = compare_ledgers(strategy.closed_trades, ledger, rtol)
+    if not np.isclose(strategy.available_capital, available_capital, rtol=rtol, atol=0):
+        capital = pd.DataFrame([{'trade': None, 'column': 'available_capital', 'expected': strategy.available_capital, 'actual': available_capital}])
+        mismatches = pd.concat([mismatches, capital], ignore_index=True) if len(mismatches) else capital
+    return mismatches
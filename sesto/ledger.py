@@ -0,0 +1,228 @@
+import numpy as np
+import pandas as pd
+from dataclasses import fields
+from datetime import datetime
+from typing import Dict, List
+
+# Column kinds and the NumPy dtype of the block that stores them
+KIND_DTYPES = {
+    'float': np.float64,
+    'time': 'datetime64[ns]',
+    'bool': np.bool_,
+    'category': np.int32,
+}
+
+def dataclass_columns(cls) -> Dict[str, str]:
+    """
+    Map the fields of a dataclass to ledger column kinds based on their annotations.
+
+    :param cls: The dataclass, e.g. Trade.
+    :return: An ordered mapping of field name to kind ('float', 'time', 'bool' or 'category').
+    """
+    columns = {}
+    for f in fields(cls):
+        if f.type is bool:
+            columns[f.name] = 'bool'
+        elif f.type is datetime:
+            columns[f.name] = 'time'
+        elif f.type is str:
+            columns[f.name] = 'category'
+        else:
+            columns[f.name] = 'float'
+    return columns
+
+class TradeRecord:
+    """
+    Read-only view of one row of a TradeLedger, exposing the columns as attributes like a Trade.
+    """
+    __slots__ = ('_ledger', '_index')
+
+    def __init__(self, ledger: 'TradeLedger', index: int):
+        self._ledger = ledger
+        self._index = index
+
+    def __getattr__(self, name: str):
+        if name not in self._ledger.columns:
+            raise AttributeError(name)
+        return self._ledger.value(name, self._index)
+
+    def to_dict(self) -> Dict:
+        return {name: self._ledger.value(name, self._index) for name in self._ledger.columns}
+
+    def __repr__(self) -> str:
+        return f"TradeRecord({', '.join(f'{k}={v!r}' for k, v in self.to_dict().items())})"
+
+class TradeLedger:
+    """
+    Struct-of-arrays store of closed trades.
+
+    Columns of the same kind share one growable 2D NumPy block, so appending a trade writes one value per
+    column. Text columns are stored as integer codes and returned as strings (or, on request, as
+    categoricals) by to_frame().
+    """
+    def __init__(self, columns: Dict[str, str], capacity: int = 1024):
+        self.columns = dict(columns)
+        self._size = 0
+        self._capacity = capacity
+        self._slots: Dict[str, tuple] = {}
+        self._names: Dict[str, List[str]] = {kind: [] for kind in KIND_DTYPES}
+
+        for name, kind in self.columns.items():
+            self._slots[name] = (kind, len(self._names[kind]))
+            self._names[kind].append(name)
+
+        self._blocks = {kind: self._empty_block(kind, len(names), capacity) for kind, names in self._names.items()}
+        self._categories: Dict[str, List[str]] = {name: [] for name in self._names['category']}
+        self._category_codes: Dict[str, Dict[str, int]] = {name: {} for name in self._names['category']}
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, str], values: Dict[str, object]) -> 'TradeLedger':
+        """
+        Build a ledger in bulk from one array per column, e.g. the output of a compiled simulation.
+        Text columns may be given as arrays of strings (None for missing).
+        """
+        n = len(next(iter(values.values()))) if values else 0
+        ledger = cls(columns, capacity=max(n, 1))
+        for name, (kind, row) in ledger._slots.items():
+            if kind == 'category':
+                codes, categories = pd.factorize(np.asarray(values[name], dtype=object))
+                ledger._blocks[kind][row, :n] = codes
+                ledger._categories[name] = list(categories)
+                ledger._category_codes[name] = {value: code for code, value in enumerate(categories)}
+            else:
+                ledger._blocks[kind][row, :n] = values[name]
+        ledger._size = n
+        return ledger
+
+    @staticmethod
+    def _empty_block(kind: str, rows: int, capacity: int) -> np.ndarray:
+        if kind == 'float':
+            return np.full((rows, capacity), np.nan)
+        if kind == 'time':
+            return np.full((rows, capacity), np.datetime64('NaT'), dtype=KIND_DTYPES[kind])
+        if kind == 'category':
+            return np.full((rows, capacity), -1, dtype=KIND_DTYPES[kind])
+        return np.zeros((rows, capacity), dtype=KIND_DTYPES[kind])
+
+    def _grow(self, capacity: int):
+        for kind, block in self._blocks.items():
+            grown = self._empty_block(kind, block.shape[0], capacity)
+            grown[:, :self._size] = block[:, :self._size]
+            self._blocks[kind] = grown
+        self._capacity = capacity
+
+    def _encode(self, name: str, value) -> int:
+        if value is None:
+            return -1
+        codes = self._category_codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._categories[name])
+            self._categories[name].append(value)
+        return code
+
+    def append(self, trade):
+        """Write the columns of a trade (or any object with matching attributes) as a new row."""
+        if self._size == self._capacity:
+            self._grow(self._capacity * 2)
+
+        i = self._size
+        blocks = self._blocks
+        for name, (kind, row) in self._slots.items():
+            value = getattr(trade, name)
+            if kind == 'float':
+                blocks[kind][row, i] = np.nan if value is None else value
+            elif kind == 'category':
+                blocks[kind][row, i] = self._encode(name, value)
+            elif kind == 'time':
+                if value is None:
+                    value = np.datetime64('NaT')
+                elif isinstance(value, pd.Timestamp):
+                    value = value.to_datetime64()
+                blocks[kind][row, i] = value
+            else:
+                blocks[kind][row, i] = bool(value)
+        self._size += 1
+
+    def extend(self, trades):
+        for trade in trades:
+            self.append(trade)
+
+    def segment(self, start: int) -> Dict[str, np.ndarray]:
+        """
+        The rows from `start` on as one 2D array per column kind, e.g. to persist new trades
+        incrementally. Text columns hold codes into categories().
+        """
+        return {kind: block[:, start:self._size] for kind, block in self._blocks.items()}
+
+    def append_segment(self, segment: Dict[str, np.ndarray], categories: Dict[str, List[str]]):
+        """
+        Append rows saved with segment(). `categories` must be the categories() of the ledger the
+        segment came from, as of when it was saved or later.
+        """
+        n = next(iter(segment.values())).shape[1]
+        if self._size + n > self._capacity:
+            self._grow(max(self._capacity * 2, self._size + n))
+        for kind, block in segment.items():
+            self._blocks[kind][:, self._size:self._size + n] = block
+        for name, values in categories.items():
+            self._categories[name] = list(values)
+            self._category_codes[name] = {value: code for code, value in enumerate(values)}
+        self._size += n
+
+    def categories(self) -> Dict[str, List[str]]:
+        return {name: list(values) for name, values in self._categories.items()}
+
+    def column(self, name: str) -> np.ndarray:
+        """The filled part of a column as a view (codes for text columns)."""
+        kind, row = self._slots[name]
+        return self._blocks[kind][row, :self._size]
+
+    def value(self, name: str, index: int):
+        kind, row = self._slots[name]
+        value = self._blocks[kind][row, index]
+        if kind == 'float':
+            return None if np.isnan(value) else float(value)
+        if kind == 'time':
+            return None if np.isnat(value) else pd.Timestamp(value)
+        if kind == 'category':
+            return None if value < 0 else self._categories[name][value]
+        return bool(value)
+
+    def to_frame(self, categorical: bool = False) -> pd.DataFrame:
+        """
+        Build a DataFrame of the closed trades, with the columns in the order of `columns`.
+
+        :param categorical: Return text columns as categoricals of the stored codes instead of object
+                            columns of strings. Categoricals are smaller, but sort in first-seen order.
+        """
+        n = self._size
+        data = {}
+        for name, (kind, row) in self._slots.items():
+            values = self._blocks[kind][row, :n]
+            if kind == 'category':
+                if categorical:
+                    data[name] = pd.Categorical.from_codes(values, categories=self._categories[name])
+                    continue
+                # Code -1 (missing) picks the appended None
+                values = np.array(self._categories[name] + [None], dtype=object)[values]
+            data[name] = values
+        return pd.DataFrame(data, index=pd.RangeIndex(n))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TradeRecord(self, i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("TradeLedger index out of range")
+        return TradeRecord(self, index)
+
+    def __iter__(self):
+        return (TradeRecord(self, i) for i in range(self._size))
+
+    def __repr__(self) -> str:
+        return f"TradeLedger({self._size} trades)"
@@ -1,21 +1,40 @@
 from enum import Enum
-import MetaTrader5 as mt5
 from typing import List, Dict, Callable, Optional
 from dataclasses import dataclass, field
+from datetime import timedelta
 import pytz
 
+try:
+    import MetaTrader5 as mt5
+except ImportError:
+    # MetaTrader5 only ships for Windows; backtests and benchmarks run without it
+    mt5 = None
+
+# Values of the mt5.TIMEFRAME_* constants, spelled out so the enum does not need MetaTrader5
 class MT5Timeframe(Enum):
-    M1 = mt5.TIMEFRAME_M1       # 1-minute
-    M5 = mt5.TIMEFRAME_M5       # 5-minute
-    M15 = mt5.TIMEFRAME_M15     # 15-minute
-    M30 = mt5.TIMEFRAME_M30     # 30-minute
-    H1 = mt5.TIMEFRAME_H1       # 1-hour
-    H4 = mt5.TIMEFRAME_H4       # 4-hour
-    D1 = mt5.TIMEFRAME_D1       # daily
-    W1 = mt5.TIMEFRAME_W1       # weekly
-    MN1 = mt5.TIMEFRAME_MN1     # monthly
+    M1 = 1          # 1-minute
+    M5 = 5          # 5-minute
+    M15 = 15        # 15-minute
+    M30 = 30        # 30-minute
+    H1 = 16385      # 1-hour
+    H4 = 16388      # 4-hour
+    D1 = 16408      # daily
+    W1 = 32769      # weekly
+    MN1 = 49153     # monthly
+
+# Bar length of each fixed-length timeframe (MN1 bars follow the calendar)
+TIMEFRAME_DURATIONS = {
+    MT5Timeframe.M1: timedelta(minutes=1),
+    MT5Timeframe.M5: timedelta(minutes=5),
+    MT5Timeframe.M15: timedelta(minutes=15),
+    MT5Timeframe.M30: timedelta(minutes=30),
+    MT5Timeframe.H1: timedelta(hours=1),
+    MT5Timeframe.H4: timedelta(hours=4),
+    MT5Timeframe.D1: timedelta(days=1),
+    MT5Timeframe.W1: timedelta(weeks=1),
+}
 
-TRADE_RETCODE_DESCRIPTION = {
+TRADE_RETCODE_DESCRIPTION = {} if mt5 is None else {
     mt5.TRADE_RETCODE_REQUOTE: "Requote",
     mt5.TRADE_RETCODE_REJECT: "Request rejected",
     mt5.TRADE_RETCODE_CANCEL: "Request canceled by trader",
@@ -65,7 +84,7 @@ CRYPTOCURRENCIES = ['BITCOIN', 'ETHEREUM', 'SOLANA', 'DOGECOIN', 'LITECOIN', 'RI
 CURRENCY_PAIRS: List[str] = ['USDJPY','USDCHF','USDCAD','EURUSD','EURGBP','EURJPY','EURCHF','EURCAD','EURAUD','EURNZD','GBPUSD','GBPJPY','GBPCHF','GBPCAD','GBPAUD','GBPNZD','CHFJPY','CADJPY','CADCHF','AUDUSD','AUDJPY','AUDCHF','AUDCAD','AUDNZD','NZDUSD','NZDJPY','NZDCHF','NZDCAD']
 CURRENCIES: List[str] = ["USD", "EUR", "GBP", "JPY", "CHF", "CAD", "AUD", "NZD"]
 
-TRADE_RETCODE_DESCRIPTION = {
+TRADE_RETCODE_DESCRIPTION = {} if mt5 is None else {
     mt5.TRADE_RETCODE_REQUOTE: "Requote",
     mt5.TRADE_RETCODE_REJECT: "Request rejected",
     mt5.TRADE_RETCODE_CANCEL: "Request canceled by trader",
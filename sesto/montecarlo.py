@@ -0,0 +1,123 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional
+from sesto.performance import drawdown_curve
+
+METHODS = ('bootstrap', 'permutation')
+
+def resample_pnl(pnl: np.ndarray, n_simulations: int, method: str, rng: np.random.Generator) -> np.ndarray:
+    """
+    Build a (simulations x trades) matrix of resampled trade PnL sequences.
+
+    :param pnl: The closed-trade PnLs in closing order.
+    :param method: 'bootstrap' draws trades with replacement, 'permutation' shuffles their order.
+    """
+    if method == 'bootstrap':
+        return pnl[rng.integers(0, len(pnl), size=(n_simulations, len(pnl)))]
+    if method == 'permutation':
+        return rng.permuted(np.broadcast_to(pnl, (n_simulations, len(pnl))), axis=1)
+    raise ValueError(f"Unknown resampling method: {method}")
+
+def simulation_metrics(pnl_matrix: np.ndarray, initial_capital: float, trades_per_year: float, ruin_level: float) -> Dict[str, np.ndarray]:
+    """
+    Metrics of every simulated PnL sequence (one per row), computed along the rows at once.
+    """
+    total_profit = pnl_matrix.sum(axis=1)
+    drawdown = drawdown_curve(pnl_matrix, initial_capital)
+    min_capital = initial_capital + np.minimum(np.cumsum(pnl_matrix, axis=1).min(axis=1), 0)
+
+    returns = pnl_matrix / initial_capital
+    std = returns.std(axis=1, ddof=1) if pnl_matrix.shape[1] > 1 else np.zeros(len(pnl_matrix))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe_ratio = np.where(std > 0, returns.mean(axis=1) / std * np.sqrt(trades_per_year), 0)
+
+    return {
+        'final_capital': initial_capital + total_profit,
+        'return_pct': total_profit / initial_capital * 100,
+        'max_drawdown_pct': drawdown.min(axis=1) * 100,
+        'min_capital': min_capital,
+        'sharpe_ratio': sharpe_ratio,
+        'ruined': min_capital <= initial_capital * ruin_level,
+    }
+
+def _monte_carlo_chunk(pnl: np.ndarray, n_simulations: int, method: str, seed: np.random.SeedSequence, initial_capital: float, trades_per_year: float, ruin_level: float) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return simulation_metrics(resample_pnl(pnl, n_simulations, method, rng), initial_capital, trades_per_year, ruin_level)
+
+@dataclass
+class MonteCarloResult:
+    simulations: pd.DataFrame
+    original: Dict[str, float]
+    risk_of_ruin: float
+
+    def summary(self, percentiles=(0.05, 0.25, 0.5, 0.75, 0.95)) -> pd.DataFrame:
+        """Percentiles of every metric over the simulations, next to the value of the original sequence."""
+        summary = self.simulations.drop(columns='ruined').quantile(list(percentiles)).T
+        summary.columns = [f'p{round(p * 100)}' for p in percentiles]
+        summary.insert(0, 'original', pd.Series(self.original))
+        return summary
+
+def monte_carlo(
+    trades_df: pd.DataFrame,
+    initial_capital: float,
+    n_simulations: int = 10_000,
+    method: str = 'bootstrap',
+    ruin_level: float = 0.5,
+    trades_per_year: Optional[float] = None,
+    chunk_size: int = 1000,
+    seed: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> MonteCarloResult:
+    """
+    Resample the closed-trade PnL sequence of a backtest to get distributions of final capital,
+    max drawdown and Sharpe ratio, and the risk of ruin.
+
+    Simulations are generated as (chunk_size x trades) matrices so memory stays bounded, and chunks
+    are spread over worker processes. Each chunk gets its own seed spawned from `seed`, so results
+    do not depend on the number of workers. Note that shuffling the order ('permutation') only changes
+    path-dependent metrics (drawdown, ruin); the final capital and Sharpe ratio are then identical.
+
+    :param trades_df: The closed trades, e.g. Backtester.trade_log, in closing order.
+    :param initial_capital: The starting capital.
+    :param n_simulations: The number of resampled sequences.
+    :param method: 'bootstrap' (draw trades with replacement) or 'permutation' (shuffle their order).
+    :param ruin_level: A simulation counts as ruined when its capital falls to this fraction of the initial capital.
+    :param trades_per_year: Used to annualize the per-trade Sharpe ratio; derived from the trade times by default.
+    :param chunk_size: The number of simulations per matrix.
+    :param seed: Seed for reproducible results.
+    :param max_workers: The number of worker processes, all cores by default; 1 runs in this process.
+    :return: A MonteCarloResult.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown resampling method: {method}")
+
+    pnl = trades_df['pnl'].to_numpy(dtype=np.float64)
+    if len(pnl) == 0:
+        raise ValueError("No closed trades to resample")
+
+    if trades_per_year is None:
+        years = (trades_df['close_time'].max() - trades_df['entry_time'].min()).days / 365
+        trades_per_year = len(pnl) / years if years > 0 else len(pnl)
+
+    sizes = [min(chunk_size, n_simulations - start) for start in range(0, n_simulations, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = (initial_capital, trades_per_year, ruin_level)
+
+    if max_workers == 1 or len(sizes) == 1:
+        chunks = [_monte_carlo_chunk(pnl, size, method, chunk_seed, *args) for size, chunk_seed in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            futures = [executor.submit(_monte_carlo_chunk, pnl, size, method, chunk_seed, *args) for size, chunk_seed in zip(sizes, seeds)]
+            chunks = [future.result() for future in futures]
+
+    simulations = pd.DataFrame({name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]})
+    original = {name: values[0] for name, values in simulation_metrics(pnl[np.newaxis, :], *args).items() if name != 'ruined'}
+
+    return MonteCarloResult(
+        simulations=simulations,
+        original=original,
+        risk_of_ruin=simulations['ruined'].mean(),
+    )
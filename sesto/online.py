@@ -0,0 +1,167 @@
+import math
+from collections import deque
+from datetime import datetime
+from typing import Dict, Optional
+
+class RunningStats:
+    """
+    Welford's running mean and variance. Values can also be removed again, which keeps the
+    statistics of a sliding window in O(1) per update.
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def remove(self, value: float):
+        if self.count <= 1:
+            self.count, self.mean, self._m2 = 0, 0.0, 0.0
+            return
+        self.count -= 1
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self._m2 -= delta * (value - self.mean)
+
+    @property
+    def std(self) -> float:
+        """The sample standard deviation, NaN below two values."""
+        return math.sqrt(max(self._m2, 0.0) / (self.count - 1)) if self.count > 1 else math.nan
+
+class OnlineMetrics:
+    """
+    Performance metrics of a live account, updated in O(1) per closed trade or equity tick instead
+    of recomputing performance() over the whole history.
+
+    Sharpe and Sortino are computed from per-trade returns (PnL / initial capital), over all trades
+    and over the last `window` trades, with the downside deviation taken over the losing returns as in
+    performance_metrics. Equity ticks (e.g. balance plus unrealized PnL) only move the equity, peak and
+    drawdown, so drawdowns of open positions count.
+    """
+    def __init__(self, initial_capital: float, window: int = 50, periods_per_year: Optional[float] = None):
+        """
+        :param initial_capital: The starting capital.
+        :param window: The number of recent trades of the rolling Sharpe and Sortino ratios.
+        :param periods_per_year: Trades per year to annualize the ratios with; per-trade ratios if None.
+        """
+        self.initial_capital = initial_capital
+        self.window = window
+        self.annualization = math.sqrt(periods_per_year) if periods_per_year else 1.0
+
+        self.num_trades = 0
+        self.num_wins = 0
+        self.total_profit = 0.0
+        self.best_trade = math.nan
+        self.worst_trade = math.nan
+        self.total_fees = 0.0
+
+        self.equity = initial_capital
+        self.peak_equity = initial_capital
+        self.max_drawdown = 0.0
+        self.max_drawdown_dollar = 0.0
+        self.last_update: Optional[datetime] = None
+
+        self._returns = RunningStats()
+        self._downside = RunningStats()
+        self._window_returns: deque = deque()
+        self._rolling_returns = RunningStats()
+        self._rolling_downside = RunningStats()
+
+    def add_trade(self, pnl: float, close_time: Optional[datetime] = None, fees: float = 0.0):
+        """
+        Record a closed trade.
+
+        :param pnl: The net PnL of the trade, fees included.
+        :param close_time: When the trade was closed.
+        :param fees: The fees paid, for the 'Total Fees ($)' metric only.
+        """
+        self.num_trades += 1
+        self.num_wins += pnl > 0
+        self.total_profit += pnl
+        self.total_fees += fees
+        self.best_trade = pnl if math.isnan(self.best_trade) else max(self.best_trade, pnl)
+        self.worst_trade = pnl if math.isnan(self.worst_trade) else min(self.worst_trade, pnl)
+
+        value = pnl / self.initial_capital
+        self._returns.add(value)
+        self._rolling_returns.add(value)
+        if value < 0:
+            self._downside.add(value)
+            self._rolling_downside.add(value)
+
+        self._window_returns.append(value)
+        if len(self._window_returns) > self.window:
+            expired = self._window_returns.popleft()
+            self._rolling_returns.remove(expired)
+            if expired < 0:
+                self._rolling_downside.remove(expired)
+
+        self.update_equity(self.initial_capital + self.total_profit, close_time)
+
+    def add_deal(self, deal: Dict):
+        """
+        Record a closed MetaTrader 5 position from the dict returned by get_deal_from_ticket.
+        """
+        fees = deal.get('commission', 0.0) + deal.get('swap', 0.0)
+        self.add_trade(deal['profit'] + fees, deal.get('close_time'), -fees)
+
+    def add_nobitex_position(self, position: Dict):
+        """
+        Record a closed Nobitex position from the positions list. The realized PnL is read from 'PNL'
+        when the exchange reports it, otherwise the last 'unrealizedPNL' seen while it was open is used.
+        """
+        pnl = position.get('PNL', position.get('unrealizedPNL'))
+        closed_at = position.get('closedAt')
+        self.add_trade(float(pnl), datetime.fromisoformat(closed_at) if closed_at else None)
+
+    def update_equity(self, equity: float, time: Optional[datetime] = None):
+        """Record the current mark-to-market equity, e.g. the account equity on every poll."""
+        self.equity = equity
+        self.peak_equity = max(self.peak_equity, equity)
+        drawdown = (equity - self.peak_equity) / self.peak_equity
+        if drawdown < self.max_drawdown:
+            self.max_drawdown = drawdown
+            self.max_drawdown_dollar = equity - self.peak_equity
+        self.last_update = time or datetime.now()
+
+    def _ratio(self, returns: RunningStats, downside: Optional[RunningStats] = None) -> float:
+        if returns.count == 0:
+            return 0.0
+        if downside is None:
+            std = returns.std
+        else:
+            if downside.count == 0:
+                return 0.0
+            std = downside.std
+        if std == 0:
+            return 0.0
+        return returns.mean / std * self.annualization
+
+    def snapshot(self) -> Dict:
+        """The current metrics, labelled like performance_metrics, as plain values (JSON-friendly)."""
+        return {
+            'Initial Capital': self.initial_capital,
+            'Equity': self.equity,
+            'Total Profit': self.total_profit,
+            'Return (%)': self.total_profit / self.initial_capital * 100,
+            '# Trades': self.num_trades,
+            'Win Rate': self.num_wins / self.num_trades * 100 if self.num_trades > 0 else math.nan,
+            'Best Trade ($)': self.best_trade,
+            'Worst Trade ($)': self.worst_trade,
+            'Avg. Trade ($)': self.total_profit / self.num_trades if self.num_trades > 0 else math.nan,
+            'Total Fees ($)': self.total_fees,
+            'Sharpe Ratio': self._ratio(self._returns),
+            'Sortino Ratio': self._ratio(self._returns, self._downside),
+            'Rolling Sharpe Ratio': self._ratio(self._rolling_returns),
+            'Rolling Sortino Ratio': self._ratio(self._rolling_returns, self._rolling_downside),
+            'Peak Equity': self.peak_equity,
+            'Drawdown (%)': (self.equity - self.peak_equity) / self.peak_equity * 100,
+            'Max. Drawdown ($)': self.max_drawdown_dollar,
+            'Max. Drawdown (%)': self.max_drawdown * 100,
+            'Last Update': self.last_update,
+        }
@@ -0,0 +1,282 @@
+import os
+import time
+import itertools
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Type
+from sesto.backtester import Backtester
+from sesto.metatrader.constants import MT5Timeframe
+from sesto.performance import performance, performance_metrics
+
+# Backtester constructor arguments that can be swept next to strategy parameters
+BACKTESTER_ARGS = ('initial_capital', 'spread_multiplier', 'leverage')
+
+# Data attached by each sweep worker process
+_shared_data: Dict[MT5Timeframe, Dict[str, pd.DataFrame]] = {}
+_shared_memory: Optional[shared_memory.SharedMemory] = None
+
+def parameter_grid(param_grid: Dict[str, List]) -> List[Dict]:
+    """
+    Expand a parameter grid into every combination.
+
+    :param param_grid: Mapping of parameter name to the list of values to try.
+    :return: A list of parameter dicts, one per combination.
+    """
+    names = list(param_grid.keys())
+    return [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+
+def share_data(data: Dict[MT5Timeframe, Dict[str, pd.DataFrame]]) -> tuple:
+    """
+    Copy every numeric and datetime column of the data dict into one shared memory block.
+
+    :param data: The {timeframe: {symbol: DataFrame}} data dict.
+    :return: A tuple (shared memory, manifest). The manifest describes where each column lives and
+             carries any non-numeric column as-is; the caller must close and unlink the shared memory.
+    """
+    layout = []
+    offset = 0
+    for timeframe, frames in data.items():
+        for symbol, df in frames.items():
+            for column in df.columns:
+                values = df[column].to_numpy()
+                if values.dtype.kind in 'biufM':
+                    offset = (offset + 63) // 64 * 64
+                    layout.append((timeframe.name, symbol, column, values, offset))
+                    offset += values.nbytes
+                else:
+                    layout.append((timeframe.name, symbol, column, values, None))
+
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    manifest = []
+    for timeframe_name, symbol, column, values, column_offset in layout:
+        if column_offset is None:
+            manifest.append((timeframe_name, symbol, column, None, None, None, values))
+        else:
+            target = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf, offset=column_offset)
+            target[:] = values
+            manifest.append((timeframe_name, symbol, column, values.dtype.str, values.shape[0], column_offset, None))
+
+    return shm, manifest
+
+def attach_data(shm: shared_memory.SharedMemory, manifest: List[tuple]) -> Dict[MT5Timeframe, Dict[str, pd.DataFrame]]:
+    """
+    Rebuild the data dict from a shared memory block created by share_data, with the columns backed by
+    the shared buffer where pandas allows it.
+    """
+    columns: Dict[tuple, Dict[str, np.ndarray]] = {}
+    for timeframe_name, symbol, column, dtype, length, offset, values in manifest:
+        if values is None:
+            values = np.ndarray((length,), dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+        columns.setdefault((timeframe_name, symbol), {})[column] = values
+
+    data = {}
+    for (timeframe_name, symbol), frame_columns in columns.items():
+        data.setdefault(MT5Timeframe[timeframe_name], {})[symbol] = pd.DataFrame(frame_columns, copy=False)
+    return data
+
+def slice_data(data: Dict[MT5Timeframe, Dict[str, pd.DataFrame]], start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict[MT5Timeframe, Dict[str, pd.DataFrame]]:
+    """
+    Restrict every frame of the data dict to start <= time < end without recomputing its columns, so
+    indicators computed over the full history keep their warm-up. Frames left empty are dropped. The
+    slices get a fresh RangeIndex, as the engine looks bars up by position.
+    """
+    sliced = {}
+    for timeframe, frames in data.items():
+        sliced[timeframe] = {}
+        for symbol, df in frames.items():
+            times = df['time'].to_numpy()
+            first = 0 if start is None else np.searchsorted(times, np.datetime64(pd.Timestamp(start)), side='left')
+            last = len(df) if end is None else np.searchsorted(times, np.datetime64(pd.Timestamp(end)), side='left')
+            if last > first:
+                sliced[timeframe][symbol] = df.iloc[first:last].reset_index(drop=True)
+    return sliced
+
+def _attach_worker(shm_name: str, manifest: List[tuple]):
+    global _shared_data, _shared_memory
+    _shared_memory = shared_memory.SharedMemory(name=shm_name)
+    _shared_data = attach_data(_shared_memory, manifest)
+
+def run_backtest(strategy_cls: Type[Backtester], params: Dict, data: Dict, initial_capital: float, main_timeframe: MT5Timeframe, spread_multiplier: float, leverage: float, mode: str) -> Backtester:
+    """
+    Run one backtest where parameters named like a Backtester argument override it and the rest are
+    handed to the strategy as self.params.
+    """
+    kwargs = {'initial_capital': initial_capital, 'spread_multiplier': spread_multiplier, 'leverage': leverage}
+    kwargs.update({key: value for key, value in params.items() if key in BACKTESTER_ARGS})
+    strategy_params = {key: value for key, value in params.items() if key not in BACKTESTER_ARGS}
+
+    backtest = strategy_cls(data, main_timeframe=main_timeframe, params=strategy_params, **kwargs)
+    backtest.run(mode=mode)
+    return backtest
+
+def _sweep_task(strategy_cls: Type[Backtester], params: Dict, initial_capital: float, main_timeframe: MT5Timeframe, spread_multiplier: float, leverage: float, mode: str, start: Optional[datetime] = None, end: Optional[datetime] = None, with_trades: bool = False):
+    data = _shared_data if start is None and end is None else slice_data(_shared_data, start, end)
+    backtest = run_backtest(strategy_cls, params, data, initial_capital, main_timeframe, spread_multiplier, leverage, mode)
+    trades_df = backtest.closed_trades.to_frame()
+    metrics = performance_metrics(trades_df, backtest.initial_capital, main_timeframe, backtest.backtest_duration, backtest.equity_curve)
+    if with_trades:
+        return {**params, **metrics}, trades_df
+    return {**params, **metrics}
+
+def sweep(
+    strategy_cls: Type[Backtester],
+    param_grid: Dict[str, List],
+    data: Dict[MT5Timeframe, Dict[str, pd.DataFrame]],
+    initial_capital: float,
+    main_timeframe: MT5Timeframe,
+    spread_multiplier: float = 0.0001,
+    leverage: float = 500.0,
+    mode: str = 'chronological',
+    sort_by: str = 'Sharpe Ratio',
+    ascending: bool = False,
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Backtest every combination of a parameter grid in parallel and rank the results.
+
+    The data dict is copied once into shared memory and every worker process attaches to it, so the OHLC
+    and indicator columns are not pickled per run. The strategy class must be importable by the workers
+    (defined in a module, not in a notebook cell) and reads its parameters from self.params.
+
+    :param strategy_cls: The Backtester subclass to run.
+    :param param_grid: Mapping of parameter name to the values to try. 'initial_capital', 'spread_multiplier'
+                       and 'leverage' are passed to the Backtester constructor, the rest to self.params.
+    :param data: The {timeframe: {symbol: DataFrame}} data dict.
+    :param initial_capital: The initial capital of each run.
+    :param main_timeframe: The timeframe to iterate.
+    :param spread_multiplier: The spread multiplier of each run.
+    :param leverage: The leverage of each run.
+    :param mode: The Backtester.run mode.
+    :param sort_by: The performance metric to rank by.
+    :param ascending: Whether lower values of sort_by rank first.
+    :param max_workers: The number of worker processes, all cores by default.
+    :return: One row per combination with its parameters and performance metrics, best first.
+    """
+    combinations = parameter_grid(param_grid)
+    shm, manifest = share_data(data)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), initializer=_attach_worker, initargs=(shm.name, manifest)) as executor:
+            futures = [
+                executor.submit(_sweep_task, strategy_cls, params, initial_capital, main_timeframe, spread_multiplier, leverage, mode)
+                for params in combinations
+            ]
+            results = [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return pd.DataFrame(results).sort_values(sort_by, ascending=ascending).reset_index(drop=True)
+
+@dataclass
+class WalkForwardResult:
+    windows: pd.DataFrame
+    trades: pd.DataFrame
+    equity: pd.Series
+    report: pd.DataFrame
+    out_of_sample_span: timedelta
+
+def walk_forward_windows(start: datetime, end: datetime, in_sample: timedelta, out_of_sample: timedelta, step: Optional[timedelta] = None, anchored: bool = False) -> List[tuple]:
+    """
+    Split [start, end) into consecutive (in-sample start, in-sample end, out-of-sample end) windows.
+
+    :param step: How far each window moves forward, the out-of-sample length by default.
+    :param anchored: Keep every in-sample window starting at `start` instead of rolling it.
+    """
+    step = step or out_of_sample
+    windows = []
+    is_start = start
+    is_end = start + in_sample
+    while is_end < end:
+        windows.append((start if anchored else is_start, is_end, min(is_end + out_of_sample, end)))
+        is_start += step
+        is_end += step
+    return windows
+
+def walk_forward(
+    strategy_cls: Type[Backtester],
+    param_grid: Dict[str, List],
+    data: Dict[MT5Timeframe, Dict[str, pd.DataFrame]],
+    initial_capital: float,
+    main_timeframe: MT5Timeframe,
+    in_sample: timedelta,
+    out_of_sample: timedelta,
+    step: Optional[timedelta] = None,
+    anchored: bool = False,
+    spread_multiplier: float = 0.0001,
+    leverage: float = 500.0,
+    mode: str = 'chronological',
+    sort_by: str = 'Sharpe Ratio',
+    ascending: bool = False,
+    max_workers: Optional[int] = None,
+) -> WalkForwardResult:
+    """
+    Walk-forward optimization: for each window, pick the best parameters of the grid on the in-sample
+    slice and evaluate them on the following out-of-sample slice.
+
+    Indicator columns already on the frames are computed once over the full history and only sliced
+    per window. All in-sample runs of all windows are fanned out over one process pool sharing the data
+    as in sweep(), then all out-of-sample runs. Each out-of-sample run starts from initial_capital, and
+    their trades are stitched into one equity curve and performance() report.
+
+    :return: A WalkForwardResult with one row per window (bounds, chosen parameters, in-sample and
+             out-of-sample score), the stitched out-of-sample trades with their window and parameters as
+             columns (for grouped_performance_metrics), the equity curve indexed by close time, the
+             performance report of the stitched trades (with the wall time of the whole walk-forward as
+             its Backtest Duration) and the summed length of the out-of-sample windows, also reported as
+             'Out-of-Sample Span'.
+    """
+    start_time = time.time()
+    main_frames = [df for df in data[main_timeframe].values() if not df.empty]
+    start = min(df['time'].iloc[0] for df in main_frames)
+    end = max(df['time'].iloc[-1] for df in main_frames) + timedelta(microseconds=1)
+    windows = walk_forward_windows(start, end, in_sample, out_of_sample, step, anchored)
+    combinations = parameter_grid(param_grid)
+
+    shm, manifest = share_data(data)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), initializer=_attach_worker, initargs=(shm.name, manifest)) as executor:
+            in_sample_futures = [
+                [
+                    executor.submit(_sweep_task, strategy_cls, params, initial_capital, main_timeframe, spread_multiplier, leverage, mode, is_start, is_end)
+                    for params in combinations
+                ]
+                for is_start, is_end, _ in windows
+            ]
+            best = []
+            for futures in in_sample_futures:
+                results = pd.DataFrame([future.result() for future in futures])
+                best.append(results.sort_values(sort_by, ascending=ascending).iloc[0])
+
+            out_of_sample_futures = [
+                executor.submit(_sweep_task, strategy_cls, combinations[best_row.name], initial_capital, main_timeframe, spread_multiplier, leverage, mode, is_end, oos_end, True)
+                for (_, is_end, oos_end), best_row in zip(windows, best)
+            ]
+            out_of_sample_results = [future.result() for future in out_of_sample_futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    window_rows = []
+    window_trades = []
+    for i, ((is_start, is_end, oos_end), best_row, (oos_metrics, trades_df)) in enumerate(zip(windows, best, out_of_sample_results)):
+        params = combinations[best_row.name]
+        window_rows.append({
+            'window': i, 'in_sample_start': is_start, 'in_sample_end': is_end, 'out_of_sample_end': oos_end,
+            **params, f'in_sample {sort_by}': best_row[sort_by], f'out_of_sample {sort_by}': oos_metrics[sort_by],
+        })
+        trades_df['window'] = i
+        for key, value in params.items():
+            trades_df[key] = value
+        window_trades.append(trades_df)
+
+    trades = pd.concat(window_trades, ignore_index=True).sort_values('close_time', kind='stable').reset_index(drop=True)
+    equity = pd.Series(initial_capital + trades['pnl'].cumsum().to_numpy(), index=trades['close_time'], name='equity')
+    out_of_sample_span = sum((oos_end - is_end for _, is_end, oos_end in windows), timedelta(0))
+    report = performance(trades, initial_capital, main_timeframe, timedelta(seconds=time.time() - start_time))
+    report = pd.concat([report, pd.DataFrame({'Metric': ['Out-of-Sample Span'], 'Value': [str(out_of_sample_span)]})], ignore_index=True)
+
+    return WalkForwardResult(pd.DataFrame(window_rows), trades, equity, report, out_of_sample_span)
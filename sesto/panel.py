@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence
+
+class Panel:
+    """
+    Columns of several symbols lined up on one shared time index, as (times x symbols) arrays.
+
+    A symbol without a bar at some time has NaN there. Indicators run on the panel compute every
+    symbol in one call when the symbols share their bars; otherwise each symbol is computed over its
+    own bars only, skipping the times it has none. Either way they equal the functions of
+    sesto.indicators run per symbol.
+    """
+    def __init__(self, times: pd.DatetimeIndex, symbols: List[str], positions: Dict[str, np.ndarray]):
+        self.times = times
+        self.symbols = list(symbols)
+        self.positions = positions
+        self.fields: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame], columns: Sequence[str] = ('open', 'high', 'low', 'close')) -> 'Panel':
+        """
+        :param frames: {symbol: DataFrame} with a 'time' column, e.g. mtd.data[timeframe].
+        :param columns: The columns to line up.
+        """
+        frames = {symbol: df for symbol, df in frames.items() if df is not None and not df.empty}
+        symbol_times = [df['time'].to_numpy() for df in frames.values()]
+        if symbol_times and all(np.array_equal(t, symbol_times[0]) for t in symbol_times[1:]):
+            # All symbols share their bars, so the rows already line up
+            times = symbol_times[0]
+            positions = {symbol: np.arange(len(times)) for symbol in frames}
+        else:
+            times = np.unique(np.concatenate(symbol_times)) if symbol_times else np.array([], dtype='datetime64[ns]')
+            positions = {symbol: np.searchsorted(times, t) for symbol, t in zip(frames, symbol_times)}
+
+        panel = cls(pd.DatetimeIndex(times, name='time'), list(frames.keys()), positions)
+        for column in columns:
+            values = np.full((len(times), len(frames)), np.nan)
+            for j, (symbol, df) in enumerate(frames.items()):
+                values[positions[symbol], j] = df[column].to_numpy(dtype=np.float64)
+            panel.fields[column] = values
+        return panel
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.fields[name]
+
+    def __setitem__(self, name: str, values: np.ndarray):
+        if values.shape != (len(self.times), len(self.symbols)):
+            raise ValueError(f"Expected shape {(len(self.times), len(self.symbols))}, got {values.shape}")
+        self.fields[name] = values
+
+    def frame(self, name: str) -> pd.DataFrame:
+        """A field as a DataFrame indexed by time with one column per symbol."""
+        return pd.DataFrame(self.fields[name], index=self.times, columns=self.symbols)
+
+    def to_frames(self, frames: Dict[str, pd.DataFrame], names: Sequence[str]):
+        """
+        Attach panel fields to the per-symbol frames as columns, matched by time. Each frame in
+        `frames` is replaced by a new one with the columns added in one concat.
+        """
+        names = list(names)
+        for j, symbol in enumerate(self.symbols):
+            df = frames[symbol]
+            rows = self.positions[symbol]
+            values = np.column_stack([self.fields[name][rows, j] for name in names])
+            columns = pd.DataFrame(values, index=df.index, columns=names)
+            frames[symbol] = pd.concat([df.drop(columns=columns.columns.intersection(df.columns)), columns], axis=1)
+
+    def columnwise(self, name: str, function) -> np.ndarray:
+        """
+        Apply function, which maps a (times x symbols) array to one of the same shape computing each
+        column on its own, to a field. When some symbols lack bars at some times, it is applied per
+        symbol to the rows where the symbol has bars, so gaps do not reach into its windows.
+        """
+        values = self.fields[name]
+        if all(len(rows) == len(self.times) for rows in self.positions.values()):
+            return function(values)
+        result = np.full_like(values, np.nan)
+        for j, symbol in enumerate(self.symbols):
+            rows = self.positions[symbol]
+            result[rows, j] = function(values[rows, j:j + 1])[:, 0]
+        return result
+
+    def sma(self, name: str, period: int) -> np.ndarray:
+        return self.columnwise(name, lambda values: pd.DataFrame(values).rolling(period).mean().to_numpy())
+
+    def std(self, name: str, period: int) -> np.ndarray:
+        return self.columnwise(name, lambda values: pd.DataFrame(values).rolling(period).std().to_numpy())
+
+    def ema(self, name: str, period: int) -> np.ndarray:
+        return self.columnwise(name, lambda values: pd.DataFrame(values).ewm(span=period, adjust=False).mean().to_numpy())
+
+    def roc(self, name: str, period: int) -> np.ndarray:
+        return self.columnwise(name, lambda values: _roc(values, period))
+
+    def rsi(self, name: str, period: int) -> np.ndarray:
+        """RSI with a simple rolling average of gains and losses, as sesto.indicators.RSI."""
+        return self.columnwise(name, lambda values: _rsi(values, period))
+
+def _roc(values: np.ndarray, period: int) -> np.ndarray:
+    shifted = np.full_like(values, np.nan)
+    shifted[period:] = values[:-period]
+    return (values - shifted) / shifted * 100
+
+def _rsi(values: np.ndarray, period: int) -> np.ndarray:
+    change = np.diff(values, axis=0, prepend=np.nan)
+    # The unknown first change counts as no gain and no loss, as in sesto.indicators.RSI
+    gain = pd.DataFrame(np.where(change > 0, change, 0.0)).rolling(period).mean().to_numpy()
+    loss = pd.DataFrame(np.where(change < 0, -change, 0.0)).rolling(period).mean().to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
+
+def currency_incidence(symbols: Sequence[str], currencies: Sequence[str]) -> tuple:
+    """
+    Incidence matrices of currency pairs: base[s, c] is 1 when symbols[s] starts with currencies[c],
+    quote[s, c] when it ends with it (as in 'EURUSD').
+
+    :return: A tuple (base, quote) of (symbols x currencies) float arrays.
+    """
+    base_codes = np.array([symbol[:3] for symbol in symbols])
+    quote_codes = np.array([symbol[3:6] for symbol in symbols])
+    currencies = np.asarray(currencies)
+    base = (base_codes[:, np.newaxis] == currencies[np.newaxis, :]).astype(np.float64)
+    quote = (quote_codes[:, np.newaxis] == currencies[np.newaxis, :]).astype(np.float64)
+    return base, quote
+
+def _cross_mean(values: np.ndarray, incidence: np.ndarray) -> np.ndarray:
+    """Mean over the symbols of each currency at every time, skipping missing values: two matrix products."""
+    valid = ~np.isnan(values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (np.where(valid, values, 0.0) @ incidence) / (valid.astype(np.float64) @ incidence)
+
+def _smooth(strength: np.ndarray, period: int, short_period: int, long_period: int, signal_period: int) -> Dict[str, np.ndarray]:
+    """
+    Rolling mean, 0-100 min-max scaling and MACD of each currency's strength, over the times where
+    the currency has a value.
+    """
+    csm = np.full_like(strength, np.nan)
+    macd = np.full_like(strength, np.nan)
+    signal = np.full_like(strength, np.nan)
+    for c in range(strength.shape[1]):
+        rows = np.flatnonzero(~np.isnan(strength[:, c]))
+        if len(rows) == 0:
+            continue
+        smoothed = pd.Series(strength[rows, c]).rolling(period).mean()
+        scaled = 100 * (smoothed - smoothed.min()) / (smoothed.max() - smoothed.min())
+        line = scaled.ewm(span=short_period, adjust=False).mean() - scaled.ewm(span=long_period, adjust=False).mean()
+        csm[rows, c] = scaled.to_numpy()
+        macd[rows, c] = line.to_numpy()
+        signal[rows, c] = line.ewm(span=signal_period, adjust=False).mean().to_numpy()
+    return {'csm': csm, 'csm_macd': macd, 'csm_macd_signal': signal, 'csm_macd_histogram': macd - signal}
+
+def currency_strength(
+    panel: Panel,
+    name: str,
+    currencies: Sequence[str],
+    period: int,
+    short_period: int = 12,
+    long_period: int = 26,
+    signal_period: int = 9,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Currency strength from a per-pair panel field, e.g. 'psm'.
+
+    For every currency, the field is averaged over the pairs it is the base of, and negated and
+    averaged over the pairs it is the quote of, with one matrix product against the incidence
+    matrices per side. Each average is then smoothed with a rolling mean of `period`, scaled to 0-100
+    over the whole history and given a MACD, as in the CSM notebook.
+
+    :return: {'base_csm', 'base_csm_macd', 'base_csm_macd_signal', 'base_csm_macd_histogram', and the
+             same for 'quote_'}: DataFrames indexed by time with one column per currency.
+    """
+    base, quote = currency_incidence(panel.symbols, currencies)
+    values = panel[name]
+
+    strength = {}
+    for side, incidence, sign in (('base', base, 1), ('quote', quote, -1)):
+        for key, matrix in _smooth(_cross_mean(sign * values, incidence), period, short_period, long_period, signal_period).items():
+            strength[f'{side}_{key}'] = pd.DataFrame(matrix, index=panel.times, columns=list(currencies))
+    return strength
+
+def add_currency_strength(panel: Panel, strength: Dict[str, pd.DataFrame], currencies: Optional[Sequence[str]] = None):
+    """
+    Add the strength of each pair's base and quote currency to the panel as per-pair fields (e.g.
+    'base_csm' of EURUSD is the 'base_csm' of EUR), gathered in one indexing step per field. Pairs
+    whose currency is not in `currencies` get NaN.
+    """
+    currencies = list(currencies or next(iter(strength.values())).columns)
+    index = {currency: c for c, currency in enumerate(currencies)}
+    for key, df in strength.items():
+        side = 0 if key.startswith('base_') else 3
+        codes = np.array([index.get(symbol[side:side + 3], -1) for symbol in panel.symbols])
+        # Code -1 picks the appended NaN column
+        values = np.column_stack([df.to_numpy(), np.full(len(df), np.nan)])
+        panel[key] = values[:, codes]
@@ -1,127 +1,466 @@
+import warnings
 import numpy as np
 import pandas as pd
+from dataclasses import dataclass
 from datetime import timedelta
+from typing import Dict, List, Optional
 
-def performance(trades_df, initial_capital, main_timeframe, backtest_duration):
-    # Calculate Performance Metrics
-    total_profit = trades_df['pnl'].sum()
-    num_trades = len(trades_df)
-    win_rate = (trades_df['pnl'] > 0).mean()
-    max_drawdown = trades_df['max_drawdown'].min()
-    avg_drawdown = trades_df['max_drawdown'].mean()
-    best_trade = trades_df['pnl'].max()
-    worst_trade = trades_df['pnl'].min()
-    avg_trade = trades_df['pnl'].mean()
-    trade_durations = (trades_df['close_time'] - trades_df['entry_time'])
-    max_trade_duration = trade_durations.max()
-    avg_trade_duration = trade_durations.mean()
+def drawdown_curve(pnl: np.ndarray, initial_capital: float) -> np.ndarray:
+    """
+    Drawdown of the equity curve obtained by adding trade PnLs to the initial capital, as a fraction
+    of its running peak (0 at a new high, negative below it).
 
+    :param pnl: Trade PnLs in closing order, either 1D or 2D with one sequence per row.
+    :param initial_capital: The starting capital.
+    :return: An array of the same shape as `pnl`.
+    """
+    return equity_drawdown(1 + np.cumsum(pnl, axis=-1) / initial_capital)
+
+def equity_drawdown(equity: np.ndarray) -> np.ndarray:
+    """
+    Drawdown of an equity curve (1D, or 2D with one curve per row) as a fraction of its running peak.
+    """
+    peak = np.maximum.accumulate(equity, axis=-1)
+    return (equity - peak) / peak
+
+# Metric fields of PerformanceMetrics and their report labels, in report order
+METRIC_LABELS = {
+    'initial_capital': 'Initial Capital', 'final_capital': 'Final Capital', 'total_profit': 'Total Profit',
+    'return_pct': 'Return (%)', 'annualized_return_pct': 'Annualized Return (%)', 'volatility': 'Volatility (Ann.)',
+    'sharpe_ratio': 'Sharpe Ratio', 'sortino_ratio': 'Sortino Ratio', 'calmar_ratio': 'Calmar Ratio',
+    'max_drawdown_dollar': 'Max. Drawdown ($)', 'max_drawdown_pct': 'Max. Drawdown (%)', 'avg_drawdown_dollar': 'Avg. Drawdown ($)',
+    'num_trades': '# Trades', 'win_rate': 'Win Rate', 'best_trade': 'Best Trade ($)', 'worst_trade': 'Worst Trade ($)',
+    'avg_trade': 'Avg. Trade ($)', 'avg_risk_reward_ratio': 'Avg. Risk/Reward Ratio', 'max_trade_duration': 'Max. Trade Duration',
+    'avg_trade_duration': 'Avg. Trade Duration', 'total_fees': 'Total Fees ($)', 'first_trade_time': 'First Trade Time',
+    'last_trade_time': 'Last Trade Time', 'avg_time_between_trades': 'Avg. Time Between Trades', 'trades_per_day': 'Trades per Day',
+    'trades_per_week': 'Trades per Week', 'trades_per_month': 'Trades per Month', 'trades_per_year': 'Trades per Year',
+    'trailing_stop_pct': 'Percentage of Trades with Triggered Trailing Stop', 'trades_left_open': 'Trades Left Open',
+    'trades_closed_by_tp': 'Trades closed by TP', 'trades_closed_by_sl': 'Trades closed by SL',
+    'trades_closed_by_liq': 'Trades closed by liquidation', 'trades_closed_by_exit_condition': 'Trades Closed by Exit Condition',
+    'main_timeframe': 'Main Timeframe', 'backtest_duration': 'Backtest Duration', 'num_long_trades': 'Number of Long Trades',
+    'num_short_trades': 'Number of Short Trades', 'long_trades_pct': 'Percentage of Long Trades',
+    'short_trades_pct': 'Percentage of Short Trades', 'win_rate_long': 'Win Rate of Long Trades',
+    'win_rate_short': 'Win Rate of Short Trades', 'pnl_long': 'PnL of Long Trades', 'pnl_short': 'PnL of Short Trades',
+}
+
+# Labels shown with a '%' suffix or a '$' prefix in the formatted report
+PERCENTAGE_METRICS = {'Return (%)', 'Annualized Return (%)', 'Max. Drawdown (%)', 'Win Rate',
+                      'Percentage of Long Trades', 'Percentage of Short Trades', 'Win Rate of Long Trades', 'Win Rate of Short Trades'}
+MONETARY_METRICS = {'Initial Capital', 'Final Capital', 'Total Profit', 'Max. Drawdown ($)', 'Avg. Drawdown ($)',
+                    'Best Trade ($)', 'Worst Trade ($)', 'Avg. Trade ($)', 'Total Fees ($)', 'PnL of Long Trades', 'PnL of Short Trades'}
+
+def format_metric(label: str, value) -> str:
+    """Format one metric value the way the performance() report shows it."""
+    text = f'{value:.2f}' if isinstance(value, (int, float, np.integer, np.floating)) else str(value)
+    if label in PERCENTAGE_METRICS:
+        text += '%'
+    if label in MONETARY_METRICS:
+        text = '$' + text
+    return text
+
+@dataclass
+class PerformanceMetrics:
+    """
+    The numeric performance metrics of a backtest. Values stay numeric; to_frame() formats them
+    for display only when asked.
+    """
+    initial_capital: float
+    final_capital: float
+    total_profit: float
+    return_pct: float
+    annualized_return_pct: float
+    volatility: float
+    sharpe_ratio: float
+    sortino_ratio: float
+    calmar_ratio: float
+    max_drawdown_dollar: float
+    max_drawdown_pct: float
+    avg_drawdown_dollar: float
+    num_trades: int
+    win_rate: float
+    best_trade: float
+    worst_trade: float
+    avg_trade: float
+    avg_risk_reward_ratio: float
+    max_trade_duration: pd.Timedelta
+    avg_trade_duration: pd.Timedelta
+    total_fees: float
+    first_trade_time: pd.Timestamp
+    last_trade_time: pd.Timestamp
+    avg_time_between_trades: timedelta
+    trades_per_day: float
+    trades_per_week: float
+    trades_per_month: float
+    trades_per_year: float
+    trailing_stop_pct: float
+    trades_left_open: int
+    trades_closed_by_tp: int
+    trades_closed_by_sl: int
+    trades_closed_by_liq: int
+    trades_closed_by_exit_condition: int
+    main_timeframe: str
+    backtest_duration: str
+    num_long_trades: int
+    num_short_trades: int
+    long_trades_pct: float
+    short_trades_pct: float
+    win_rate_long: float
+    win_rate_short: float
+    pnl_long: float
+    pnl_short: float
+
+    def to_dict(self) -> Dict:
+        """The metrics keyed by their report labels, e.g. 'Sharpe Ratio'."""
+        return {label: getattr(self, name) for name, label in METRIC_LABELS.items()}
+
+    def to_frame(self) -> pd.DataFrame:
+        """The formatted Metric/Value report table."""
+        metrics = self.to_dict()
+        return pd.DataFrame({'Metric': list(metrics.keys()), 'Value': [format_metric(label, value) for label, value in metrics.items()]})
+
+def _mean(values: np.ndarray) -> float:
+    return values.mean() if len(values) > 0 else np.nan
+
+def _std(values: np.ndarray) -> float:
+    return values.std(ddof=1) if len(values) > 1 else np.nan
+
+def compute_performance(trades_df, initial_capital, main_timeframe, backtest_duration, equity_curve=None) -> PerformanceMetrics:
+    """
+    Compute the performance metrics of a backtest. Each column is read into NumPy once and each
+    mask (winning, long, short) is built once.
+
+    :param trades_df: The closed trades in closing order, e.g. Backtester.trade_log.
+    :param equity_curve: Optional per-bar mark-to-market equity (a Series indexed by time), e.g.
+                         Backtester.equity_curve. When given, drawdown, volatility, Sharpe and Sortino
+                         are computed from it, so drawdowns of open trades count; otherwise from the
+                         realized PnL at trade close times.
+    """
+    pnl = trades_df['pnl'].to_numpy(dtype=np.float64)
+    entry_time = trades_df['entry_time'].to_numpy()
+    close_time = trades_df['close_time'].to_numpy()
+    num_trades = len(pnl)
+
+    won = pnl > 0
+    lost = pnl < 0
+    is_long = (trades_df['type'] == 'long').to_numpy()
+    is_short = (trades_df['type'] == 'short').to_numpy()
+    reasons = trades_df['closing_reason'].value_counts()
+
+    total_profit = pnl.sum()
     final_capital = initial_capital + total_profit
-    max_capital = max(initial_capital, final_capital)
-    min_capital = min(initial_capital, final_capital)
+    trade_durations = pd.to_timedelta(close_time - entry_time)
+    first_trade_time = pd.Timestamp(entry_time.min()) if num_trades > 0 else pd.NaT
+    last_trade_time = pd.Timestamp(close_time.max()) if num_trades > 0 else pd.NaT
 
     # Annualized Volatility, Sharpe Ratio, Sortino Ratio, Calmar Ratio
     trading_days = 252
-    total_days = (trades_df['close_time'].max() - trades_df['entry_time'].min()).days
+    total_days = (last_trade_time - first_trade_time).days
     years = total_days / 365
 
-    returns = trades_df['pnl'] / initial_capital
     total_return = (final_capital / initial_capital) - 1
     annualized_return = (1 + total_return) ** (1 / years) - 1 if years > 0 else 0
-    
-    daily_returns = returns.groupby(trades_df['close_time'].dt.date).sum()
-    annualized_volatility = daily_returns.std() * np.sqrt(trading_days)
-    
+
+    if equity_curve is not None and len(equity_curve) > 0:
+        equity = equity_curve.to_numpy(dtype=np.float64)
+        days = equity_curve.index.to_numpy().astype('datetime64[D]')
+        daily_equity = equity[np.append(days[1:] != days[:-1], True)]
+        daily_returns = np.diff(daily_equity, prepend=initial_capital) / initial_capital
+    else:
+        _, day_codes = np.unique(close_time.astype('datetime64[D]'), return_inverse=True)
+        daily_returns = np.bincount(day_codes, weights=pnl / initial_capital)
+    annualized_volatility = _std(daily_returns) * np.sqrt(trading_days)
+
     risk_free_rate = 0.02  # Assume 2% risk-free rate
     excess_return = annualized_return - risk_free_rate
     sharpe_ratio = excess_return / annualized_volatility if annualized_volatility != 0 else 0
-    
+
     downside_returns = daily_returns[daily_returns < 0]
-    sortino_ratio = excess_return / (downside_returns.std() * np.sqrt(trading_days)) if len(downside_returns) > 0 else 0
-    
-    # Calculate drawdown
-    cumulative_returns = (1 + trades_df['pnl'].cumsum() / initial_capital)
-    peak = cumulative_returns.cummax()
-    drawdown = (cumulative_returns - peak) / peak
-    max_drawdown = drawdown.min()
-    avg_drawdown = drawdown.mean()
+    sortino_ratio = excess_return / (_std(downside_returns) * np.sqrt(trading_days)) if len(downside_returns) > 0 else 0
 
-    # Convert drawdown to dollar value
-    max_drawdown_dollar = max_drawdown * initial_capital
-    avg_drawdown_dollar = avg_drawdown * initial_capital
+    # Calculate drawdown
+    if equity_curve is not None and len(equity_curve) > 0:
+        drawdown = equity_drawdown(np.concatenate(([initial_capital], equity)))[1:]
+    else:
+        drawdown = drawdown_curve(pnl, initial_capital)
+    max_drawdown = drawdown.min() if len(drawdown) > 0 else np.nan
+    avg_drawdown = _mean(drawdown)
 
     # Calculate Calmar ratio
     calmar_ratio = abs(annualized_return / max_drawdown) if max_drawdown != 0 else 0
 
-    # Additional metrics
-    avg_profit = trades_df.loc[trades_df['pnl'] > 0, 'pnl'].mean()
-    avg_loss = trades_df.loc[trades_df['pnl'] < 0, 'pnl'].mean()
+    avg_profit = _mean(pnl[won])
+    avg_loss = _mean(pnl[lost])
     avg_risk_reward_ratio = abs(avg_profit / avg_loss) if avg_loss != 0 else 0
-    total_commissions = trades_df['order_commission'].sum()
 
-    # New metrics
-    first_trade_time = trades_df['entry_time'].min()
-    last_trade_time = trades_df['close_time'].max()
-    total_trading_days = (last_trade_time - first_trade_time).days
     avg_time_between_trades = (last_trade_time - first_trade_time) / num_trades if num_trades > 1 else timedelta(0)
-    trades_per_day = num_trades / total_trading_days if total_trading_days > 0 else 0
-    trades_per_week = trades_per_day * 7
-    trades_per_month = trades_per_day * 30
-    trades_per_year = trades_per_day * 365
-    trades_left_open = (trades_df['closing_reason'] == 'end_of_backtest').sum()
-    trades_closed_by_tp = (trades_df['closing_reason'] == 'TP').sum()
-    trades_closed_by_sl = (trades_df['closing_reason'] == 'SL').sum()
-    trades_closed_by_liq = (trades_df['closing_reason'] == 'LIQ').sum()
-    trades_closed_by_exit_condition = (trades_df['closing_reason'] == 'exit_condition').sum()
-
-    number_of_trades_with_triggered_trailing_stop = trades_df['triggered_trailing_stop'].sum()
-    percentage_of_trades_with_triggered_trailing_stop = (number_of_trades_with_triggered_trailing_stop / num_trades) * 100 if num_trades > 0 else 0
-    num_long_trades = (trades_df['type'] == 'long').sum()
-    num_short_trades = (trades_df['type'] == 'short').sum()
-    percent_long_trades = (num_long_trades / num_trades) * 100 if num_trades > 0 else 0
-    percent_short_trades = (num_short_trades / num_trades) * 100 if num_trades > 0 else 0
-    
-    win_rate_long = (trades_df[trades_df['type'] == 'long']['pnl'] > 0).mean() * 100
-    win_rate_short = (trades_df[trades_df['type'] == 'short']['pnl'] > 0).mean() * 100
-    
-    pnl_long = trades_df[trades_df['type'] == 'long']['pnl'].sum()
-    pnl_short = trades_df[trades_df['type'] == 'short']['pnl'].sum()
-
-    # Summary Table with Proper Formatting
-    performance_summary = pd.DataFrame({
-        'Metric': ['Initial Capital', 'Final Capital', 'Total Profit', 'Return (%)', 'Annualized Return (%)',
-                   'Volatility (Ann.)', 'Sharpe Ratio', 'Sortino Ratio', 'Calmar Ratio', 'Max. Drawdown ($)',
-                   'Max. Drawdown (%)', 'Avg. Drawdown ($)', '# Trades', 'Win Rate', 'Best Trade ($)', 
-                   'Worst Trade ($)', 'Avg. Trade ($)', 'Avg. Risk/Reward Ratio', 'Max. Trade Duration', 
-                   'Avg. Trade Duration', 'Total Fees ($)', 'First Trade Time', 'Last Trade Time', 
-                   'Avg. Time Between Trades', 'Trades per Day', 'Trades per Week', 'Trades per Month', 
-                   'Trades per Year', 'Percentage of Trades with Triggered Trailing Stop', 'Trades Left Open', 'Trades closed by TP', 'Trades closed by SL', 'Trades closed by liquidation',
-                    'Trades Closed by Exit Condition', 'Main Timeframe', 'Backtest Duration',
-                    'Number of Long Trades', 'Number of Short Trades', 'Percentage of Long Trades', 'Percentage of Short Trades',
-                    'Win Rate of Long Trades', 'Win Rate of Short Trades',
-                    'PnL of Long Trades', 'PnL of Short Trades'],
-
-        'Value': [initial_capital, final_capital, total_profit, (final_capital / initial_capital - 1) * 100, annualized_return * 100,
-                  annualized_volatility * 100, sharpe_ratio, sortino_ratio, calmar_ratio, max_drawdown_dollar,
-                  max_drawdown * 100, avg_drawdown_dollar, num_trades, win_rate * 100, best_trade, 
-                  worst_trade, avg_trade, avg_risk_reward_ratio, max_trade_duration, avg_trade_duration, 
-                  total_commissions, first_trade_time, last_trade_time, avg_time_between_trades, trades_per_day, 
-                  trades_per_week, trades_per_month, trades_per_year, percentage_of_trades_with_triggered_trailing_stop, trades_left_open, trades_closed_by_tp, 
-                  trades_closed_by_sl, trades_closed_by_liq, trades_closed_by_exit_condition, main_timeframe.name, str(backtest_duration),
-                num_long_trades, num_short_trades, f'{percent_long_trades:.2f}%', f'{percent_short_trades:.2f}%', f'{win_rate_long:.2f}%', f'{win_rate_short:.2f}%', f'${pnl_long:.2f}', f'${pnl_short:.2f}']
-            })
-
-    # Apply formatting to the 'Value' column
-    performance_summary['Value'] = performance_summary.apply(lambda row: 
-        f'{row["Value"]:.2f}' if isinstance(row["Value"], (int, float, np.integer, np.floating)) else str(row["Value"]), axis=1)
-
-    # Add '%' symbol to percentage metrics
-    percentage_metrics = ['Return (%)', 'Annualized Return (%)', 'Max. Drawdown (%)', 'Win Rate']
-    performance_summary.loc[performance_summary['Metric'].isin(percentage_metrics), 'Value'] += '%'
-
-    # Add '$' symbol to monetary metrics
-    monetary_metrics = ['Initial Capital', 'Final Capital', 'Total Profit', 'Max. Drawdown ($)', 'Avg. Drawdown ($)',
-                        'Best Trade ($)', 'Worst Trade ($)', 'Avg. Trade ($)', 'Total Fees ($)']
-    performance_summary.loc[performance_summary['Metric'].isin(monetary_metrics), 'Value'] = '$' + performance_summary.loc[performance_summary['Metric'].isin(monetary_metrics), 'Value']
-
-    return performance_summary
\ No newline at end of file
+    trades_per_day = num_trades / total_days if total_days > 0 else 0
+    num_long_trades = int(is_long.sum())
+    num_short_trades = int(is_short.sum())
+    num_triggered_trailing_stop = trades_df['triggered_trailing_stop'].to_numpy().sum()
+
+    return PerformanceMetrics(
+        initial_capital=initial_capital, final_capital=final_capital, total_profit=total_profit,
+        return_pct=total_return * 100, annualized_return_pct=annualized_return * 100,
+        volatility=annualized_volatility * 100, sharpe_ratio=sharpe_ratio, sortino_ratio=sortino_ratio,
+        calmar_ratio=calmar_ratio, max_drawdown_dollar=max_drawdown * initial_capital, max_drawdown_pct=max_drawdown * 100,
+        avg_drawdown_dollar=avg_drawdown * initial_capital, num_trades=num_trades, win_rate=_mean(won) * 100,
+        best_trade=pnl.max() if num_trades > 0 else np.nan, worst_trade=pnl.min() if num_trades > 0 else np.nan,
+        avg_trade=_mean(pnl), avg_risk_reward_ratio=avg_risk_reward_ratio,
+        max_trade_duration=trade_durations.max(), avg_trade_duration=trade_durations.mean(),
+        total_fees=trades_df['order_commission'].to_numpy(dtype=np.float64).sum(),
+        first_trade_time=first_trade_time, last_trade_time=last_trade_time,
+        avg_time_between_trades=avg_time_between_trades, trades_per_day=trades_per_day,
+        trades_per_week=trades_per_day * 7, trades_per_month=trades_per_day * 30, trades_per_year=trades_per_day * 365,
+        trailing_stop_pct=num_triggered_trailing_stop / num_trades * 100 if num_trades > 0 else 0,
+        trades_left_open=reasons.get('end_of_backtest', 0), trades_closed_by_tp=reasons.get('TP', 0),
+        trades_closed_by_sl=reasons.get('SL', 0), trades_closed_by_liq=reasons.get('LIQ', 0),
+        trades_closed_by_exit_condition=reasons.get('exit_condition', 0), main_timeframe=main_timeframe.name,
+        backtest_duration=str(backtest_duration), num_long_trades=num_long_trades, num_short_trades=num_short_trades,
+        long_trades_pct=num_long_trades / num_trades * 100 if num_trades > 0 else 0,
+        short_trades_pct=num_short_trades / num_trades * 100 if num_trades > 0 else 0,
+        win_rate_long=_mean(won[is_long]) * 100, win_rate_short=_mean(won[is_short]) * 100,
+        pnl_long=pnl[is_long].sum(), pnl_short=pnl[is_short].sum(),
+    )
+
+def performance_metrics(trades_df, initial_capital, main_timeframe, backtest_duration, equity_curve=None):
+    """
+    The performance metrics of a backtest as a dict keyed by report label. See compute_performance.
+    """
+    return compute_performance(trades_df, initial_capital, main_timeframe, backtest_duration, equity_curve).to_dict()
+
+def batch_performance_metrics(pnl: np.ndarray, initial_capital: float, close_days: Optional[np.ndarray] = None, years: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """
+    Compute the PnL-based performance metrics of many runs at once, e.g. every run of a sweep.
+
+    Runs are the rows of a 2D PnL matrix in closing order; runs with fewer trades are padded with NaN
+    at the end. Every metric is one operation along the rows, so thousands of runs cost about as
+    much as a few calls of compute_performance. Metrics that need trade attributes other than PnL
+    (durations, fees, sides) are left out. stack_trades builds the inputs from trade logs.
+
+    :param pnl: The (runs x trades) PnL matrix.
+    :param initial_capital: The initial capital of every run.
+    :param close_days: Optional (runs x trades) integer day numbers of the trade closes (e.g.
+                       days since the epoch); needed for volatility, Sharpe and Sortino.
+    :param years: Optional length of each run in years (or one for all); needed for the
+                  annualized return and the Sharpe, Sortino and Calmar ratios.
+    :return: One row per run with the columns named as in performance_metrics().
+    """
+    pnl = np.atleast_2d(np.asarray(pnl, dtype=np.float64))
+    runs = len(pnl)
+    valid = ~np.isnan(pnl)
+    filled = np.where(valid, pnl, 0.0)
+    num_trades = valid.sum(axis=1)
+
+    total_profit = filled.sum(axis=1)
+    final_capital = initial_capital + total_profit
+    total_return = final_capital / initial_capital - 1
+
+    with warnings.catch_warnings(), np.errstate(divide='ignore', invalid='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+
+        drawdown = np.where(valid, drawdown_curve(filled, initial_capital), np.nan)
+        max_drawdown = np.nanmin(drawdown, axis=1)
+        avg_drawdown = np.nanmean(drawdown, axis=1)
+
+        avg_profit = np.nanmean(np.where(pnl > 0, pnl, np.nan), axis=1)
+        avg_loss = np.nanmean(np.where(pnl < 0, pnl, np.nan), axis=1)
+
+        metrics = {
+            'Initial Capital': np.full(runs, initial_capital, dtype=np.float64), 'Final Capital': final_capital,
+            'Total Profit': total_profit, 'Return (%)': total_return * 100,
+        }
+
+        if years is not None:
+            years = np.broadcast_to(np.asarray(years, dtype=np.float64), (runs,))
+            annualized_return = np.where(years > 0, (1 + total_return) ** (1 / years) - 1, 0)
+            metrics['Annualized Return (%)'] = annualized_return * 100
+
+            if close_days is not None:
+                daily_returns = _batch_daily_returns(filled / initial_capital, np.asarray(close_days), valid)
+                annualized_volatility = np.nanstd(daily_returns, axis=1, ddof=1) * np.sqrt(252)
+                downside_returns = np.where(daily_returns < 0, daily_returns, np.nan)
+                downside_volatility = np.nanstd(downside_returns, axis=1, ddof=1) * np.sqrt(252)
+
+                excess_return = annualized_return - 0.02  # Assume 2% risk-free rate
+                metrics['Volatility (Ann.)'] = annualized_volatility * 100
+                metrics['Sharpe Ratio'] = np.where(annualized_volatility != 0, excess_return / annualized_volatility, 0)
+                metrics['Sortino Ratio'] = np.where((downside_returns < 0).any(axis=1), excess_return / downside_volatility, 0)
+
+            metrics['Calmar Ratio'] = np.where(max_drawdown != 0, np.abs(annualized_return / max_drawdown), 0)
+
+        metrics.update({
+            'Max. Drawdown ($)': max_drawdown * initial_capital, 'Max. Drawdown (%)': max_drawdown * 100,
+            'Avg. Drawdown ($)': avg_drawdown * initial_capital, '# Trades': num_trades,
+            'Win Rate': np.nanmean(np.where(valid, pnl > 0, np.nan), axis=1) * 100,
+            'Best Trade ($)': np.nanmax(pnl, axis=1), 'Worst Trade ($)': np.nanmin(pnl, axis=1),
+            'Avg. Trade ($)': np.nanmean(pnl, axis=1),
+            'Avg. Risk/Reward Ratio': np.where(avg_loss != 0, np.abs(avg_profit / avg_loss), 0),
+        })
+
+    return pd.DataFrame(metrics)
+
+def _batch_daily_returns(returns: np.ndarray, close_days: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Sum the returns of each run per close day into a (runs x days) matrix, NaN on days without closes."""
+    first_day = close_days[valid].min() if valid.any() else 0
+    num_days = int(close_days[valid].max() - first_day + 1) if valid.any() else 1
+    runs = np.broadcast_to(np.arange(len(returns))[:, np.newaxis], returns.shape)
+    cells = (runs * num_days + (close_days - first_day))[valid]
+
+    sums = np.bincount(cells, weights=returns[valid], minlength=len(returns) * num_days)
+    counts = np.bincount(cells, minlength=len(returns) * num_days)
+    return np.where(counts > 0, sums, np.nan).reshape(len(returns), num_days)
+
+def stack_trades(trade_frames: List[pd.DataFrame]) -> tuple:
+    """
+    Pack the trade logs of several runs into the inputs of batch_performance_metrics.
+
+    :return: A tuple (pnl, close_days, years) with one row per run, padded with NaN and 0.
+    """
+    width = max((len(df) for df in trade_frames), default=0)
+    pnl = np.full((len(trade_frames), width), np.nan)
+    close_days = np.zeros((len(trade_frames), width), dtype=np.int64)
+    years = np.zeros(len(trade_frames))
+    for i, df in enumerate(trade_frames):
+        n = len(df)
+        if n == 0:
+            continue
+        pnl[i, :n] = df['pnl'].to_numpy(dtype=np.float64)
+        close_days[i, :n] = df['close_time'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        years[i] = (df['close_time'].max() - df['entry_time'].min()).days / 365
+    return pnl, close_days, years
+
+# Grouping keys derived from the trade columns, next to the columns themselves
+DERIVED_GROUP_KEYS = {
+    'side': lambda trades_df: trades_df['type'],
+    'month': lambda trades_df: trades_df['close_time'].dt.to_period('M'),
+    'year': lambda trades_df: trades_df['close_time'].dt.year,
+}
+
+def grouped_performance_metrics(trades_df, initial_capital, main_timeframe, backtest_duration, by):
+    """
+    Compute the performance_metrics() of every group of trades at once.
+
+    The trades are split into groups once, and each metric is one grouped aggregation over all
+    groups instead of a filtered copy of the trades per group. Every group is treated as if it had
+    been traded alone from initial_capital, so drawdown and the ratios come from its own realized PnL.
+
+    :param trades_df: The closed trades in closing order, e.g. Backtester.trade_log. Trades of several
+                      runs can be concatenated with their parameters as columns to group by them.
+    :param by: A key or a list of keys: any trade column ('symbol', 'closing_reason', a parameter
+               column, ...) or one of DERIVED_GROUP_KEYS ('side', 'month' and 'year' of the close time).
+    :return: One row per group, indexed by the keys, with one column per metric.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    keys = []
+    for name in by:
+        if name in DERIVED_GROUP_KEYS:
+            keys.append(DERIVED_GROUP_KEYS[name](trades_df).rename(name))
+        elif name in trades_df.columns:
+            keys.append(trades_df[name])
+        else:
+            raise KeyError(f"Unknown grouping key: {name}")
+
+    groups = trades_df.groupby(keys, observed=True, sort=True)
+    group_ids = groups.ngroup().to_numpy()
+    index = groups.size().index
+
+    pnl = trades_df['pnl'].astype(np.float64)
+    trade_type = trades_df['type'].astype(object)
+    closing_reason = trades_df['closing_reason'].astype(object)
+    is_long = trade_type == 'long'
+    is_short = trade_type == 'short'
+    won = (pnl > 0).astype(np.float64)
+
+    columns = pd.DataFrame({
+        'pnl': pnl,
+        'won': won,
+        'profit': pnl.where(pnl > 0),
+        'loss': pnl.where(pnl < 0),
+        'duration': trades_df['close_time'] - trades_df['entry_time'],
+        'entry_time': trades_df['entry_time'],
+        'close_time': trades_df['close_time'],
+        'commission': trades_df['order_commission'],
+        'trailing_stop': trades_df['triggered_trailing_stop'].astype(np.float64),
+        'long': is_long.astype(np.float64),
+        'short': is_short.astype(np.float64),
+        'won_long': won.where(is_long),
+        'won_short': won.where(is_short),
+        'pnl_long': pnl.where(is_long, 0.0),
+        'pnl_short': pnl.where(is_short, 0.0),
+        **{reason: (closing_reason == reason).astype(np.float64) for reason in ('end_of_backtest', 'TP', 'SL', 'LIQ', 'exit_condition')},
+    })
+
+    # Running drawdown of each group's own realized equity curve, as in drawdown_curve()
+    equity = 1 + pnl.groupby(group_ids).cumsum() / initial_capital
+    columns['drawdown'] = (equity - equity.groupby(group_ids).cummax()) / equity.groupby(group_ids).cummax()
+
+    agg = columns.groupby(group_ids).agg(
+        total_profit=('pnl', 'sum'), num_trades=('pnl', 'size'), win_rate=('won', 'mean'),
+        best_trade=('pnl', 'max'), worst_trade=('pnl', 'min'), avg_trade=('pnl', 'mean'),
+        max_trade_duration=('duration', 'max'), avg_trade_duration=('duration', 'mean'),
+        avg_profit=('profit', 'mean'), avg_loss=('loss', 'mean'), total_commissions=('commission', 'sum'),
+        first_trade_time=('entry_time', 'min'), last_trade_time=('close_time', 'max'),
+        max_drawdown=('drawdown', 'min'), avg_drawdown=('drawdown', 'mean'),
+        trailing_stop=('trailing_stop', 'sum'), num_long=('long', 'sum'), num_short=('short', 'sum'),
+        win_rate_long=('won_long', 'mean'), win_rate_short=('won_short', 'mean'),
+        pnl_long=('pnl_long', 'sum'), pnl_short=('pnl_short', 'sum'),
+        left_open=('end_of_backtest', 'sum'), closed_by_tp=('TP', 'sum'), closed_by_sl=('SL', 'sum'),
+        closed_by_liq=('LIQ', 'sum'), closed_by_exit_condition=('exit_condition', 'sum'),
+    )
+
+    # Daily returns per group: sum per (group, close date), then spread per group
+    daily_returns = (pnl / initial_capital).groupby([group_ids, trades_df['close_time'].dt.date.to_numpy()]).sum()
+    downside_returns = daily_returns[daily_returns < 0].groupby(level=0)
+    daily_returns = daily_returns.groupby(level=0)
+
+    trading_days = 252
+    num_trades = agg['num_trades']
+    final_capital = initial_capital + agg['total_profit']
+    total_return = final_capital / initial_capital - 1
+    total_days = (agg['last_trade_time'] - agg['first_trade_time']).dt.days
+    years = total_days / 365
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annualized_return = pd.Series(np.where(years > 0, (1 + total_return) ** (1 / years) - 1, 0), index=agg.index)
+        annualized_volatility = daily_returns.std() * np.sqrt(trading_days)
+
+        risk_free_rate = 0.02  # Assume 2% risk-free rate
+        excess_return = annualized_return - risk_free_rate
+        sharpe_ratio = np.where(annualized_volatility != 0, excess_return / annualized_volatility, 0)
+        downside_volatility = downside_returns.std().reindex(agg.index) * np.sqrt(trading_days)
+        downside_count = downside_returns.size().reindex(agg.index, fill_value=0)
+        sortino_ratio = np.where(downside_count > 0, excess_return / downside_volatility, 0)
+
+        max_drawdown = agg['max_drawdown']
+        calmar_ratio = np.where(max_drawdown != 0, (annualized_return / max_drawdown).abs(), 0)
+        avg_risk_reward_ratio = np.where(agg['avg_loss'] != 0, (agg['avg_profit'] / agg['avg_loss']).abs(), 0)
+        trades_per_day = np.where(total_days > 0, num_trades / total_days, 0)
+
+    avg_time_between_trades = ((agg['last_trade_time'] - agg['first_trade_time']) / num_trades).where(num_trades > 1, timedelta(0))
+
+    metrics = pd.DataFrame({
+        'Initial Capital': initial_capital, 'Final Capital': final_capital, 'Total Profit': agg['total_profit'],
+        'Return (%)': total_return * 100, 'Annualized Return (%)': annualized_return * 100,
+        'Volatility (Ann.)': annualized_volatility * 100, 'Sharpe Ratio': sharpe_ratio, 'Sortino Ratio': sortino_ratio,
+        'Calmar Ratio': calmar_ratio, 'Max. Drawdown ($)': max_drawdown * initial_capital, 'Max. Drawdown (%)': max_drawdown * 100,
+        'Avg. Drawdown ($)': agg['avg_drawdown'] * initial_capital, '# Trades': num_trades, 'Win Rate': agg['win_rate'] * 100,
+        'Best Trade ($)': agg['best_trade'], 'Worst Trade ($)': agg['worst_trade'], 'Avg. Trade ($)': agg['avg_trade'],
+        'Avg. Risk/Reward Ratio': avg_risk_reward_ratio, 'Max. Trade Duration': agg['max_trade_duration'],
+        'Avg. Trade Duration': agg['avg_trade_duration'], 'Total Fees ($)': agg['total_commissions'],
+        'First Trade Time': agg['first_trade_time'], 'Last Trade Time': agg['last_trade_time'],
+        'Avg. Time Between Trades': avg_time_between_trades, 'Trades per Day': trades_per_day,
+        'Trades per Week': trades_per_day * 7, 'Trades per Month': trades_per_day * 30, 'Trades per Year': trades_per_day * 365,
+        'Percentage of Trades with Triggered Trailing Stop': agg['trailing_stop'] / num_trades * 100,
+        'Trades Left Open': agg['left_open'].astype(np.int64), 'Trades closed by TP': agg['closed_by_tp'].astype(np.int64),
+        'Trades closed by SL': agg['closed_by_sl'].astype(np.int64), 'Trades closed by liquidation': agg['closed_by_liq'].astype(np.int64),
+        'Trades Closed by Exit Condition': agg['closed_by_exit_condition'].astype(np.int64), 'Main Timeframe': main_timeframe.name,
+        'Backtest Duration': str(backtest_duration), 'Number of Long Trades': agg['num_long'].astype(np.int64),
+        'Number of Short Trades': agg['num_short'].astype(np.int64), 'Percentage of Long Trades': agg['num_long'] / num_trades * 100,
+        'Percentage of Short Trades': agg['num_short'] / num_trades * 100, 'Win Rate of Long Trades': agg['win_rate_long'] * 100,
+        'Win Rate of Short Trades': agg['win_rate_short'] * 100, 'PnL of Long Trades': agg['pnl_long'], 'PnL of Short Trades': agg['pnl_short'],
+    }, index=agg.index)
+    metrics.index = index
+    return metrics
+
+def performance(trades_df, initial_capital, main_timeframe, backtest_duration, equity_curve=None):
+    return compute_performance(trades_df, initial_capital, main_timeframe, backtest_duration, equity_curve).to_frame()
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Iterator, List, Optional
+from sesto.incremental import indicator_columns
+
+class ChunkSource:
+    """
+    Time-ordered bars of several symbols, read one chunk at a time. Subclasses implement chunks(),
+    which yields consecutive DataFrames with at least 'time', 'open', 'high', 'low' and 'close'.
+    """
+    def __init__(self, symbols: List[str], chunk_size: int = 100_000):
+        self.symbols = list(symbols)
+        self.chunk_size = chunk_size
+
+    def chunks(self, symbol: str) -> Iterator[pd.DataFrame]:
+        # This method should be overridden in the subclass
+        raise NotImplementedError
+
+class ParquetSource(ChunkSource):
+    """One Parquet file per symbol, read in record batches of `chunk_size` rows. Requires pyarrow."""
+    def __init__(self, paths: Dict[str, str], chunk_size: int = 100_000, columns: Optional[List[str]] = None):
+        super().__init__(list(paths.keys()), chunk_size)
+        self.paths = dict(paths)
+        self.columns = columns
+
+    def chunks(self, symbol: str) -> Iterator[pd.DataFrame]:
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(self.paths[symbol])
+        for batch in parquet_file.iter_batches(batch_size=self.chunk_size, columns=self.columns):
+            yield batch.to_pandas()
+
+class CSVSource(ChunkSource):
+    """One CSV file per symbol with a parseable 'time' column, read `chunk_size` rows at a time."""
+    def __init__(self, paths: Dict[str, str], chunk_size: int = 100_000):
+        super().__init__(list(paths.keys()), chunk_size)
+        self.paths = dict(paths)
+
+    def chunks(self, symbol: str) -> Iterator[pd.DataFrame]:
+        with pd.read_csv(self.paths[symbol], chunksize=self.chunk_size, parse_dates=['time']) as reader:
+            yield from reader
+
+class FrameSource(ChunkSource):
+    """In-memory frames split into chunks, e.g. to check a streamed run against a regular one."""
+    def __init__(self, frames: Dict[str, pd.DataFrame], chunk_size: int = 100_000):
+        super().__init__(list(frames.keys()), chunk_size)
+        self.frames = frames
+
+    def chunks(self, symbol: str) -> Iterator[pd.DataFrame]:
+        df = self.frames[symbol]
+        for start in range(0, len(df), self.chunk_size):
+            yield df.iloc[start:start + self.chunk_size]
+
+def stream_windows(source: ChunkSource, prepare: Optional[Callable] = None, warmup: int = 0, indicators: Optional[Callable] = None) -> Iterator[Dict[str, pd.DataFrame]]:
+    """
+    Merge the chunks of every symbol into consecutive time windows.
+
+    A window holds every buffered bar up to the earliest last time among the symbols' current chunks,
+    so all bars of a timestamp land in the same window and windows never overlap. At most one chunk
+    per symbol is buffered at a time.
+
+    :param source: The chunked source.
+    :param prepare: Called as prepare(symbol, df) to add indicator columns; it may modify df in place
+                    or return a new frame. It receives the last `warmup` raw bars of the symbol in
+                    front of the window's bars, which are dropped again afterwards, so rolling
+                    indicators with a window of up to `warmup` bars match a run over the full history.
+                    Recursive ones (EMA, MACD, Wilder smoothing) only converge, so they are not exact
+                    at the seams; compute them with `indicators` instead.
+    :param warmup: The number of bars of history to carry into prepare().
+    :param indicators: Called as indicators(symbol) once per symbol to build a list of streaming
+                       indicators of sesto.incremental (e.g. [StreamingMACD()]). Every bar of the
+                       symbol is fed to them in order and their values are added as columns, so
+                       their state carries across windows and they match a run over the full history.
+    :return: An iterator of {symbol: DataFrame} windows with a RangeIndex.
+    """
+    iterators = {symbol: iter(source.chunks(symbol)) for symbol in source.symbols}
+    buffers: Dict[str, Optional[pd.DataFrame]] = {symbol: next(iterator, None) for symbol, iterator in iterators.items()}
+    history: Dict[str, Optional[pd.DataFrame]] = {symbol: None for symbol in source.symbols}
+    streaming: Dict[str, list] = {}
+
+    while True:
+        for symbol, buffer in buffers.items():
+            while buffer is not None and buffer.empty:
+                buffer = buffers[symbol] = next(iterators[symbol], None)
+        active = [symbol for symbol, buffer in buffers.items() if buffer is not None]
+        if not active:
+            return
+
+        cutoff = min(buffers[symbol]['time'].iloc[-1] for symbol in active)
+        window = {}
+        for symbol in active:
+            buffer = buffers[symbol]
+            n = int(np.searchsorted(buffer['time'].to_numpy(), np.datetime64(cutoff), side='right'))
+            if n == len(buffer):
+                buffers[symbol] = next(iterators[symbol], None)
+            else:
+                buffers[symbol] = buffer.iloc[n:]
+            if n > 0:
+                window[symbol] = buffer.iloc[:n]
+
+        for symbol, df in window.items():
+            if prepare is None:
+                prepared = df.reset_index(drop=True)
+            else:
+                past = history[symbol]
+                raw = pd.concat([past, df], ignore_index=True) if past is not None else df.reset_index(drop=True).copy()
+                history[symbol] = raw.iloc[-warmup:].copy() if warmup > 0 else None
+                offset = len(past) if past is not None else 0
+
+                prepared = prepare(symbol, raw)
+                if prepared is None:
+                    prepared = raw
+                prepared = prepared.iloc[offset:].reset_index(drop=True)
+
+            if indicators is not None:
+                if symbol not in streaming:
+                    streaming[symbol] = list(indicators(symbol))
+                values = indicator_columns(streaming[symbol], prepared)
+                prepared = pd.concat([prepared.drop(columns=values.columns.intersection(prepared.columns)), values], axis=1)
+            window[symbol] = prepared
+
+        yield window
@@ -0,0 +1,94 @@
+import pandas as pd
+from sesto.benchmarks.strategies import RSIReversal, RSIReversalSignals, add_indicators
+from sesto.benchmarks.synthetic import synthetic_data
+from sesto.metatrader.constants import MT5Timeframe
+
+def offset_index(data, main_timeframe: MT5Timeframe, offset: int = 1000):
+    """The main-timeframe frames with an index that does not start at 0, like a slice of a longer history."""
+    return {**data, main_timeframe: {symbol: df.set_axis(df.index + offset) for symbol, df in data[main_timeframe].items()}}
+
+def trade_columns(backtester):
+    return backtester.trade_log[['symbol', 'entry_time', 'close_time', 'closing_reason', 'pnl']]
+
+def test_iterrows_rows_are_positional():
+    data = synthetic_data(bars=1500, seed=2)
+    add_indicators(data, MT5Timeframe.H1)
+    shifted = offset_index(data, MT5Timeframe.H1)
+
+    expected = RSIReversalSignals(data, 10_000, MT5Timeframe.H1)
+    expected.run('arrays')
+    actual = RSIReversalSignals(shifted, 10_000, MT5Timeframe.H1)
+    actual.run('iterrows')
+    assert len(expected.closed_trades) > 0
+    pd.testing.assert_frame_equal(trade_columns(actual), trade_columns(expected))
+
+def test_signal_strategy_resumes_from_checkpoint(tmp_path):
+    data = synthetic_data(bars=1500, seed=2)
+    add_indicators(data, MT5Timeframe.H1)
+    expected = RSIReversalSignals(data, 10_000, MT5Timeframe.H1)
+    expected.run('chronological')
+
+    class Interrupted(Exception):
+        pass
+
+    class InterruptedSignals(RSIReversalSignals):
+        def entry_condition(self, symbol, time, row, open_trades, closed_trades, timeframe):
+            if time >= pd.Timestamp('2024-02-01'):
+                raise Interrupted()
+            return super().entry_condition(symbol, time, row, open_trades, closed_trades, timeframe)
+
+    try:
+        InterruptedSignals(data, 10_000, MT5Timeframe.H1).run('chronological', checkpoint_path=str(tmp_path), checkpoint_every=100)
+    except Interrupted:
+        pass
+    assert (tmp_path / 'state.pkl').exists()
+
+    resumed = RSIReversalSignals(data, 10_000, MT5Timeframe.H1)
+    resumed.run('chronological', checkpoint_path=str(tmp_path), checkpoint_every=100, resume=True)
+    pd.testing.assert_frame_equal(trade_columns(resumed), trade_columns(expected))
+    assert resumed.available_capital == expected.available_capital
+
+def test_intrabar_resolution_matches_across_modes():
+    data = synthetic_data(bars=8000, timeframes=[MT5Timeframe.M15, MT5Timeframe.H1], volatility=0.001, seed=5)
+    add_indicators(data, MT5Timeframe.H1)
+    shifted = offset_index(data, MT5Timeframe.H1)
+
+    runs = []
+    for mode, fast_forward in (('iterrows', False), ('arrays', False), ('arrays', True), ('chronological', True)):
+        backtester = RSIReversal(shifted, 100_000, MT5Timeframe.H1, intrabar_timeframe=MT5Timeframe.M15)
+        backtester.run(mode, fast_forward=fast_forward)
+        runs.append(backtester)
+    for backtester in runs[1:3]:
+        pd.testing.assert_frame_equal(trade_columns(backtester), trade_columns(runs[0]))
+
+    # Bars reaching both TP and SL are resolved on the M15 bars instead of defaulting to TP
+    main_bar_only = RSIReversal(shifted, 100_000, MT5Timeframe.H1)
+    main_bar_only.run('chronological')
+    tp_share = lambda backtester: (backtester.trade_log['closing_reason'] == 'TP').mean()
+    assert tp_share(runs[3]) < tp_share(main_bar_only)
+
+class RecordingRSIReversal(RSIReversal):
+    """RSIReversal that records the H4 bar timeframe_row returns for every H1 bar."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.seen = []
+
+    def entry_condition(self, symbol, time, row, open_trades, closed_trades, timeframe):
+        higher = self.timeframe_row(MT5Timeframe.H4, symbol, row)
+        self.seen.append((symbol, pd.Timestamp(time), None if higher is None else pd.Timestamp(higher['time'])))
+        return super().entry_condition(symbol, time, row, open_trades, closed_trades, timeframe)
+
+def test_timeframe_row_returns_last_closed_bar():
+    data = synthetic_data(bars=600, timeframes=[MT5Timeframe.H1, MT5Timeframe.H4], seed=6)
+    add_indicators(data, MT5Timeframe.H1)
+    shifted = offset_index(data, MT5Timeframe.H1)
+
+    for mode in ('iterrows', 'arrays', 'chronological'):
+        backtester = RecordingRSIReversal(shifted, 10_000, MT5Timeframe.H1)
+        backtester.run(mode)
+        assert len(backtester.seen) == sum(len(df) for df in data[MT5Timeframe.H1].values())
+        for symbol, time, higher_time in backtester.seen:
+            h4_times = data[MT5Timeframe.H4][symbol]['time']
+            # The last H4 bar that had closed when the H1 bar closed
+            closed = h4_times[h4_times + pd.Timedelta(hours=4) <= time + pd.Timedelta(hours=1)]
+            assert higher_time == (closed.iloc[-1] if len(closed) else None)
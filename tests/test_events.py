@@ -0,0 +1,29 @@
+from sesto.benchmarks.strategies import RSIReversal, add_indicators
+from sesto.benchmarks.synthetic import synthetic_data
+from sesto.events import INFO, EventLog, format_event
+from sesto.metatrader.constants import MT5Timeframe
+
+class PrintingRSIReversal(RSIReversal):
+    """RSIReversal that also renders the console lines the engine printed before the event log."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.printed = []
+
+    def open_trade(self, symbol, time, required_capital, position_size_usd, trade_info):
+        trade = super().open_trade(symbol, time, required_capital, position_size_usd, trade_info)
+        self.printed.append(f"{symbol} - OPENED TRADE    - {trade.type.upper()} - ENTRY: ${trade.entry_price:.3f} - TP: ${trade.tp_price:.3f} ({(trade.entry_price / trade.tp_price - 1) * 100:.3f}% DIFF ENTRY)( PNL AT TP: ${trade.potential_profit_usd:.2f}) - SL: ${trade.sl_price:.3f} ({(trade.entry_price / trade.sl_price - 1) * 100:.3f}%) - LIQ: ${trade.liq_p:.3f} - BE: ${trade.be_p:.3f} - AVAILABLE CAPITAL: ${self.available_capital:.3f}")
+        return trade
+
+    def close_trade(self, trade, close_time, close_price, reason):
+        super().close_trade(trade, close_time, close_price, reason)
+        self.printed.append(f"{trade.symbol} - CLOSED TRADE    - {trade.type.upper()} - ENTRY: ${trade.entry_price:.3f} - CLOSE: ${close_price:.3f} - PNL: ${trade.pnl:.2f} - SL: ${trade.sl_price:.3f} - TP: ${trade.tp_price:.3f} - REASON: {reason} - AVAILABLE CAPITAL: ${self.available_capital:.3f}")
+
+def test_console_lines_match_previous_prints():
+    data = synthetic_data(bars=2000, seed=3)
+    add_indicators(data, MT5Timeframe.H1)
+    backtester = PrintingRSIReversal(data, 10_000, MT5Timeframe.H1, event_log=EventLog(level=INFO, capacity=100_000))
+    backtester.run('arrays', fast_forward=False)
+
+    lines = [format_event(event) for event in backtester.events.buffer if event.kind in ('trade_opened', 'trade_closed')]
+    assert any(' - LONG - ' in line for line in lines) and any(' - SHORT - ' in line for line in lines)
+    assert lines == backtester.printed
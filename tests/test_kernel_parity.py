@@ -0,0 +1,56 @@
+import pytest
+from sesto import kernel
+from sesto.benchmarks.strategies import RSIReversalSignals, add_indicators
+from sesto.benchmarks.synthetic import synthetic_data
+from sesto.metatrader.constants import MT5Timeframe
+
+class TrailingRSIReversalSignals(RSIReversalSignals):
+    trailing_stop_steps = [(50.0, 10.0), (20.0, 0.0)]
+
+SCENARIOS = {
+    # Long and short entries closed at TP and SL
+    'long_short': (RSIReversalSignals, 100_000, {}),
+    # Stops stepped up as the PnL reaches each trigger
+    'trailing_stop': (TrailingRSIReversalSignals, 100_000, {}),
+    # Room for two trades across five symbols, so entries are rejected for lack of capital
+    'out_of_capital': (RSIReversalSignals, 500, {}),
+    # Targets too far to reach, so trades are still open when the data ends
+    'end_of_backtest': (RSIReversalSignals, 100_000, {'TP_PNL_MULTIPLIER': 50, 'SL_PNL_MULTIPLIER': -0.9}),
+}
+
+@pytest.fixture(scope='module')
+def data():
+    data = synthetic_data(bars=3000, seed=7, volatility=0.002)
+    add_indicators(data, MT5Timeframe.H1)
+    return data
+
+@pytest.fixture(params=['python', 'numba'])
+def engine(request, monkeypatch):
+    if request.param == 'numba':
+        if not kernel.NUMBA_AVAILABLE:
+            pytest.skip('numba is not installed')
+    else:
+        # The compiled functions keep the original Python function as py_func
+        monkeypatch.setattr(kernel, 'simulate_kernel', getattr(kernel.simulate_kernel, 'py_func', kernel.simulate_kernel))
+        monkeypatch.setattr(kernel, '_close', getattr(kernel._close, 'py_func', kernel._close))
+    return request.param
+
+@pytest.mark.parametrize('scenario', list(SCENARIOS))
+def test_kernel_matches_chronological_engine(data, engine, scenario):
+    strategy_cls, initial_capital, params = SCENARIOS[scenario]
+    strategy = strategy_cls(data, initial_capital, MT5Timeframe.H1, params=params)
+
+    mismatches = kernel.check_parity(strategy)
+    assert mismatches.empty, mismatches.head(20).to_string()
+
+    trades = strategy.trade_log
+    assert len(trades) > 0
+    if scenario == 'long_short':
+        assert set(trades['type']) == {'long', 'short'}
+        assert {'TP', 'SL'} <= set(trades['closing_reason'])
+    elif scenario == 'trailing_stop':
+        assert trades['triggered_trailing_stop'].any()
+    elif scenario == 'out_of_capital':
+        assert any(event.kind == 'entry_rejected' for event in strategy.events.buffer)
+    elif scenario == 'end_of_backtest':
+        assert (trades['closing_reason'] == 'end_of_backtest').any()
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+import pandas as pd
+import pytest
+from sesto.benchmarks.strategies import RSIReversalSignals, add_indicators
+from sesto.benchmarks.synthetic import synthetic_data
+from sesto.metatrader.constants import MT5Timeframe
+from sesto.optimize import slice_data, walk_forward
+
+@pytest.fixture(scope='module')
+def data():
+    data = synthetic_data(bars=1500, seed=4)
+    add_indicators(data, MT5Timeframe.H1)
+    return data
+
+def test_slice_data_resets_index(data):
+    sliced = slice_data(data, datetime(2024, 1, 20), datetime(2024, 2, 10))
+    for df in sliced[MT5Timeframe.H1].values():
+        pd.testing.assert_index_equal(df.index, pd.RangeIndex(len(df)))
+        assert df['time'].iloc[0] >= pd.Timestamp('2024-01-20')
+
+# Each mode against one with the same semantics: per-symbol modes, and time-ordered ones sharing capital
+@pytest.mark.parametrize('mode, reference', [('iterrows', 'arrays'), ('chronological', 'kernel')])
+def test_walk_forward_modes_agree(data, mode, reference):
+    kwargs = dict(in_sample=timedelta(days=20), out_of_sample=timedelta(days=10), max_workers=2)
+    grid = {'RSI_LOWER': [25, 30]}
+    expected = walk_forward(RSIReversalSignals, grid, data, 10_000, MT5Timeframe.H1, mode=reference, **kwargs)
+    actual = walk_forward(RSIReversalSignals, grid, data, 10_000, MT5Timeframe.H1, mode=mode, **kwargs)
+
+    assert len(expected.trades) > 0
+    columns = ['symbol', 'entry_time', 'close_time', 'pnl', 'window']
+    pd.testing.assert_frame_equal(actual.trades[columns], expected.trades[columns])
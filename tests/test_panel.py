@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sesto.benchmarks.synthetic import synthetic_data
+from sesto.indicators import EMA, ROC, RSI, SMA, STD
+from sesto.metatrader.constants import MT5Timeframe
+from sesto.panel import Panel
+
+PERIOD = 14
+INDICATORS = {'sma': (SMA, 'sma-14'), 'std': (STD, 'std-14'), 'ema': (EMA, 'ema-14'), 'roc': (ROC, 'roc-14'), 'rsi': (RSI, 'rsi-14')}
+
+def frames(aligned: bool):
+    frames = dict(synthetic_data(bars=500, seed=8)[MT5Timeframe.H1])
+    if not aligned:
+        symbols = list(frames)
+        # A gap of 10 bars in one symbol and a later start in another
+        frames[symbols[0]] = frames[symbols[0]].drop(index=range(200, 210)).reset_index(drop=True)
+        frames[symbols[1]] = frames[symbols[1]].iloc[30:].reset_index(drop=True)
+    return frames
+
+@pytest.mark.parametrize('aligned', [True, False])
+@pytest.mark.parametrize('indicator', list(INDICATORS))
+def test_panel_indicators_match_per_symbol(aligned, indicator):
+    per_symbol = frames(aligned)
+    panel = Panel.from_frames(per_symbol)
+    values = getattr(panel, indicator)('close', PERIOD)
+
+    function, column = INDICATORS[indicator]
+    for j, (symbol, df) in enumerate(per_symbol.items()):
+        expected = df.copy()
+        function(expected, PERIOD)
+        rows = panel.positions[symbol]
+        np.testing.assert_allclose(values[rows, j], expected[column].to_numpy(), rtol=1e-9, atol=1e-8)
+        # Times without a bar of the symbol stay empty
+        assert np.isnan(np.delete(values[:, j], rows)).all()
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+from sesto.benchmarks.strategies import RSIReversal
+from sesto.benchmarks.synthetic import synthetic_data
+from sesto.incremental import StreamingEMA, StreamingMACD
+from sesto.indicators import MACD, RSI
+from sesto.metatrader.constants import MT5Timeframe
+from sesto.stream import FrameSource, stream_windows
+
+def raw_frames(bars: int = 2000):
+    data = synthetic_data(bars=bars, seed=1)
+    return {symbol: df[['time', 'open', 'high', 'low', 'close']].copy() for symbol, df in data[MT5Timeframe.H1].items()}
+
+def test_streaming_indicators_are_exact_across_windows():
+    frames = raw_frames()
+    windows = list(stream_windows(FrameSource(frames, 300), indicators=lambda symbol: [StreamingMACD(), StreamingEMA(50)]))
+    assert len(windows) > 1
+
+    for symbol, df in frames.items():
+        expected = df.copy()
+        MACD(expected)
+        expected['ema-50'] = expected['close'].ewm(span=50, adjust=False).mean()
+        streamed = pd.concat([window[symbol] for window in windows if symbol in window], ignore_index=True)
+        for column in ('macd', 'macd-signal', 'macd-histogram', 'ema-50'):
+            np.testing.assert_allclose(streamed[column], expected[column], rtol=1e-12, atol=1e-15)
+
+def test_run_stream_leaves_data_untouched():
+    frames = raw_frames()
+    data = {MT5Timeframe.H1: {}}
+    backtester = RSIReversal(data, 10_000, MT5Timeframe.H1)
+    backtester.run_stream(FrameSource(frames, 500), lambda symbol, df: RSI(df, 14), warmup=15)
+    assert data == {MT5Timeframe.H1: {}}
+    assert len(backtester.closed_trades) > 0